@@ -0,0 +1,185 @@
+"""
+Admission control for Bedrock calls: a global in-flight cap, optional per-model request rates
+(token buckets), and a priority queue in front of both.
+
+Priorities: live router (Haiku) > live critique (Sonnet) > batch. A waiting call is admitted
+when a slot is free and its model's bucket has a token; higher priorities go first, but a call
+whose model is rate limited does not hold up calls for other models. Queue wait is recorded
+per model and priority (histogram, Server-Timing `queue-<model>`, GET /health/bedrock-admission).
+
+BEDROCK_MAX_IN_FLIGHT (default BEDROCK_EXECUTOR_WORKERS, 0 = no cap), BEDROCK_RPM_SONNET and
+BEDROCK_RPM_HAIKU (requests per minute, 0 = unlimited). Callers outside a live request (batch
+grading) lower their priority with `with bedrock_priority(Priority.BATCH):`.
+"""
+
+import asyncio
+import bisect
+import contextvars
+import itertools
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import AsyncIterator, Iterator
+
+from env import env_float
+from metrics import BEDROCK_ADMISSION_WAIT_SECONDS, model_label, record_stage
+from rate_limit import TokenBucket
+
+
+class Priority(IntEnum):
+    LIVE_ROUTER = 0
+    LIVE_CRITIQUE = 1
+    BATCH = 2
+
+
+_priority: contextvars.ContextVar[Priority | None] = contextvars.ContextVar("bedrock_priority", default=None)
+
+
+@contextmanager
+def bedrock_priority(priority: Priority) -> Iterator[None]:
+    """Run Bedrock calls made in this context (and tasks created in it) at `priority`."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    model: str = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+
+
+class AdmissionController:
+    def __init__(self, max_in_flight: int, rpm: dict[str, float]) -> None:
+        self.max_in_flight = max_in_flight
+        self.rpm = {model: r for model, r in rpm.items() if r > 0}
+        self.buckets = {model: TokenBucket.per_minute(r) for model, r in self.rpm.items()}
+        self.in_flight = 0
+        self._waiters: list[_Waiter] = []  # sorted: priority, then arrival
+        self._seq = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+        self._admitted = {p.name.lower(): 0 for p in Priority}
+        self._wait_total = {p.name.lower(): 0.0 for p in Priority}
+        self._wait_max = {p.name.lower(): 0.0 for p in Priority}
+
+    def _slot_free(self) -> bool:
+        return self.max_in_flight <= 0 or self.in_flight < self.max_in_flight
+
+    def _take_token(self, model: str) -> bool:
+        bucket = self.buckets.get(model)
+        return bucket is None or bucket.try_acquire()
+
+    def _dispatch(self) -> None:
+        """Admit waiters in priority order while slots and tokens allow."""
+        blocked: set[str] = set()
+        retry_in: float | None = None
+        for waiter in list(self._waiters):
+            if waiter.future.done():
+                # Cancelled in this tick; its task has not resumed to remove it yet.
+                self._waiters.remove(waiter)
+                continue
+            if not self._slot_free():
+                break
+            if waiter.model in blocked:
+                continue
+            if not self._take_token(waiter.model):
+                # Rate limited: later calls for this model wait too, other models may pass.
+                blocked.add(waiter.model)
+                wait = self.buckets[waiter.model].wait_time()
+                retry_in = wait if retry_in is None else min(retry_in, wait)
+                continue
+            self._waiters.remove(waiter)
+            self.in_flight += 1
+            waiter.future.set_result(None)
+        if retry_in is not None and self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(retry_in, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._dispatch()
+
+    async def acquire(self, model: str, priority: Priority) -> float:
+        """Wait for admission; returns the seconds spent queued."""
+        start = time.perf_counter()
+        if not self._waiters and self._slot_free() and self._take_token(model):
+            self.in_flight += 1
+        else:
+            waiter = _Waiter(priority, next(self._seq), model, asyncio.get_running_loop().create_future())
+            bisect.insort(self._waiters, waiter)
+            self._dispatch()
+            try:
+                await waiter.future
+            except asyncio.CancelledError:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                elif waiter.future.done() and not waiter.future.cancelled():
+                    self.release()  # admitted just as the caller gave up
+                raise
+        wait = time.perf_counter() - start
+        name = priority.name.lower()
+        self._admitted[name] += 1
+        self._wait_total[name] += wait
+        self._wait_max[name] = max(self._wait_max[name], wait)
+        BEDROCK_ADMISSION_WAIT_SECONDS.observe(wait, model=model, priority=name)
+        return wait
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        if self._waiters:
+            self._dispatch()
+
+    def queued(self) -> dict[str, int]:
+        counts = {p.name.lower(): 0 for p in Priority}
+        for waiter in self._waiters:
+            counts[Priority(waiter.priority).name.lower()] += 1
+        return counts
+
+    def stats(self) -> dict:
+        return {
+            "max_in_flight": self.max_in_flight,
+            "in_flight": self.in_flight,
+            "queued": self.queued(),
+            "admitted": dict(self._admitted),
+            "mean_wait_ms": {
+                p: round(self._wait_total[p] / n * 1000, 1) if n else 0.0 for p, n in self._admitted.items()
+            },
+            "max_wait_ms": {p: round(w * 1000, 1) for p, w in self._wait_max.items()},
+            "rpm": dict(self.rpm),
+        }
+
+
+def _default_max_in_flight() -> int:
+    return int(env_float("BEDROCK_MAX_IN_FLIGHT", env_float("BEDROCK_EXECUTOR_WORKERS", 16)))
+
+
+admission = AdmissionController(
+    max_in_flight=_default_max_in_flight(),
+    rpm={"sonnet": env_float("BEDROCK_RPM_SONNET", 0), "haiku": env_float("BEDROCK_RPM_HAIKU", 0)},
+)
+
+
+def call_priority(model_id: str) -> Priority:
+    """Priority of a call made now: the context's override, else by model (Haiku = router)."""
+    override = _priority.get()
+    if override is not None:
+        return override
+    return Priority.LIVE_ROUTER if model_label(model_id) == "haiku" else Priority.LIVE_CRITIQUE
+
+
+@asynccontextmanager
+async def admitted(model_id: str) -> AsyncIterator[None]:
+    """Hold an admission slot for one Bedrock call."""
+    model = model_label(model_id)
+    wait = await admission.acquire(model, call_priority(model_id))
+    if wait >= 0.001:
+        record_stage(f"queue-{model}", wait)
+    try:
+        yield
+    finally:
+        admission.release()
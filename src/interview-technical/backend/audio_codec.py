@@ -0,0 +1,156 @@
+"""
+Vectorized transcoding for TTS output (Minimax PCM 16-bit mono, 24 kHz).
+
+Transcoder downsamples to 16 kHz or 8 kHz and/or encodes to G.711 mu-law chunk by chunk,
+carrying partial samples and filter history across chunk boundaries; Reframer re-packs the
+result into fixed-size frames so clients receive steady packets. Downsampling is a polyphase
+windowed-sinc (Kaiser) low-pass, so content above the new Nyquist frequency is removed instead
+of aliasing.
+"""
+
+from typing import AsyncIterator
+
+import numpy as np
+
+from schemas import AudioFormat
+
+SOURCE_RATE = 24000
+
+# format -> (sample rate, bytes per sample, content type)
+FORMATS: dict[AudioFormat, tuple[int, int, str]] = {
+    AudioFormat.pcm16_24k: (24000, 2, "audio/raw; rate=24000"),
+    AudioFormat.pcm16_16k: (16000, 2, "audio/raw; rate=16000"),
+    AudioFormat.mulaw_16k: (16000, 1, "audio/basic; rate=16000"),
+    AudioFormat.mulaw_8k: (8000, 1, "audio/basic; rate=8000"),
+}
+
+_MULAW_BIAS = 0x84
+_MULAW_CLIP = 32635
+
+
+def content_type(fmt: AudioFormat) -> str:
+    return FORMATS[fmt][2]
+
+
+def frame_bytes(fmt: AudioFormat, frame_ms: int) -> int:
+    rate, width, _ = FORMATS[fmt]
+    return rate * width * frame_ms // 1000
+
+
+def mulaw_encode(samples: np.ndarray) -> np.ndarray:
+    """G.711 mu-law encode int16 samples to uint8."""
+    x = samples.astype(np.int32)
+    sign = (x < 0).astype(np.int32) << 7
+    mag = np.minimum(np.abs(x), _MULAW_CLIP) + _MULAW_BIAS
+    exponent = np.clip(np.floor(np.log2(mag)).astype(np.int32) - 7, 0, 7)
+    mantissa = (mag >> (exponent + 3)) & 0x0F
+    return (~(sign | (exponent << 4) | mantissa) & 0xFF).astype(np.uint8)
+
+
+# Low-pass taps per polyphase branch, Kaiser beta (~80 dB stopband) and cutoff as a fraction
+# of the output rate (0.45 = 90% of its Nyquist frequency).
+_TAPS_PER_PHASE = 128
+_KAISER_BETA = 8.0
+_CUTOFF = 0.45
+
+
+class _Resampler:
+    """
+    Stateful 24 kHz -> 16 kHz (up 2, down 3) or 8 kHz (down 3) resampler for whole 3-sample
+    groups. Each output sample is one polyphase branch of the low-pass applied to the last
+    _TAPS_PER_PHASE input samples; the tail of each chunk is kept as history for the next.
+    """
+
+    def __init__(self, rate: int) -> None:
+        up = 2 if rate == 16000 else 1
+        n = _TAPS_PER_PHASE * up
+        fc = _CUTOFF * rate / (SOURCE_RATE * up)  # cycles per sample at the upsampled rate
+        t = np.arange(n) - (n - 1) / 2
+        h = 2 * fc * np.sinc(2 * fc * t) * np.kaiser(n, _KAISER_BETA)
+        h *= up / h.sum()  # unity gain after zero-stuffing
+        # A 3-input group yields `up` outputs; output k sits at upsampled index 3k of the group:
+        # taps h[3k % up :: up] applied backwards from input 3k // up.
+        self._branches = [(h[(3 * k) % up :: up][::-1].copy(), (3 * k) // up) for k in range(up)]
+        self._history = np.zeros(_TAPS_PER_PHASE - 1)
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        x = np.concatenate((self._history, samples.astype(np.float64)))
+        self._history = x[len(x) - len(self._history) :]
+        windows = np.lib.stride_tricks.sliding_window_view(x, _TAPS_PER_PHASE)  # windows[i] ends at samples[i]
+        groups = len(samples) // 3
+        out = np.empty((groups, len(self._branches)))
+        for k, (taps, offset) in enumerate(self._branches):
+            out[:, k] = windows[offset::3][:groups] @ taps
+        return np.clip(np.rint(out.reshape(-1)), -32768, 32767).astype(np.int16)
+
+
+class Transcoder:
+    """Stateful PCM16/24 kHz -> target format converter for a chunked stream."""
+
+    def __init__(self, fmt: AudioFormat) -> None:
+        self.fmt = fmt
+        self.rate, self.width, _ = FORMATS[fmt]
+        self._pending = b""
+        self._resampler = _Resampler(self.rate) if self.rate != SOURCE_RATE else None
+
+    def feed(self, chunk: bytes) -> bytes:
+        if self.fmt == AudioFormat.pcm16_24k:
+            return chunk
+        data = self._pending + chunk
+        # Whole samples only; resampling also needs whole 3-sample groups.
+        usable = len(data) - len(data) % (2 if self.rate == SOURCE_RATE else 6)
+        self._pending = data[usable:]
+        if not usable:
+            return b""
+        samples = np.frombuffer(data[:usable], dtype="<i2")
+        if self._resampler is not None:
+            samples = self._resampler.process(samples)
+        if self.width == 1:
+            return mulaw_encode(samples).tobytes()
+        return samples.astype("<i2").tobytes()
+
+
+class Reframer:
+    """Re-pack a byte stream into frames of exactly frame_size bytes (last frame may be short)."""
+
+    def __init__(self, frame_size: int) -> None:
+        self.frame_size = frame_size
+        self._buf = bytearray()
+
+    def feed(self, data: bytes) -> list[bytes]:
+        self._buf += data
+        n = len(self._buf) // self.frame_size * self.frame_size
+        if not n:
+            return []
+        frames = [bytes(self._buf[i : i + self.frame_size]) for i in range(0, n, self.frame_size)]
+        del self._buf[:n]
+        return frames
+
+    def flush(self) -> bytes:
+        rest = bytes(self._buf)
+        self._buf.clear()
+        return rest
+
+
+async def transcode_stream(
+    chunks: AsyncIterator[bytes],
+    fmt: AudioFormat,
+    frame_ms: int | None = None,
+) -> AsyncIterator[bytes]:
+    """Transcode a PCM16/24 kHz chunk stream to fmt, optionally in fixed frame_ms frames."""
+    transcoder = Transcoder(fmt)
+    reframer = Reframer(frame_bytes(fmt, frame_ms)) if frame_ms else None
+    async for chunk in chunks:
+        out = transcoder.feed(chunk)
+        if not out:
+            continue
+        if reframer is None:
+            yield out
+        else:
+            for frame in reframer.feed(out):
+                yield frame
+    # A trailing partial resampling group (< 3 samples, 0.125 ms) is dropped.
+    if reframer is not None:
+        tail = reframer.flush()
+        if tail:
+            yield tail
@@ -0,0 +1,127 @@
+"""
+Bounded, coalescing mic-audio ingest for the Transcribe path.
+
+Browser frames land in a DropOldestQueue (bounded; when Transcribe stalls the oldest audio
+is dropped instead of growing memory), then pass through the optional VAD and a
+FrameCoalescer that repacks them into fixed STT_FRAME_MS frames using one preallocated
+buffer, so each send_audio_event carries a Transcribe-sized chunk.
+"""
+
+import asyncio
+import logging
+import os
+from typing import AsyncIterator, Awaitable, Callable
+
+from env import env_int
+from metrics import STT_DROPPED_FRAMES, STT_QUEUE_MAX_DEPTH
+from vad import SAMPLE_RATE, VoiceActivityDetector
+
+AUDIO_QUEUE_MAX = env_int("STT_AUDIO_QUEUE_MAX", 200)
+TRANSCRIPT_QUEUE_MAX = env_int("STT_TRANSCRIPT_QUEUE_MAX", 100)
+FRAME_MS = env_int("STT_FRAME_MS", 100)
+# "drop_oldest": drop silently (logged); "signal": also tell the client via a backpressure event
+OVERFLOW_POLICY = os.getenv("STT_OVERFLOW_POLICY", "drop_oldest")
+
+
+class DropOldestQueue(asyncio.Queue):
+    """
+    asyncio.Queue whose put_drop_oldest evicts the oldest item when full (plain `await put`
+    still blocks, i.e. applies backpressure). Tracks drops and the deepest fill seen.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        super().__init__(maxsize)
+        self.dropped = 0
+        self.max_depth = 0
+
+    def put_nowait(self, item) -> None:
+        super().put_nowait(item)
+        self.max_depth = max(self.max_depth, self.qsize())
+
+    def put_drop_oldest(self, item) -> bool:
+        """Enqueue without waiting; return True if an old item had to be dropped."""
+        dropped = False
+        if self.full():
+            self.get_nowait()
+            self.dropped += 1
+            dropped = True
+        self.put_nowait(item)
+        return dropped
+
+
+class FrameCoalescer:
+    """Repack arbitrary-size PCM chunks into fixed-size frames in one preallocated buffer."""
+
+    def __init__(self, frame_bytes: int) -> None:
+        self.frame_bytes = frame_bytes
+        self.frames_out = 0
+        self._buf = bytearray(frame_bytes)
+        self._view = memoryview(self._buf)
+        self._fill = 0
+
+    def push(self, data: bytes) -> list[bytes]:
+        frames: list[bytes] = []
+        src = memoryview(data)
+        pos = 0
+        while pos < len(src):
+            n = min(self.frame_bytes - self._fill, len(src) - pos)
+            self._view[self._fill : self._fill + n] = src[pos : pos + n]
+            self._fill += n
+            pos += n
+            if self._fill == self.frame_bytes:
+                frames.append(bytes(self._buf))
+                self._fill = 0
+        self.frames_out += len(frames)
+        return frames
+
+    def flush(self) -> bytes:
+        """Return the partially filled frame (may be empty) and reset."""
+        tail = bytes(self._view[: self._fill])
+        self._fill = 0
+        if tail:
+            self.frames_out += 1
+        return tail
+
+
+def coalescer_for_stt() -> FrameCoalescer:
+    return FrameCoalescer(SAMPLE_RATE * 2 * FRAME_MS // 1000)
+
+
+async def stt_audio_stream(
+    queue: DropOldestQueue,
+    coalescer: FrameCoalescer,
+    vad: VoiceActivityDetector | None = None,
+    on_end_of_utterance: Callable[[], Awaitable[None]] | None = None,
+) -> AsyncIterator[bytes]:
+    """Drain queued mic chunks (None ends the stream) through VAD and the coalescer."""
+    while (chunk := await queue.get()) is not None:
+        if vad is not None:
+            chunk, end_of_utterance = vad.process(chunk)
+            if end_of_utterance and on_end_of_utterance is not None:
+                await on_end_of_utterance()
+        for frame in coalescer.push(chunk):
+            yield frame
+        # Outside speech, don't hold the tail of an utterance (or a keepalive) back.
+        if vad is not None and not vad.in_speech:
+            tail = coalescer.flush()
+            if tail:
+                yield tail
+    tail = coalescer.flush()
+    if tail:
+        yield tail
+
+
+def log_ingest_stats(tag: str, audio_queue: DropOldestQueue, transcript_queue: DropOldestQueue, coalescer: FrameCoalescer) -> None:
+    for name, queue in (("audio", audio_queue), ("transcript", transcript_queue)):
+        STT_QUEUE_MAX_DEPTH.observe(queue.max_depth, queue=name)
+        if queue.dropped:
+            STT_DROPPED_FRAMES.inc(queue.dropped, queue=name)
+    logging.info(
+        "[%s] ingest audio_queue max_depth=%d dropped=%d transcript_queue max_depth=%d dropped=%d frames_to_stt=%d",
+        tag,
+        audio_queue.max_depth,
+        audio_queue.dropped,
+        transcript_queue.max_depth,
+        transcript_queue.dropped,
+        coalescer.frames_out,
+    )
@@ -0,0 +1,245 @@
+"""
+Offline batch grading of recorded interviews: JSONL of (transcript, diagram) items in, JSONL of
+evaluations out, written as each item finishes.
+
+    uv run python batch_eval.py turns.jsonl -o graded.jsonl --concurrency 4 --sonnet-rpm 20
+
+Input lines are BatchEvaluateItem objects: `id` (optional; defaults to `line-<n>`),
+`transcript`, `diagram_base64` or `diagram_path` (relative to the input file), `previous_state`.
+
+- Runs in its own process with its own Bedrock executor (BEDROCK_EXECUTOR_WORKERS defaults to
+  2 x concurrency), so it never takes workers or connections from the live API.
+- --concurrency bounds items in flight; --sonnet-rpm / --haiku-rpm set the per-model token
+  buckets of the Bedrock admission control, and all calls run at batch priority.
+- The turn budget is off: every item waits for its full critique (failed critiques are retried
+  once by the pipeline, then --retries times per item with backoff).
+- Diagrams are loaded once per content hash and items are ordered by diagram so repeats hit
+  the Bedrock prompt cache; identical items are evaluated once (later ones get `duplicate_of`).
+- --resume skips ids already written with status "ok" to the output file (and input lines whose
+  parse error is already there) and appends; items without an `id` need an unchanged input file.
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import TextIO
+
+from pydantic import ValidationError
+
+from schemas import BatchEvaluateItem, BatchEvaluateResult, InterviewEvaluation
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Grade recorded interview turns from JSONL.")
+    p.add_argument("input", help="input JSONL ('-' for stdin)")
+    p.add_argument("-o", "--output", help="output JSONL (default stdout)")
+    p.add_argument("--concurrency", type=int, default=4, help="items evaluated at once")
+    p.add_argument("--sonnet-rpm", type=float, default=20, help="Sonnet requests per minute (0 = unlimited)")
+    p.add_argument("--haiku-rpm", type=float, default=60, help="Haiku requests per minute (0 = unlimited)")
+    p.add_argument("--retries", type=int, default=2, help="extra attempts for a failed item")
+    p.add_argument("--resume", action="store_true", help="skip ids already in the output with status ok, append the rest")
+    return p.parse_args(argv)
+
+
+def _item_key(item: BatchEvaluateItem, diagram_digest: str) -> str:
+    h = hashlib.sha256()
+    for part in (item.transcript, diagram_digest, item.previous_state):
+        h.update(part.encode())
+        h.update(b"\0")
+    return h.hexdigest()[:16]
+
+
+def _written_ids(path: str) -> tuple[set[str], set[str]]:
+    """(ids with status ok, all ids) already in the output file."""
+    done: set[str] = set()
+    written: set[str] = set()
+    if not os.path.exists(path):
+        return done, written
+    with open(path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # torn last line of an interrupted run
+            written.add(record["id"])
+            if record.get("status") == "ok":
+                done.add(record["id"])
+    return done, written
+
+
+class _Batch:
+    def __init__(self, args: argparse.Namespace, out: TextIO) -> None:
+        self.args = args
+        self.out = out
+        self.diagrams: dict[str, str] = {}  # content digest -> base64, shared by all items
+        self.counts = {"ok": 0, "error": 0, "duplicate": 0, "skipped": 0}
+
+    def write(self, result: BatchEvaluateResult) -> None:
+        self.out.write(result.model_dump_json(exclude_none=True) + "\n")
+        self.out.flush()
+        self.counts["duplicate" if result.status == "ok" and result.duplicate_of else result.status] += 1
+
+    def load_diagram(self, item: BatchEvaluateItem, base_dir: Path, path_cache: dict[str, str]) -> str:
+        """Content digest of the item's diagram (registered in self.diagrams); '' for none."""
+        if item.diagram_path:
+            path = str((base_dir / item.diagram_path).resolve())
+            if path not in path_cache:
+                data = Path(path).read_bytes()
+                digest = hashlib.sha256(data).hexdigest()
+                self.diagrams.setdefault(digest, base64.b64encode(data).decode())
+                path_cache[path] = digest
+            return path_cache[path]
+        if not item.diagram_base64:
+            return ""
+        from critique_cache import diagram_digest
+
+        digest = diagram_digest(item.diagram_base64)
+        self.diagrams.setdefault(digest, item.diagram_base64)
+        return digest
+
+    async def evaluate(self, item: BatchEvaluateItem, digest: str) -> InterviewEvaluation:
+        from pending_critiques import pending_critiques
+        from pipeline import critique_event, run_evaluation_pipeline
+
+        attempt = 0
+        while True:
+            try:
+                evaluation = await run_evaluation_pipeline(
+                    transcript=item.transcript,
+                    diagram_base64=self.diagrams.get(digest, ""),
+                    previous_state=item.previous_state,
+                )
+                if evaluation.critique_id is not None:
+                    # Critique failed to parse; the pipeline is already retrying it in the background.
+                    event = critique_event(await pending_critiques.get(evaluation.critique_id))
+                    update = {name: getattr(event, name) for name in type(event).model_fields if name != "event"}
+                    evaluation = evaluation.model_copy(update=update)
+                return evaluation
+            except Exception:
+                if attempt >= self.args.retries:
+                    raise
+                attempt += 1
+                await asyncio.sleep(2**attempt)
+
+    async def run(self, items: list[tuple[str, BatchEvaluateItem, str]], skip: set[str]) -> None:
+        first_by_key: dict[str, str] = {}
+        results: dict[str, asyncio.Future[InterviewEvaluation]] = {}
+        queue: asyncio.Queue[tuple[str, BatchEvaluateItem, str, str]] = asyncio.Queue()
+        duplicates: list[tuple[str, str, str]] = []
+        # Same diagram back to back: the cached image prefix is reused across items.
+        for item_id, item, digest in sorted(items, key=lambda entry: entry[2]):
+            if item_id in skip:
+                self.counts["skipped"] += 1
+                continue
+            key = _item_key(item, digest)
+            if key in first_by_key:
+                duplicates.append((item_id, first_by_key[key], key))
+                continue
+            first_by_key[key] = item_id
+            queue.put_nowait((item_id, item, digest, key))
+        # Outcomes of items that have duplicates waiting on them.
+        for _, original, _ in duplicates:
+            results.setdefault(original, asyncio.get_running_loop().create_future())
+
+        async def worker() -> None:
+            while not queue.empty():
+                item_id, item, digest, key = queue.get_nowait()
+                start = time.perf_counter()
+                try:
+                    evaluation = await self.evaluate(item, digest)
+                except Exception as e:
+                    logging.warning("[Batch] %s failed: %s", item_id, e)
+                    if item_id in results:
+                        results[item_id].set_exception(e)
+                    self.write(BatchEvaluateResult(id=item_id, key=key, status="error", error=str(e)))
+                    continue
+                if item_id in results:
+                    results[item_id].set_result(evaluation)
+                elapsed_ms = round((time.perf_counter() - start) * 1000, 1)
+                self.write(BatchEvaluateResult(id=item_id, key=key, status="ok", evaluation=evaluation, elapsed_ms=elapsed_ms))
+
+        async def duplicate(item_id: str, original: str, key: str) -> None:
+            try:
+                evaluation = await results[original]
+            except Exception as e:
+                self.write(BatchEvaluateResult(id=item_id, key=key, status="error", error=str(e), duplicate_of=original))
+                return
+            self.write(BatchEvaluateResult(id=item_id, key=key, status="ok", evaluation=evaluation, duplicate_of=original))
+
+        workers = [asyncio.create_task(worker()) for _ in range(max(1, self.args.concurrency))]
+        await asyncio.gather(*workers, *(duplicate(*entry) for entry in duplicates))
+
+
+def _read_items(batch: _Batch, f: TextIO, base_dir: Path, written: set[str]) -> list[tuple[str, BatchEvaluateItem, str]]:
+    """Valid items as (id, item, diagram digest); invalid lines are written as errors unless already `written`."""
+    items: list[tuple[str, BatchEvaluateItem, str]] = []
+    path_cache: dict[str, str] = {}
+    for n, line in enumerate(f, 1):
+        if not line.strip():
+            continue
+        try:
+            item = BatchEvaluateItem.model_validate_json(line)
+            digest = batch.load_diagram(item, base_dir, path_cache)
+        except (ValidationError, OSError) as e:
+            if f"line-{n}" in written:
+                batch.counts["skipped"] += 1  # reported by an earlier run
+            else:
+                batch.write(BatchEvaluateResult(id=f"line-{n}", status="error", error=str(e).splitlines()[0]))
+            continue
+        items.append((item.id or f"line-{n}", item, digest))
+    return items
+
+
+async def _main(args: argparse.Namespace) -> int:
+    from admission import Priority, bedrock_priority
+    from bedrock_client import init_bedrock, shutdown_bedrock, usage_stats
+
+    skip, written = _written_ids(args.output) if args.resume and args.output else (set(), set())
+    out = open(args.output, "a" if args.resume else "w") if args.output else sys.stdout
+    init_bedrock()
+    try:
+        batch = _Batch(args, out)
+        if args.input == "-":
+            items = _read_items(batch, sys.stdin, Path.cwd(), written)
+        else:
+            with open(args.input) as f:
+                items = _read_items(batch, f, Path(args.input).resolve().parent, written)
+        start = time.perf_counter()
+        with bedrock_priority(Priority.BATCH):
+            await batch.run(items, skip)
+        logging.info(
+            "[Batch] %d items in %.1fs ok=%d error=%d duplicate=%d skipped=%d unique_diagrams=%d",
+            len(items), time.perf_counter() - start, batch.counts["ok"], batch.counts["error"],
+            batch.counts["duplicate"], batch.counts["skipped"], len(batch.diagrams),
+        )
+        logging.info("[Batch] token usage %s", json.dumps(usage_stats()))
+        return 1 if batch.counts["error"] else 0
+    finally:
+        shutdown_bedrock()
+        if out is not sys.stdout:
+            out.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    # Own budget, set before the pipeline modules read their config.
+    os.environ.setdefault("BEDROCK_EXECUTOR_WORKERS", str(2 * max(1, args.concurrency)))
+    os.environ["EVALUATE_TURN_BUDGET_MS"] = "0"
+    os.environ["BEDROCK_RPM_SONNET"] = str(args.sonnet_rpm)
+    os.environ["BEDROCK_RPM_HAIKU"] = str(args.haiku_rpm)
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s", stream=sys.stderr)
+    return asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,17 +5,41 @@ All LLM calls go through AWS Bedrock only (boto3 bedrock-runtime).
 We do not use the Anthropic SDK or API directly.
 """
 
+import asyncio
+import base64
+import binascii
 import json
+import logging
 import os
-from typing import Any
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Iterator, TypeVar
 
 import boto3
 from botocore.config import Config
 
+from admission import admitted
+from env import env_int
+from metrics import BEDROCK_FIRST_TOKEN_SECONDS, BEDROCK_TOKENS, model_label
+
 # Bedrock model IDs (Claude on Bedrock)
 SONNET_ID = "anthropic.claude-sonnet-4-6"
 HAIKU_ID = "anthropic.claude-haiku-4-5-20251001-v1:0"
 
+T = TypeVar("T")
+
+# Process-wide runtime client and executor, created in main.lifespan (or lazily on first use).
+_runtime: Any = None
+_executor: ThreadPoolExecutor | None = None
+_lock = threading.Lock()
+
+# Per-model token usage (including prompt-cache reads/writes), summed across calls.
+_usage: dict[str, dict[str, int]] = {}
+_usage_lock = threading.Lock()
+_USAGE_FIELDS = ("input_tokens", "output_tokens", "cache_read_input_tokens", "cache_creation_input_tokens")
+
+
 
 def get_bedrock_runtime():
     """Return a Bedrock runtime client with region from env."""
@@ -23,67 +47,326 @@ def get_bedrock_runtime():
     return boto3.client(
         "bedrock-runtime",
         region_name=region,
-        config=Config(retries={"mode": "standard", "max_attempts": 3}),
+        config=Config(
+            retries={"mode": "standard", "max_attempts": 3},
+            max_pool_connections=env_int("BEDROCK_MAX_POOL_CONNECTIONS", 32),
+        ),
     )
 
 
-def _content_with_image(text: str, image_base64: str | None, media_type: str = "image/jpeg") -> list[dict]:
-    """Build content list: text block plus optional image block."""
-    content: list[dict] = [{"type": "text", "text": text}]
+def init_bedrock() -> None:
+    """Create the shared runtime client and the Bedrock executor (idempotent)."""
+    global _runtime, _executor
+    with _lock:
+        if _runtime is None:
+            _runtime = get_bedrock_runtime()
+        if _executor is None:
+            workers = env_int("BEDROCK_EXECUTOR_WORKERS", 16)
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bedrock")
+            logging.info("[Bedrock] executor started workers=%d", workers)
+
+
+def shutdown_bedrock() -> None:
+    """Stop the Bedrock executor and drop the shared client."""
+    global _runtime, _executor
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+        _runtime = None
+
+
+def get_shared_runtime():
+    """Return the process-wide Bedrock runtime client."""
+    if _runtime is None:
+        init_bedrock()
+    return _runtime
+
+
+async def run_in_bedrock_executor(fn: Callable[..., T], *args: Any) -> T:
+    """Run a blocking Bedrock call on the dedicated executor, not the loop default."""
+    if _executor is None:
+        init_bedrock()
+    return await asyncio.get_running_loop().run_in_executor(_executor, fn, *args)
+
+
+def executor_stats() -> dict[str, int]:
+    """Worker count and queued (not yet running) calls on the Bedrock executor."""
+    if _executor is None:
+        return {"workers": 0, "queue_depth": 0}
+    return {
+        "workers": _executor._max_workers,
+        "queue_depth": _executor._work_queue.qsize(),
+    }
+
+
+def prompt_cache_enabled() -> bool:
+    return os.getenv("BEDROCK_PROMPT_CACHE", "1").lower() not in ("0", "false", "no")
+
+
+def _cache_point(block: dict) -> dict:
+    """Mark a content block as the end of a cacheable prefix (when prompt caching is on)."""
+    if prompt_cache_enabled():
+        block["cache_control"] = {"type": "ephemeral"}
+    return block
+
+
+def _system_blocks(system: str | None) -> list[dict] | None:
+    """
+    Static instructions as the system prefix. No breakpoint of its own: the prompts are far below
+    Bedrock's minimum cacheable length (1024 tokens for Sonnet, 2048 for Haiku), so only the
+    image breakpoint, which covers the system prefix too, can produce cache reads.
+    """
+    if not system:
+        return None
+    return [{"type": "text", "text": system}]
+
+
+_IMAGE_SIGNATURES = (
+    (b"\x89PNG", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF8", "image/gif"),
+)
+
+
+def image_media_type(image_base64: str) -> str:
+    """Media type from the image's leading bytes (JPEG if unrecognized, as the whiteboard sends)."""
+    try:
+        head = base64.b64decode(image_base64[:16])
+    except (binascii.Error, ValueError):
+        return "image/jpeg"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    for signature, media_type in _IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return media_type
+    return "image/jpeg"
+
+
+def _content_with_image(text: str, image_base64: str | None, media_type: str | None = None) -> list[dict]:
+    """
+    Build content list: optional image block, then the text block. The image comes first
+    (with its own cache breakpoint) so an unchanged diagram stays part of the cached prefix
+    while the per-turn text varies. media_type is detected from the data when not given.
+    """
+    content: list[dict] = []
     if image_base64:
-        content.append({
+        media_type = media_type or image_media_type(image_base64)
+        content.append(_cache_point({
             "type": "image",
             "source": {
                 "type": "base64",
                 "media_type": media_type,
                 "data": image_base64,
             },
-        })
+        }))
+    content.append({"type": "text", "text": text})
     return content
 
 
+def record_usage(model_id: str, usage: dict[str, Any] | None) -> None:
+    """Add one response's `usage` to the per-model totals and log its cache read/write."""
+    if not usage:
+        return
+    with _usage_lock:
+        totals = _usage.setdefault(model_id, {"calls": 0, **{f: 0 for f in _USAGE_FIELDS}})
+        totals["calls"] += 1
+        for field in _USAGE_FIELDS:
+            totals[field] += int(usage.get(field) or 0)
+    model = model_label(model_id)
+    for field, kind in zip(_USAGE_FIELDS, ("input", "output", "cache_read", "cache_write")):
+        if usage.get(field):
+            BEDROCK_TOKENS.inc(int(usage[field]), model=model, kind=kind)
+    logging.info(
+        "[Bedrock] usage model=%s input=%s output=%s cache_read=%s cache_write=%s",
+        model_id,
+        usage.get("input_tokens", 0),
+        usage.get("output_tokens", 0),
+        usage.get("cache_read_input_tokens", 0),
+        usage.get("cache_creation_input_tokens", 0),
+    )
+
+
+def usage_stats() -> dict[str, dict[str, int]]:
+    """Snapshot of per-model token totals."""
+    with _usage_lock:
+        return {model: dict(totals) for model, totals in _usage.items()}
+
+
+def _request_body(messages: list[dict[str, Any]], max_tokens: int, system: str | None) -> bytes:
+    body: dict[str, Any] = {
+        "anthropic_version": "bedrock-2023-05-31",  # Bedrock API field for Claude
+        "max_tokens": max_tokens,
+        "messages": messages,
+    }
+    system_blocks = _system_blocks(system)
+    if system_blocks:
+        body["system"] = system_blocks
+    return bytes(json.dumps(body), "utf-8")
+
+
 def invoke_claude(
     client: Any,
     model_id: str,
     messages: list[dict[str, Any]],
     max_tokens: int = 2048,
+    system: str | None = None,
 ) -> str:
     """
     Invoke Claude via AWS Bedrock (bedrock-runtime). Uses Bedrock's native request
     format; anthropic_version is required by the Bedrock API for Claude models.
     messages: list of {"role": "user"|"assistant", "content": [...]}.
-    Content can include type "image" with source.base64 data. Returns assistant text.
+    Content can include type "image" with source.base64 data. `system` is sent as the
+    system prefix (cached together with an image, see _content_with_image). Records the
+    response usage and returns assistant text.
     """
-    body = {
-        "anthropic_version": "bedrock-2023-05-31",  # Bedrock API field for Claude
-        "max_tokens": max_tokens,
-        "messages": messages,
-    }
     response = client.invoke_model(
         modelId=model_id,
         contentType="application/json",
         accept="application/json",
-        body=bytes(json.dumps(body), "utf-8"),
+        body=_request_body(messages, max_tokens, system),
     )
     result = json.loads(response["body"].read())
+    record_usage(model_id, result.get("usage"))
     for block in result.get("content", []):
         if block.get("type") == "text":
             return block.get("text", "")
     return ""
 
 
+def invoke_claude_stream(
+    client: Any,
+    model_id: str,
+    messages: list[dict[str, Any]],
+    max_tokens: int = 2048,
+    system: str | None = None,
+    cancelled: threading.Event | None = None,
+) -> Iterator[str]:
+    """
+    Like invoke_claude but via invoke_model_with_response_stream: yields assistant text
+    deltas as Bedrock produces them. Blocking iterator; see astream_claude for async use.
+    Setting `cancelled` closes the response stream at the next event (generation stops).
+    """
+    start = time.perf_counter()
+    response = client.invoke_model_with_response_stream(
+        modelId=model_id,
+        contentType="application/json",
+        accept="application/json",
+        body=_request_body(messages, max_tokens, system),
+    )
+    usage: dict[str, Any] = {}
+    first_token = True
+    for event in response["body"]:
+        if cancelled is not None and cancelled.is_set():
+            response["body"].close()
+            logging.info("[Bedrock] stream cancelled model=%s", model_id)
+            return
+        chunk = event.get("chunk")
+        if not chunk:
+            continue
+        payload = json.loads(chunk["bytes"])
+        kind = payload.get("type")
+        if kind == "content_block_delta":
+            delta = payload.get("delta", {})
+            if delta.get("type") == "text_delta" and delta.get("text"):
+                if first_token:
+                    first_token = False
+                    BEDROCK_FIRST_TOKEN_SECONDS.observe(time.perf_counter() - start, model=model_label(model_id))
+                yield delta["text"]
+        elif kind == "message_start":
+            # Input and cache token counts arrive up front; output_tokens in message_delta.
+            usage.update(payload.get("message", {}).get("usage", {}))
+        elif kind == "message_delta":
+            usage.update(payload.get("usage", {}))
+    record_usage(model_id, usage)
+
+
+async def astream_claude(
+    client: Any,
+    model_id: str,
+    user_text: str,
+    max_tokens: int = 2048,
+    system: str | None = None,
+) -> AsyncIterator[str]:
+    """
+    Async text-delta stream for a single user turn; reads Bedrock on the Bedrock executor
+    once admitted (admission.py).
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[tuple[str, Any]] = asyncio.Queue()
+    cancelled = threading.Event()
+    messages = [{"role": "user", "content": _content_with_image(user_text, None)}]
+
+    def pump() -> None:
+        try:
+            for text in invoke_claude_stream(
+                client, model_id, messages, max_tokens=max_tokens, system=system, cancelled=cancelled
+            ):
+                if cancelled.is_set():
+                    return
+                loop.call_soon_threadsafe(queue.put_nowait, ("text", text))
+            loop.call_soon_threadsafe(queue.put_nowait, ("end", None))
+        except Exception as e:
+            loop.call_soon_threadsafe(queue.put_nowait, ("error", e))
+
+    async with admitted(model_id):
+        pump_future = asyncio.ensure_future(run_in_bedrock_executor(pump))
+        try:
+            while True:
+                kind, value = await queue.get()
+                if kind == "end":
+                    break
+                if kind == "error":
+                    raise value
+                yield value
+            await pump_future
+        finally:
+            cancelled.set()
+
+
 def invoke_claude_with_image(
     client: Any,
     model_id: str,
     user_text: str,
     image_base64: str | None = None,
     max_tokens: int = 2048,
+    system: str | None = None,
 ) -> str:
-    """Convenience: single user turn, optional image."""
+    """Convenience: single user turn, optional image, optional cached system prefix."""
     content = _content_with_image(user_text, image_base64)
     return invoke_claude(
         client,
         model_id,
         messages=[{"role": "user", "content": content}],
         max_tokens=max_tokens,
+        system=system,
+    )
+
+
+def invoke_claude_cancellable(
+    client: Any,
+    model_id: str,
+    user_text: str,
+    image_base64: str | None = None,
+    max_tokens: int = 2048,
+    system: str | None = None,
+    cancelled: threading.Event | None = None,
+) -> str | None:
+    """
+    Same request as invoke_claude_with_image, but read through the response stream so that
+    setting `cancelled` from another thread abandons the call. Returns None if cancelled.
+    """
+    content = _content_with_image(user_text, image_base64)
+    parts = list(
+        invoke_claude_stream(
+            client,
+            model_id,
+            [{"role": "user", "content": content}],
+            max_tokens=max_tokens,
+            system=system,
+            cancelled=cancelled,
+        )
     )
+    if cancelled is not None and cancelled.is_set():
+        return None
+    return "".join(parts)
@@ -0,0 +1,147 @@
+"""
+Cancellable, optionally hedged Bedrock calls for the evaluation pipeline.
+
+Each request waits for admission (admission.py: priority queue, in-flight cap, rate limits),
+then runs invoke_claude_cancellable on the Bedrock executor, so cancelling the awaiting task
+(client disconnect, superseded turn) stops reading the response stream and closes it; calls
+still queued for admission or a worker are dropped before they start.
+
+With BEDROCK_HEDGE=1, a call that has not finished by the model's recent latency percentile
+(BEDROCK_HEDGE_PERCENTILE over the last BEDROCK_HEDGE_WINDOW calls; BEDROCK_HEDGE_DEFAULT_MS
+until BEDROCK_HEDGE_MIN_SAMPLES are seen) gets a duplicate request; the first success wins
+and the loser is cancelled. Hedge counts and win/loss per model are kept for /health.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable
+
+import numpy as np
+
+from admission import admitted
+from bedrock_client import invoke_claude_cancellable, run_in_bedrock_executor
+from env import env_float, env_int
+from metrics import BEDROCK_ERRORS, BEDROCK_HEDGES, BEDROCK_REQUEST_SECONDS, model_label, record_stage
+
+PERCENTILE = env_float("BEDROCK_HEDGE_PERCENTILE", 95)
+WINDOW = env_int("BEDROCK_HEDGE_WINDOW", 200)
+MIN_SAMPLES = env_int("BEDROCK_HEDGE_MIN_SAMPLES", 20)
+DEFAULT_DEADLINE_S = env_int("BEDROCK_HEDGE_DEFAULT_MS", 4000) / 1000
+
+_latencies: dict[str, deque[float]] = {}
+_stats: dict[str, dict[str, int]] = {}
+
+
+def hedging_enabled() -> bool:
+    return os.getenv("BEDROCK_HEDGE", "0").lower() in ("1", "true", "yes")
+
+
+def _count(model_id: str, field: str) -> None:
+    totals = _stats.setdefault(
+        model_id, {"calls": 0, "hedged": 0, "hedge_wins": 0, "primary_wins": 0, "cancelled": 0}
+    )
+    totals[field] += 1
+
+
+def hedge_deadline(model_id: str) -> float:
+    """Seconds to wait before hedging: the recent latency percentile for this model."""
+    samples = _latencies.get(model_id)
+    if not samples or len(samples) < MIN_SAMPLES:
+        return DEFAULT_DEADLINE_S
+    return float(np.percentile(np.fromiter(samples, dtype=np.float64), PERCENTILE))
+
+
+def hedge_stats() -> dict[str, dict[str, int]]:
+    return {model: dict(totals) for model, totals in _stats.items()}
+
+
+class _Attempt:
+    """One request of a (possibly hedged) call: admitted, then run on the Bedrock executor."""
+
+    def __init__(self, model_id: str, run: Callable[[threading.Event], Awaitable[str]]) -> None:
+        self.model_id = model_id
+        self.cancelled = threading.Event()
+        self.admitted = asyncio.Event()
+        self.started = 0.0
+        self.future = asyncio.ensure_future(self._run(run))
+
+    async def _run(self, run: Callable[[threading.Event], Awaitable[str]]) -> str:
+        async with admitted(self.model_id):
+            self.started = time.perf_counter()
+            self.admitted.set()
+            return await run(self.cancelled)
+
+
+async def call_claude(
+    client: Any,
+    model_id: str,
+    user_text: str,
+    image_base64: str | None = None,
+    max_tokens: int = 2048,
+    system: str | None = None,
+) -> str:
+    """
+    Single user turn (optional image / cached system prefix); admitted by priority, cancellable,
+    hedged if enabled. The hedge deadline counts from admission, not from the queue.
+    """
+    attempts: list[_Attempt] = []
+
+    async def run(cancelled: threading.Event) -> str:
+        return await run_in_bedrock_executor(
+            invoke_claude_cancellable, client, model_id, user_text, image_base64, max_tokens, system, cancelled
+        )
+
+    _count(model_id, "calls")
+    model = model_label(model_id)
+    start = time.perf_counter()
+    attempts.append(_Attempt(model_id, run))
+    admitted_wait: asyncio.Future | None = None
+    try:
+        if hedging_enabled():
+            primary = attempts[0]
+            admitted_wait = asyncio.ensure_future(primary.admitted.wait())
+            await asyncio.wait({primary.future, admitted_wait}, return_when=asyncio.FIRST_COMPLETED)
+            deadline = hedge_deadline(model_id)
+            done, _ = await asyncio.wait({primary.future}, timeout=deadline)
+            if not done:
+                _count(model_id, "hedged")
+                BEDROCK_HEDGES.inc(model=model)
+                logging.info("[Bedrock] hedging model=%s after %.0f ms", model_id, deadline * 1000)
+                attempts.append(_Attempt(model_id, run))
+        pending = {attempt.future for attempt in attempts}
+        error: BaseException | None = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = future.exception()
+                    continue
+                index = next(i for i, attempt in enumerate(attempts) if attempt.future is future)
+                # Always the primary's time since admission: when the hedge wins it is a lower
+                # bound on the slow call, which the percentile must still see (recording the
+                # hedge's own, typical latency would pull the deadline below the real tail).
+                elapsed = time.perf_counter() - attempts[0].started
+                _latencies.setdefault(model_id, deque(maxlen=WINDOW)).append(elapsed)
+                if len(attempts) > 1:
+                    _count(model_id, "hedge_wins" if index else "primary_wins")
+                total = time.perf_counter() - start
+                BEDROCK_REQUEST_SECONDS.observe(total, model=model)
+                record_stage(f"bedrock-{model}", total)
+                return future.result()
+        BEDROCK_ERRORS.inc(model=model)
+        raise error
+    except asyncio.CancelledError:
+        _count(model_id, "cancelled")
+        logging.info("[Bedrock] call cancelled model=%s", model_id)
+        raise
+    finally:
+        if admitted_wait is not None:
+            admitted_wait.cancel()
+        # Losers and abandoned calls: stop their streams / leave the admission queue.
+        for attempt in attempts:
+            attempt.cancelled.set()
+            attempt.future.cancel()
@@ -0,0 +1 @@
+"""Offline load test for the backend: local stand-ins for Bedrock, Minimax and Transcribe."""
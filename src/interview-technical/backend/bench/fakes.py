@@ -0,0 +1,182 @@
+"""
+In-process stand-ins for bedrock-runtime and Transcribe streaming.
+
+FakeBedrockRuntime answers invoke_model / invoke_model_with_response_stream with canned
+critique/router JSON after a latency drawn from a per-model lognormal distribution.
+FakeTranscribeClient replaces amazon_transcribe's TranscribeStreamingClient: it turns the
+audio it receives into growing partial results (one word per WORD_MS of audio) and a final
+result on end_stream, each delivered after a fixed per-stream processing delay.
+"""
+
+import asyncio
+import io
+import json
+import math
+import random
+import time
+from typing import Any
+
+from amazon_transcribe.model import Alternative, Item, Result, Transcript, TranscriptEvent
+
+CANNED_CRITIQUE = {
+    "design_aspects": [
+        {"component": "load balancer", "score": 0.7, "feedback": "Reasonable placement.", "issues": []},
+        {"component": "cache", "score": 0.5, "feedback": "Eviction policy unclear.", "issues": ["no TTL discussed"]},
+    ],
+    "diagram_score": 0.65,
+    "verbal_score": 0.6,
+    "overall_score": 0.62,
+    "follow_up": "How would you keep the cache consistent with the database?",
+}
+
+CANNED_ROUTER = {
+    "emotion": "curious",
+    "should_interrupt": False,
+    "response": "Good start. Walk me through what happens when the cache misses.",
+}
+
+WORDS = "we put a load balancer in front of stateless api servers with a redis cache and a sharded database".split()
+WORD_MS = 400
+
+
+class LatencyModel:
+    """Lognormal latency given its median and p99, in milliseconds."""
+
+    def __init__(self, median_ms: float, p99_ms: float) -> None:
+        self.mu = math.log(median_ms / 1000)
+        self.sigma = max(math.log(max(p99_ms, median_ms) / median_ms) / 2.326, 1e-6)
+
+    def sample(self) -> float:
+        return random.lognormvariate(self.mu, self.sigma)
+
+
+def _chunk(payload: dict) -> dict:
+    return {"chunk": {"bytes": json.dumps(payload).encode()}}
+
+
+class _StreamBody:
+    """invoke_model_with_response_stream body: events paced over the sampled latency."""
+
+    def __init__(self, text: str, first_token_s: float, rest_s: float, usage: dict) -> None:
+        self.text = text
+        self.first_token_s = first_token_s
+        self.rest_s = rest_s
+        self.usage = usage
+        self.closed = False
+
+    def __iter__(self):
+        yield _chunk({"type": "message_start", "message": {"usage": self.usage}})
+        time.sleep(self.first_token_s)
+        pieces = [self.text[i : i + 24] for i in range(0, len(self.text), 24)]
+        for piece in pieces:
+            if self.closed:
+                return
+            yield _chunk({"type": "content_block_delta", "delta": {"type": "text_delta", "text": piece}})
+            time.sleep(self.rest_s / len(pieces))
+        yield _chunk({"type": "message_delta", "usage": {"output_tokens": len(self.text) // 4}})
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeBedrockRuntime:
+    """Duck-typed bedrock-runtime client; blocking like boto3 (runs on the Bedrock executor)."""
+
+    def __init__(self, sonnet: LatencyModel, haiku: LatencyModel, first_token_fraction: float = 0.4) -> None:
+        self.sonnet = sonnet
+        self.haiku = haiku
+        self.first_token_fraction = first_token_fraction
+
+    def _reply(self, model_id: str) -> tuple[str, float]:
+        if "sonnet" in model_id:
+            return json.dumps(CANNED_CRITIQUE), self.sonnet.sample()
+        return json.dumps(CANNED_ROUTER), self.haiku.sample()
+
+    @staticmethod
+    def _usage(body: bytes) -> dict:
+        request = json.loads(body)
+        # Roughly: the system prefix is cached after the first call, the rest is fresh input.
+        prefix = len(json.dumps(request.get("system", ""))) // 4
+        return {
+            "input_tokens": len(json.dumps(request["messages"])) // 4,
+            "cache_read_input_tokens": prefix,
+            "cache_creation_input_tokens": 0,
+        }
+
+    def invoke_model(self, modelId: str, body: bytes, **_: Any) -> dict:
+        text, latency = self._reply(modelId)
+        time.sleep(latency)
+        usage = {**self._usage(body), "output_tokens": len(text) // 4}
+        result = {"content": [{"type": "text", "text": text}], "usage": usage}
+        return {"body": io.BytesIO(json.dumps(result).encode())}
+
+    def invoke_model_with_response_stream(self, modelId: str, body: bytes, **_: Any) -> dict:
+        text, latency = self._reply(modelId)
+        first = latency * self.first_token_fraction
+        return {"body": _StreamBody(text, first, latency - first, self._usage(body))}
+
+
+class _FakeInputStream:
+    def __init__(self, stream: "_FakeTranscribeStream") -> None:
+        self._stream = stream
+
+    async def send_audio_event(self, audio_chunk: bytes) -> None:
+        self._stream.on_audio(len(audio_chunk))
+
+    async def end_stream(self) -> None:
+        self._stream.on_end()
+
+
+class _FakeTranscribeStream:
+    def __init__(self, delay_s: float, sample_rate: int) -> None:
+        self.delay_s = delay_s
+        self.bytes_per_word = sample_rate * 2 * WORD_MS // 1000
+        self.input_stream = _FakeInputStream(self)
+        self._received = 0
+        self._words = 0
+        self._events: asyncio.Queue[TranscriptEvent | None] = asyncio.Queue()
+        self.output_stream = self._output()
+
+    def _event(self, words: int, partial: bool) -> TranscriptEvent:
+        items = [
+            Item(item_type="pronunciation", content=WORDS[i % len(WORDS)], stable=not partial or i < words - 1)
+            for i in range(words)
+        ]
+        text = " ".join(item.content for item in items)
+        result = Result(
+            result_id="segment-0",
+            is_partial=partial,
+            alternatives=[Alternative(transcript=text, items=items, entities=None)],
+        )
+        return TranscriptEvent(transcript=Transcript(results=[result]))
+
+    def _emit(self, event: TranscriptEvent | None) -> None:
+        asyncio.get_running_loop().call_later(self.delay_s, self._events.put_nowait, event)
+
+    def on_audio(self, size: int) -> None:
+        self._received += size
+        words = self._received // self.bytes_per_word
+        if words > self._words:
+            self._words = words
+            self._emit(self._event(words, partial=True))
+
+    def on_end(self) -> None:
+        if self._words:
+            self._emit(self._event(self._words, partial=False))
+        self._emit(None)
+
+    async def _output(self):
+        while (event := await self._events.get()) is not None:
+            yield event
+
+
+class FakeTranscribeClient:
+    """Drop-in for TranscribeStreamingClient; configure `latency` before use."""
+
+    latency = LatencyModel(300, 800)
+
+    def __init__(self, region: str) -> None:
+        self.region = region
+
+    async def start_stream_transcription(self, media_sample_rate_hz: int = 16000, **_: Any) -> _FakeTranscribeStream:
+        return _FakeTranscribeStream(self.latency.sample(), media_sample_rate_hz)
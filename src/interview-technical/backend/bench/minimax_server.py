@@ -0,0 +1,57 @@
+"""
+Local HTTP server speaking Minimax's t2a_v2 streaming format (SSE lines of
+{"data": {"audio": <hex PCM>, "status": 1}}, then a status 2 summary), for MINIMAX_TTS_URL.
+
+Audio is silence sized like real speech (CHARS_PER_SECOND at 24 kHz 16-bit mono), sent in
+CHUNK_MS pieces paced at real time after a first-chunk delay drawn from a LatencyModel.
+"""
+
+import asyncio
+import json
+
+from aiohttp import web
+
+from bench.fakes import LatencyModel
+
+SAMPLE_RATE = 24000
+CHARS_PER_SECOND = 15
+CHUNK_MS = 200
+
+
+def _line(audio: bytes, status: int) -> bytes:
+    return f"data: {json.dumps({'data': {'audio': audio.hex(), 'status': status}})}\n\n".encode()
+
+
+def make_app(first_chunk: LatencyModel, realtime: bool = True) -> web.Application:
+    async def t2a(request: web.Request) -> web.StreamResponse:
+        payload = await request.json()
+        total = int(len(payload.get("text", "")) / CHARS_PER_SECOND * SAMPLE_RATE) * 2
+        chunk = SAMPLE_RATE * 2 * CHUNK_MS // 1000
+        resp = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await resp.prepare(request)
+        await asyncio.sleep(first_chunk.sample())
+        sent = 0
+        while sent < total:
+            size = min(chunk, total - sent)
+            await resp.write(_line(bytes(size), 1))
+            sent += size
+            if realtime:
+                await asyncio.sleep(CHUNK_MS / 1000)
+        await resp.write(_line(b"", 2))
+        await resp.write_eof()
+        return resp
+
+    async def ping(request: web.Request) -> web.Response:
+        return web.Response()
+
+    app = web.Application()
+    app.router.add_post("/v1/t2a_v2", t2a)
+    app.router.add_route("HEAD", "/v1/t2a_v2", ping)
+    return app
+
+
+async def start_minimax_server(host: str, port: int, first_chunk: LatencyModel, realtime: bool = True) -> web.AppRunner:
+    runner = web.AppRunner(make_app(first_chunk, realtime))
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
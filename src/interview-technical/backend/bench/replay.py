@@ -0,0 +1,214 @@
+"""
+Replay recorded sessions (SESSION_RECORD_DIR, see session_recorder.py) against a running backend.
+
+Each recorded stream is re-driven at its original offset from the start of the recording,
+divided by --speed: mic audio goes back through /ws/transcribe frame by frame at the recorded
+pace, evaluate requests (with their diagrams) to /evaluate, speculative start/commit/cancel to
+/evaluate/speculative, TTS requests to /tts/stream.
+Segments are read through mmap. Reports p50/p95/p99 per stage like bench.run.
+
+Run from the backend directory:
+    python -m bench.replay /tmp/recordings --base-url http://127.0.0.1:8000 --speed 4
+    python -m bench.replay /tmp/recordings --stats
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import sys
+import time
+from collections import Counter, defaultdict
+
+import aiohttp
+
+from bench.run import _summary
+from session_recorder import Record, RecordKind, read_recordings
+
+STAGES = ("stt_first_transcript", "stt_session", "evaluate", "speculate", "commit", "tts_first_byte", "tts_total")
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("directory", help="directory of .rec segments")
+    p.add_argument("--base-url", default="http://127.0.0.1:8000", help="backend to replay against")
+    p.add_argument("--speed", type=float, default=1.0, help="time compression (2 = twice as fast)")
+    p.add_argument("--stats", action="store_true", help="print what the recording contains and exit")
+    p.add_argument("--json", help="write the report as JSON to this file")
+    return p.parse_args(argv)
+
+
+def _load(directory: str) -> tuple[list[list[Record]], dict[str, str]]:
+    """Streams (records per stream id, in start order) and diagrams by digest."""
+    streams: dict[str, list[Record]] = defaultdict(list)
+    diagrams: dict[str, str] = {}
+    for rec in read_recordings(directory):
+        if rec.kind == RecordKind.DIAGRAM:
+            diagrams[rec.body[:64].decode()] = base64.b64encode(rec.body[64:]).decode()
+        else:
+            streams[rec.stream_id].append(rec)
+    return sorted(streams.values(), key=lambda records: records[0].timestamp), diagrams
+
+
+def _print_stats(streams: list[list[Record]], diagrams: dict[str, str]) -> None:
+    kinds = Counter(rec.kind.name for records in streams for rec in records)
+    audio = sum(len(rec.body) for records in streams for rec in records if rec.kind == RecordKind.AUDIO)
+    if streams:
+        span = max(records[-1].timestamp for records in streams) - streams[0][0].timestamp
+        print(f"{len(streams)} streams over {span:.1f}s, {len(diagrams)} diagrams, {audio} B audio")
+    for kind, n in sorted(kinds.items()):
+        print(f"  {kind:<18}{n:>8}")
+
+
+async def _replay_ws(http: aiohttp.ClientSession, base: str, records: list[Record], speed: float, timings: dict) -> None:
+    start = time.perf_counter()
+    t0 = records[0].timestamp
+    first_audio: list[float] = []
+    async with http.ws_connect(f"{base.replace('http', 'ws', 1)}/ws/transcribe") as ws:
+
+        async def receive() -> None:
+            async for msg in ws:
+                if msg.type != aiohttp.WSMsgType.TEXT:
+                    break
+                if json.loads(msg.data).get("transcript") and first_audio:
+                    timings.setdefault("stt_first_transcript", time.perf_counter() - first_audio[0])
+
+        receiver = asyncio.create_task(receive())
+        try:
+            for rec in records:
+                delay = (rec.timestamp - t0) / speed - (time.perf_counter() - start)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                if rec.kind == RecordKind.AUDIO:
+                    if not first_audio:
+                        first_audio.append(time.perf_counter())
+                    await ws.send_bytes(rec.body)
+                elif rec.kind == RecordKind.WS_CLOSE:
+                    break
+        finally:
+            receiver.cancel()
+            await asyncio.gather(receiver, return_exceptions=True)
+    timings["stt_session"] = time.perf_counter() - start
+
+
+async def _replay_evaluate(http: aiohttp.ClientSession, base: str, rec: Record, diagrams: dict[str, str], timings: dict) -> None:
+    body = json.loads(rec.body)
+    digest = body.pop("diagram_digest", None)
+    if digest:
+        body["diagram_base64"] = diagrams.get(digest, "")
+    t0 = time.perf_counter()
+    async with http.post(f"{base}/evaluate", json=body) as resp:
+        resp.raise_for_status()
+        await resp.read()
+    timings["evaluate"] = time.perf_counter() - t0
+
+
+def _speculative_form(rec: Record, diagrams: dict[str, str]) -> aiohttp.FormData:
+    body = json.loads(rec.body)
+    form = aiohttp.FormData()
+    for name in ("session_id", "turn_id", "transcript", "previous_state"):
+        form.add_field(name, str(body[name]))
+    diagram = diagrams.get(body.get("diagram_digest") or "")
+    if diagram:
+        form.add_field("diagram", base64.b64decode(diagram), filename="diagram")
+    return form
+
+
+async def _replay_speculative(
+    http: aiohttp.ClientSession, base: str, rec: Record, diagrams: dict[str, str], timings: dict
+) -> None:
+    t0 = time.perf_counter()
+    if rec.kind == RecordKind.SPECULATE_CANCEL:
+        body = json.loads(rec.body)
+        params = {} if body["turn_id"] is None else {"turn_id": body["turn_id"]}
+        async with http.delete(f"{base}/evaluate/speculative/{body['session_id']}", params=params) as resp:
+            resp.raise_for_status()
+        return
+    commit = rec.kind == RecordKind.SPECULATE_COMMIT
+    url = f"{base}/evaluate/speculative/commit" if commit else f"{base}/evaluate/speculative"
+    async with http.post(url, data=_speculative_form(rec, diagrams)) as resp:
+        resp.raise_for_status()
+        await resp.read()
+        if commit:
+            timings["speculation"] = resp.headers.get("X-Speculation", "miss")
+    timings["commit" if commit else "speculate"] = time.perf_counter() - t0
+
+
+async def _replay_tts(http: aiohttp.ClientSession, base: str, rec: Record, timings: dict) -> None:
+    t0 = time.perf_counter()
+    async with http.post(f"{base}/tts/stream", json=json.loads(rec.body)) as resp:
+        resp.raise_for_status()
+        async for _ in resp.content.iter_any():
+            timings.setdefault("tts_first_byte", time.perf_counter() - t0)
+    timings["tts_total"] = time.perf_counter() - t0
+
+
+async def _replay(args: argparse.Namespace, streams: list[list[Record]], diagrams: dict[str, str]) -> tuple[list, list, float]:
+    results: list[dict] = []
+    errors: list[str] = []
+    t0 = streams[0][0].timestamp
+
+    async def stream(http: aiohttp.ClientSession, records: list[Record], start: float) -> None:
+        await asyncio.sleep(max(0.0, (records[0].timestamp - t0) / args.speed - (time.perf_counter() - start)))
+        timings: dict[str, float] = {}
+        first = records[0]
+        try:
+            if first.kind == RecordKind.WS_OPEN:
+                await _replay_ws(http, args.base_url, records, args.speed, timings)
+            elif first.kind == RecordKind.EVALUATE:
+                await _replay_evaluate(http, args.base_url, first, diagrams, timings)
+            elif first.kind in (RecordKind.SPECULATE, RecordKind.SPECULATE_COMMIT, RecordKind.SPECULATE_CANCEL):
+                await _replay_speculative(http, args.base_url, first, diagrams, timings)
+            elif first.kind == RecordKind.TTS:
+                await _replay_tts(http, args.base_url, first, timings)
+            else:
+                return  # stream whose start fell in a lost (dropped or torn) record
+            results.append(timings)
+        except Exception as e:
+            errors.append(f"{first.kind.name.lower()} {first.stream_id}: {type(e).__name__}: {e}")
+
+    timeout = aiohttp.ClientTimeout(total=300)
+    connector = aiohttp.TCPConnector(limit=0)
+    async with aiohttp.ClientSession(timeout=timeout, connector=connector) as http:
+        start = time.perf_counter()
+        await asyncio.gather(*(stream(http, records, start) for records in streams))
+        wall = time.perf_counter() - start
+    return results, errors, wall
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    streams, diagrams = _load(args.directory)
+    if args.stats or not streams:
+        _print_stats(streams, diagrams)
+        return 0 if streams else 1
+    results, errors, wall = asyncio.run(_replay(args, streams, diagrams))
+    report = {
+        "streams": len(streams),
+        "ok": len(results),
+        "errors": len(errors),
+        "wall_s": wall,
+        "stages": {name: _summary([r[name] for r in results if name in r]) for name in STAGES},
+        "speculation": dict(Counter(r["speculation"] for r in results if "speculation" in r)),
+        "error_samples": errors[:20],
+        "args": vars(args),
+    }
+    print(f"\n{len(results)} streams ok, {len(errors)} errors in {wall:.1f}s (speed x{args.speed:g})\n")
+    print(f"{'stage':<24}{'count':>7}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}   (ms)")
+    for name, s in report["stages"].items():
+        if not s["count"]:
+            print(f"{name:<24}{0:>7}")
+            continue
+        print(f"{name:<24}{s['count']:>7}{s['p50_ms']:>10.1f}{s['p95_ms']:>10.1f}{s['p99_ms']:>10.1f}{s['max_ms']:>10.1f}")
+    if report["speculation"]:
+        print(f"speculative commits: {report['speculation']}")
+    for line in errors[:5]:
+        print(f"  error: {line}", file=sys.stderr)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
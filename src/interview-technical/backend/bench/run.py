@@ -0,0 +1,336 @@
+"""
+Drive N simulated interview sessions through /ws/transcribe, /evaluate and /tts/stream against
+the real app, with Bedrock, Transcribe and Minimax replaced by local stand-ins (bench.fakes,
+bench.minimax_server). Reports throughput, p50/p95/p99 per stage, and event-loop lag of the
+app's loop (time a 50 ms sleep overshoots).
+
+Run from the backend directory:  python -m bench.run --sessions 20 --turns 3
+"""
+
+import argparse
+import asyncio
+import base64
+import io
+import json
+import logging
+import math
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import aiohttp
+import numpy as np
+
+from bench.fakes import WORDS, FakeBedrockRuntime, FakeTranscribeClient, LatencyModel
+
+SAMPLE_RATE = 16000
+CHUNK_MS = 100
+LAG_PROBE_S = 0.05
+STAGES = ("stt_first_transcript", "stt_end_of_utterance", "evaluate", "tts_first_byte", "tts_total", "turn")
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--sessions", type=int, default=10, help="concurrent simulated sessions")
+    p.add_argument("--turns", type=int, default=3, help="turns per session")
+    p.add_argument("--speech-s", type=float, default=3.0, help="spoken audio per turn (seconds)")
+    p.add_argument("--speed", type=float, default=1.0, help="send audio this many times faster than real time")
+    p.add_argument("--ramp-s", type=float, default=1.0, help="spread session starts over this many seconds")
+    p.add_argument("--sonnet-ms", type=float, default=2500)
+    p.add_argument("--sonnet-p99-ms", type=float, default=6000)
+    p.add_argument("--haiku-ms", type=float, default=600)
+    p.add_argument("--haiku-p99-ms", type=float, default=1500)
+    p.add_argument("--stt-ms", type=float, default=250, help="Transcribe result delay (median)")
+    p.add_argument("--stt-p99-ms", type=float, default=700)
+    p.add_argument("--tts-first-ms", type=float, default=300, help="Minimax first-chunk delay (median)")
+    p.add_argument("--tts-first-p99-ms", type=float, default=900)
+    p.add_argument("--repeat-tts", action="store_true", help="same TTS text every turn (exercise the TTS cache)")
+    p.add_argument("--port", type=int, default=8765, help="app port; the Minimax stand-in uses port + 1")
+    p.add_argument("--seed", type=int, default=None)
+    p.add_argument("--json", metavar="PATH", help="also write the report as JSON")
+    p.add_argument("--verbose", action="store_true", help="keep the app's INFO logs")
+    return p.parse_args(argv)
+
+
+def _diagram_base64() -> str:
+    from PIL import Image, ImageDraw
+
+    image = Image.new("RGB", (640, 400), "white")
+    draw = ImageDraw.Draw(image)
+    for i, label in enumerate(("lb", "api", "cache", "db")):
+        draw.rectangle((30 + i * 150, 160, 130 + i * 150, 240), outline="black", width=3)
+        draw.text((60 + i * 150, 195), label, fill="black")
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return base64.b64encode(buffer.getvalue()).decode()
+
+
+def _pcm(seconds: float, amplitude: float, tone_hz: float | None = None) -> bytes:
+    n = int(seconds * SAMPLE_RATE)
+    if tone_hz:
+        samples = amplitude * np.sin(2 * np.pi * tone_hz * np.arange(n) / SAMPLE_RATE)
+    else:
+        samples = np.random.normal(0.0, amplitude, n)
+    return np.clip(samples, -32768, 32767).astype("<i2").tobytes()
+
+
+def _chunks(pcm: bytes) -> list[bytes]:
+    size = SAMPLE_RATE * 2 * CHUNK_MS // 1000
+    return [pcm[i : i + size] for i in range(0, len(pcm), size)]
+
+
+class AppServer:
+    """The FastAPI app under uvicorn on its own thread/loop, with a loop-lag probe."""
+
+    def __init__(self, port: int) -> None:
+        import uvicorn
+
+        from main import app
+
+        self.server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", lifespan="on"))
+        self.lag_s: list[float] = []
+        self.thread = threading.Thread(target=lambda: asyncio.run(self._serve()), daemon=True)
+
+    async def _probe(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(LAG_PROBE_S)
+            self.lag_s.append(time.perf_counter() - start - LAG_PROBE_S)
+
+    async def _serve(self) -> None:
+        probe = asyncio.create_task(self._probe())
+        try:
+            await self.server.serve()
+        finally:
+            probe.cancel()
+
+    def start(self) -> None:
+        self.thread.start()
+        deadline = time.monotonic() + 30
+        while not self.server.started:
+            if not self.thread.is_alive() or time.monotonic() > deadline:
+                raise RuntimeError("app server did not start")
+            time.sleep(0.05)
+        # Measure a warmed worker: wait for GET /ready (startup warmup done).
+        while True:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{self.server.config.port}/ready", timeout=5):
+                    return
+            except urllib.error.HTTPError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError("app server did not become ready")
+                time.sleep(0.05)
+
+    def stop(self) -> None:
+        self.server.should_exit = True
+        self.thread.join(timeout=10)
+
+
+class MinimaxServer:
+    """bench.minimax_server on its own thread/loop, so its pacing does not load the app's loop."""
+
+    def __init__(self, port: int, first_chunk: LatencyModel) -> None:
+        self.port = port
+        self.first_chunk = first_chunk
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+
+    def start(self) -> None:
+        from bench.minimax_server import start_minimax_server
+
+        self.thread.start()
+        future = asyncio.run_coroutine_threadsafe(
+            start_minimax_server("127.0.0.1", self.port, self.first_chunk), self.loop
+        )
+        self.runner = future.result(timeout=10)
+
+    def stop(self) -> None:
+        asyncio.run_coroutine_threadsafe(self.runner.cleanup(), self.loop).result(timeout=10)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=10)
+
+
+async def _transcribe_turn(http: aiohttp.ClientSession, base: str, args: argparse.Namespace, timings: dict) -> str:
+    """Stream one spoken turn over /ws/transcribe; returns the transcript deltas joined."""
+    calibration = _chunks(_pcm(0.5, 30))
+    speech = _chunks(_pcm(args.speech_s, 8000, tone_hz=220))
+    silence = _chunks(_pcm(1.5, 30))
+    pace = CHUNK_MS / 1000 / args.speed
+    words: list[str] = []
+    first_speech_at: list[float] = []
+    last_speech_at: list[float] = []
+    end_of_utterance = asyncio.Event()
+
+    async with http.ws_connect(f"{base.replace('http', 'ws', 1)}/ws/transcribe") as ws:
+
+        async def receive() -> None:
+            async for msg in ws:
+                if msg.type != aiohttp.WSMsgType.TEXT:
+                    break
+                data = json.loads(msg.data)
+                if data.get("event") == "end_of_utterance":
+                    timings["stt_end_of_utterance"] = time.perf_counter() - last_speech_at[0]
+                    end_of_utterance.set()
+                elif data.get("transcript"):
+                    if not words and first_speech_at:
+                        timings["stt_first_transcript"] = time.perf_counter() - first_speech_at[0]
+                    words.append(data["transcript"])
+                elif "error" in data:
+                    raise RuntimeError(f"transcribe error: {data['error']}")
+
+        receiver = asyncio.create_task(receive())
+        try:
+            for chunk in calibration:
+                await ws.send_bytes(chunk)
+                await asyncio.sleep(pace)
+            first_speech_at.append(time.perf_counter())
+            for chunk in speech:
+                await ws.send_bytes(chunk)
+                await asyncio.sleep(pace)
+            last_speech_at.append(time.perf_counter())
+            for chunk in silence:
+                if end_of_utterance.is_set() or receiver.done():
+                    break
+                await ws.send_bytes(chunk)
+                await asyncio.sleep(pace)
+            await asyncio.wait_for(end_of_utterance.wait(), timeout=5.0)
+        finally:
+            receiver.cancel()
+            await asyncio.gather(receiver, return_exceptions=True)
+    return " ".join(words)
+
+
+async def _turn(http: aiohttp.ClientSession, base: str, args: argparse.Namespace, diagram: str, session: int, turn: int, previous: str) -> tuple[dict, str]:
+    timings: dict[str, float] = {}
+    start = time.perf_counter()
+    transcript = await _transcribe_turn(http, base, args, timings) or " ".join(WORDS)
+    # Distinct text per session/turn so the critique cache does not answer for us.
+    transcript = f"{transcript} (session {session} turn {turn})"
+
+    t0 = time.perf_counter()
+    body = {"transcript": transcript, "diagram_base64": diagram, "previous_state": previous}
+    async with http.post(f"{base}/evaluate", json=body) as resp:
+        resp.raise_for_status()
+        evaluation = await resp.json()
+    timings["evaluate"] = time.perf_counter() - t0
+
+    text = evaluation["verbal_feedback"] if args.repeat_tts else f"{evaluation['verbal_feedback']} Turn {turn} of session {session}."
+    t0 = time.perf_counter()
+    async with http.post(f"{base}/tts/stream", json={"text": text, "emotion": evaluation["minimax_emotion"]}) as resp:
+        resp.raise_for_status()
+        async for _ in resp.content.iter_any():
+            timings.setdefault("tts_first_byte", time.perf_counter() - t0)
+    timings["tts_total"] = time.perf_counter() - t0
+    timings["turn"] = time.perf_counter() - start
+    return timings, json.dumps({"overall_score": evaluation["overall_score"], "transcript": transcript})
+
+
+async def _session(http: aiohttp.ClientSession, base: str, args: argparse.Namespace, diagram: str, session: int, results: list, errors: list) -> None:
+    await asyncio.sleep(random.uniform(0, args.ramp_s))
+    previous = ""
+    for turn in range(args.turns):
+        try:
+            timings, previous = await _turn(http, base, args, diagram, session, turn, previous)
+            results.append(timings)
+        except Exception as e:
+            errors.append(f"session {session} turn {turn}: {type(e).__name__}: {e}")
+
+
+def _summary(values: list[float]) -> dict[str, float]:
+    if not values:
+        return {"count": 0}
+    ms = np.asarray(values) * 1000
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {"count": len(values), "p50_ms": p50, "p95_ms": p95, "p99_ms": p99, "max_ms": float(ms.max())}
+
+
+def _print_report(report: dict) -> None:
+    print(
+        f"\n{report['turns_ok']} turns ok, {report['errors']} errors in {report['wall_s']:.1f}s "
+        f"-> {report['throughput_turns_per_s']:.2f} turns/s ({report['sessions']} sessions)\n"
+    )
+    print(f"{'stage':<24}{'count':>7}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}   (ms)")
+    for name, s in list(report["stages"].items()) + [("event_loop_lag", report["event_loop_lag"])]:
+        if not s["count"]:
+            print(f"{name:<24}{0:>7}")
+            continue
+        print(f"{name:<24}{s['count']:>7}{s['p50_ms']:>10.1f}{s['p95_ms']:>10.1f}{s['p99_ms']:>10.1f}{s['max_ms']:>10.1f}")
+
+
+async def _drive(args: argparse.Namespace, base: str) -> tuple[list, list, float]:
+    diagram = _diagram_base64()
+    results: list[dict] = []
+    errors: list[str] = []
+    timeout = aiohttp.ClientTimeout(total=120)
+    connector = aiohttp.TCPConnector(limit=0)
+    async with aiohttp.ClientSession(timeout=timeout, connector=connector) as http:
+        start = time.perf_counter()
+        await asyncio.gather(*(_session(http, base, args, diagram, i, results, errors) for i in range(args.sessions)))
+        wall = time.perf_counter() - start
+    return results, errors, wall
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    if args.seed is not None:
+        random.seed(args.seed)
+        np.random.seed(args.seed)
+    # Before the app is imported: its basicConfig becomes a no-op, and env-based config sees the stand-ins.
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format="%(asctime)s %(levelname)s %(message)s")
+    cache_dir = tempfile.TemporaryDirectory(prefix="bench-tts-")
+    os.environ.update(
+        MINIMAX_TTS_URL=f"http://127.0.0.1:{args.port + 1}/v1/t2a_v2",
+        MINIMAX_API_KEY="bench",
+        TTS_CACHE_DIR=cache_dir.name,
+        AWS_REGION=os.getenv("AWS_REGION", "us-east-1"),
+    )
+    os.environ.pop("TTS_PREWARM_FILE", None)
+
+    import bedrock_client
+    import transcribe_streaming
+
+    bedrock_client._runtime = FakeBedrockRuntime(
+        sonnet=LatencyModel(args.sonnet_ms, args.sonnet_p99_ms),
+        haiku=LatencyModel(args.haiku_ms, args.haiku_p99_ms),
+    )
+    FakeTranscribeClient.latency = LatencyModel(args.stt_ms, args.stt_p99_ms)
+    transcribe_streaming.TranscribeStreamingClient = FakeTranscribeClient
+
+    minimax = MinimaxServer(args.port + 1, LatencyModel(args.tts_first_ms, args.tts_first_p99_ms))
+    app = AppServer(args.port)
+    minimax.start()
+    app.start()
+    try:
+        results, errors, wall = asyncio.run(_drive(args, f"http://127.0.0.1:{args.port}"))
+    finally:
+        app.stop()
+        minimax.stop()
+        cache_dir.cleanup()
+
+    report = {
+        "sessions": args.sessions,
+        "turns_ok": len(results),
+        "errors": len(errors),
+        "wall_s": wall,
+        "throughput_turns_per_s": len(results) / wall if wall else math.nan,
+        "stages": {name: _summary([r[name] for r in results if name in r]) for name in STAGES},
+        "event_loop_lag": _summary(app.lag_s),
+        "error_samples": errors[:20],
+        "args": vars(args),
+    }
+    _print_report(report)
+    for line in errors[:5]:
+        print(f"  error: {line}", file=sys.stderr)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
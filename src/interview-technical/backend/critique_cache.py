@@ -0,0 +1,83 @@
+"""
+LRU + TTL memoization for Sonnet diagram critiques.
+
+Keyed by a hash of the decoded diagram bytes plus a hash of the normalized transcript, so a
+pause-triggered /evaluate with an unchanged whiteboard and (near-)identical transcript
+reuses the previous CritiqueResponse instead of re-sending the image to Sonnet.
+"""
+
+import base64
+import binascii
+import hashlib
+import re
+import time
+from collections import OrderedDict
+
+from env import env_float, env_int
+from schemas import CritiqueResponse
+
+_NON_WORD = re.compile(r"[^\w\s]")
+_SPACES = re.compile(r"\s+")
+
+
+def diagram_digest(diagram_base64: str) -> str:
+    """sha256 of the decoded image bytes ("" when there is no diagram)."""
+    if not diagram_base64:
+        return ""
+    try:
+        data = base64.b64decode(diagram_base64)
+    except (binascii.Error, ValueError):
+        data = diagram_base64.encode()
+    return hashlib.sha256(data).hexdigest()
+
+
+def normalize_transcript(transcript: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace (STT re-punctuates freely)."""
+    return _SPACES.sub(" ", _NON_WORD.sub(" ", transcript.lower())).strip()
+
+
+def transcript_digest(transcript: str) -> str:
+    return hashlib.sha256(normalize_transcript(transcript).encode()).hexdigest()
+
+
+def critique_key(transcript: str, diagram_base64: str) -> str:
+    return f"{diagram_digest(diagram_base64)}:{transcript_digest(transcript)}"
+
+
+class CritiqueCache:
+    """Bounded LRU with per-entry TTL. Used from the event loop only (no locking)."""
+
+    def __init__(self, max_entries: int = 256, ttl_s: float = 600.0) -> None:
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[float, CritiqueResponse]] = OrderedDict()
+
+    def get(self, key: str) -> CritiqueResponse | None:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: str, value: CritiqueResponse) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_s, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+critique_cache = CritiqueCache(
+    max_entries=env_int("CRITIQUE_CACHE_SIZE", 256),
+    ttl_s=env_float("CRITIQUE_CACHE_TTL_S", 600),
+)
@@ -0,0 +1,82 @@
+"""
+Per-turn policy: does this turn need the Sonnet critique, or can the last scores stand?
+
+The critique runs when there is no baseline yet, when enough new speech has accumulated
+since the last critique (CRITIQUE_MIN_WORDS), or when the diagram changed visibly (perceptual
+hash distance above CRITIQUE_DIAGRAM_BITS). Otherwise the pipeline waits for the Haiku router
+and only runs the critique if the router flags the turn (interrupt, skeptical/concerned).
+"""
+
+import base64
+import binascii
+import io
+import os
+
+import numpy as np
+from PIL import Image, UnidentifiedImageError
+
+from env import env_int
+from schemas import CritiqueBaseline, RouterResponse
+
+MIN_WORDS = env_int("CRITIQUE_MIN_WORDS", 12)
+DIAGRAM_BITS = env_int("CRITIQUE_DIAGRAM_BITS", 6)
+
+_HASH_SIZE = 8
+_SAMPLE_SIZE = 32
+
+
+def policy_enabled() -> bool:
+    return os.getenv("CRITIQUE_POLICY", "1").lower() not in ("0", "false", "no")
+
+
+def _dct_matrix(n: int) -> np.ndarray:
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    m = np.cos(np.pi * (2 * i + 1) * k / (2 * n))
+    m[0] /= np.sqrt(2)
+    return m
+
+
+_DCT = _dct_matrix(_SAMPLE_SIZE)
+
+
+def diagram_phash(diagram_base64: str) -> str:
+    """64-bit DCT perceptual hash (hex) of a base64 image; "" if absent or undecodable."""
+    if not diagram_base64:
+        return ""
+    try:
+        with Image.open(io.BytesIO(base64.b64decode(diagram_base64))) as img:
+            gray = img.convert("L").resize((_SAMPLE_SIZE, _SAMPLE_SIZE), Image.Resampling.LANCZOS)
+    except (binascii.Error, ValueError, OSError, UnidentifiedImageError):
+        return ""
+    pixels = np.asarray(gray, dtype=np.float32)
+    low = (_DCT @ pixels @ _DCT.T)[:_HASH_SIZE, :_HASH_SIZE].flatten()
+    bits = low > np.median(low[1:])
+    return f"{int(''.join('1' if b else '0' for b in bits), 2):016x}"
+
+
+def phash_distance(a: str, b: str) -> int:
+    """Hamming distance between two hashes; a missing hash on one side counts as fully changed."""
+    if a == b:
+        return 0
+    if not a or not b:
+        return _HASH_SIZE * _HASH_SIZE
+    return (int(a, 16) ^ int(b, 16)).bit_count()
+
+
+def critique_reason(baseline: CritiqueBaseline, transcript: str, phash: str) -> str | None:
+    """Why this turn needs a fresh critique, or None if the baseline scores can be reused."""
+    if baseline.critique is None:
+        return "no baseline"
+    words = len(f"{baseline.pending_transcript} {transcript}".split())
+    if words >= MIN_WORDS:
+        return f"transcript words={words}"
+    distance = phash_distance(baseline.diagram_phash, phash)
+    if distance > DIAGRAM_BITS:
+        return f"diagram distance={distance}"
+    return None
+
+
+def router_wants_critique(r: RouterResponse) -> bool:
+    """The router's own read of the turn: interruptions and doubts deserve fresh scores."""
+    return r.should_interrupt or r.emotion.lower().strip() in ("skeptical", "concerned")
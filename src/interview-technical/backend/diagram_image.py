@@ -0,0 +1,105 @@
+"""
+Server-side preparation of uploaded whiteboard diagrams before they go to Sonnet.
+
+The image is flattened onto its background colour, cropped to the drawn bounding box (plus
+DIAGRAM_CROP_PADDING), downscaled so its longer side is at most DIAGRAM_MAX_SIDE, and re-encoded
+as DIAGRAM_FORMAT (jpeg / png / webp, DIAGRAM_QUALITY for the lossy ones). Bedrock bills images
+by pixel area, so the crop and downscale cut input tokens; re-encoding keeps the request small.
+Work runs on a small dedicated thread pool (Pillow releases the GIL while decoding, resizing
+and encoding), sized by DIAGRAM_WORKERS.
+"""
+
+import asyncio
+import base64
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageChops, UnidentifiedImageError
+
+from env import env_int
+
+FORMATS = {"jpeg": ("JPEG", "image/jpeg"), "png": ("PNG", "image/png"), "webp": ("WEBP", "image/webp")}
+# Pixels closer than this (0-255, any channel) to the background do not count as drawing.
+INK_THRESHOLD = 24
+MAX_UPLOAD_BYTES = env_int("DIAGRAM_MAX_UPLOAD_BYTES", 10 * 1024 * 1024)
+
+_executor: ThreadPoolExecutor | None = None
+_lock = threading.Lock()
+
+
+class DiagramError(ValueError):
+    """The upload is not a readable image."""
+
+
+
+def _flatten(img: Image.Image) -> Image.Image:
+    """RGB image; transparent areas (tldraw/canvas exports) become white."""
+    if img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info):
+        rgba = img.convert("RGBA")
+        background = Image.new("RGB", rgba.size, "white")
+        background.paste(rgba, mask=rgba.getchannel("A"))
+        return background
+    return img.convert("RGB")
+
+
+def _crop_to_ink(img: Image.Image, padding: int) -> Image.Image:
+    """Crop to the bounding box of pixels that differ from the top-left (background) colour."""
+    background = Image.new("RGB", img.size, img.getpixel((0, 0)))
+    diff = ImageChops.difference(img, background).convert("L").point(lambda v: 255 if v > INK_THRESHOLD else 0)
+    box = diff.getbbox()
+    if box is None:
+        return img
+    left, top, right, bottom = box
+    return img.crop((
+        max(0, left - padding),
+        max(0, top - padding),
+        min(img.width, right + padding),
+        min(img.height, bottom + padding),
+    ))
+
+
+def prepare_diagram(data: bytes) -> tuple[str, str]:
+    """Decode, crop, downscale and re-encode an uploaded diagram; returns (base64, media_type)."""
+    try:
+        with Image.open(io.BytesIO(data)) as src:
+            img = _flatten(src)
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError) as e:
+        raise DiagramError("Unreadable diagram image") from e
+    original = img.size
+    if os.getenv("DIAGRAM_CROP", "1").lower() not in ("0", "false", "no"):
+        img = _crop_to_ink(img, env_int("DIAGRAM_CROP_PADDING", 16))
+    max_side = env_int("DIAGRAM_MAX_SIDE", 1568)
+    if max(img.size) > max_side:
+        img.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+    fmt, media_type = FORMATS.get(os.getenv("DIAGRAM_FORMAT", "jpeg").lower(), FORMATS["jpeg"])
+    out = io.BytesIO()
+    if fmt == "PNG":
+        img.save(out, format=fmt, optimize=True)
+    else:
+        img.save(out, format=fmt, quality=env_int("DIAGRAM_QUALITY", 85))
+    encoded = out.getvalue()
+    logging.info(
+        "[Diagram] %dx%d %d B -> %dx%d %d B %s",
+        original[0], original[1], len(data), img.width, img.height, len(encoded), media_type,
+    )
+    return base64.b64encode(encoded).decode(), media_type
+
+
+async def prepare_diagram_async(data: bytes) -> tuple[str, str]:
+    """prepare_diagram on the diagram worker pool."""
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=env_int("DIAGRAM_WORKERS", 2), thread_name_prefix="diagram")
+    return await asyncio.get_running_loop().run_in_executor(_executor, prepare_diagram, data)
+
+
+def shutdown_diagram_executor() -> None:
+    global _executor
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
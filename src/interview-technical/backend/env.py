@@ -0,0 +1,31 @@
+"""
+Numeric settings from environment variables.
+
+A malformed value (e.g. STT_FRAME_MS=100ms) logs a warning and falls back to the default
+instead of failing startup with a ValueError at import time.
+"""
+
+import logging
+import os
+
+
+def env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        logging.warning("[Config] %s=%r is not an integer, using %d", name, value, default)
+        return default
+
+
+def env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        logging.warning("[Config] %s=%r is not a number, using %g", name, value, default)
+        return default
@@ -0,0 +1,264 @@
+"""
+Full-duplex interview session over one WebSocket (/ws/session).
+
+Client -> server: binary frames of PCM 16 kHz 16-bit mono mic audio, plus JSON
+SessionControlMessage frames ("start" with previous_state/audio_format, "diagram" with the
+latest whiteboard snapshot, "evaluate" to force a turn).
+Server -> client: JSON events (transcript, turn_start, router, critique, audio_start,
+audio_end, turn_end, turn_cancelled, error) and binary TTS audio frames between
+audio_start/audio_end.
+
+The server detects the end of a turn itself (VAD end-of-utterance plus SESSION_EOU_GRACE_MS
+for the final transcript to land, or no transcript for SESSION_PAUSE_MS), runs the
+streaming evaluation pipeline and speaks the router response as soon as it is ready,
+followed by the critique's follow-up question.
+
+This is an optional alternative to the HTTP endpoints; the frontend does not use it yet.
+"""
+
+import asyncio
+import json
+import logging
+from contextlib import aclosing
+
+from fastapi import WebSocket, WebSocketDisconnect
+from pydantic import BaseModel, ValidationError
+
+from audio_ingest import (
+    AUDIO_QUEUE_MAX,
+    TRANSCRIPT_QUEUE_MAX,
+    DropOldestQueue,
+    coalescer_for_stt,
+    log_ingest_stats,
+    stt_audio_stream,
+)
+from env import env_int
+from schemas import (
+    AudioFormat,
+    CritiqueBaseline,
+    EvaluateCritiqueEvent,
+    EvaluateErrorEvent,
+    EvaluateRouterEvent,
+    MinimaxEmotion,
+    SessionAudioEvent,
+    SessionControlMessage,
+    SessionTranscriptEvent,
+    SessionTurnEvent,
+    UtteranceEndMessage,
+)
+from vad import VoiceActivityDetector, vad_enabled
+
+PAUSE_S = env_int("SESSION_PAUSE_MS", 1500) / 1000
+EOU_GRACE_S = env_int("SESSION_EOU_GRACE_MS", 300) / 1000
+
+
+class InterviewSession:
+    """State and tasks for one connected /ws/session client."""
+
+    def __init__(self, websocket: WebSocket) -> None:
+        self.websocket = websocket
+        self.previous_state = ""
+        self.diagram_base64 = ""
+        self.audio_format = AudioFormat.pcm16_24k
+        self.turn = 0
+        self.baseline = CritiqueBaseline()
+        self._pending: list[str] = []
+        self._send_lock = asyncio.Lock()
+        self._audio_queue = DropOldestQueue(AUDIO_QUEUE_MAX)
+        self._transcript_queue = DropOldestQueue(TRANSCRIPT_QUEUE_MAX)
+        self._coalescer = coalescer_for_stt()
+        self._turn_requests: asyncio.Queue[None] = asyncio.Queue()
+        self._pause_timer: asyncio.Task | None = None
+        self._current_turn: asyncio.Task | None = None
+        self._speaking = False
+        self._vad = VoiceActivityDetector() if vad_enabled() else None
+
+    async def send_event(self, event: BaseModel) -> None:
+        async with self._send_lock:
+            await self.websocket.send_text(event.model_dump_json())
+
+    async def send_audio(self, data: bytes) -> None:
+        async with self._send_lock:
+            await self.websocket.send_bytes(data)
+
+    async def run(self) -> None:
+        await self.websocket.accept()
+        logging.info("[Session] WebSocket connected")
+        tasks = [
+            asyncio.create_task(self._receive()),
+            asyncio.create_task(self._transcribe()),
+            asyncio.create_task(self._collect_transcripts()),
+            asyncio.create_task(self._run_turns()),
+        ]
+        try:
+            # The session ends when the client disconnects (receive loop returns).
+            await tasks[0]
+        finally:
+            self._audio_queue.put_drop_oldest(None)
+            if self._pause_timer is not None:
+                self._pause_timer.cancel()
+            if self._current_turn is not None:
+                tasks.append(self._current_turn)  # and with it the turn's speech
+            for task in tasks[1:]:
+                task.cancel()
+            await asyncio.gather(*tasks[1:], return_exceptions=True)
+            log_ingest_stats("Session", self._audio_queue, self._transcript_queue, self._coalescer)
+            logging.info("[Session] closed after %d turns", self.turn)
+
+    async def _receive(self) -> None:
+        try:
+            while True:
+                message = await self.websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+                if message.get("bytes") is not None:
+                    if self._audio_queue.put_drop_oldest(message["bytes"]) and self._audio_queue.dropped % 50 == 1:
+                        logging.warning("[Session] audio queue full, dropped=%d", self._audio_queue.dropped)
+                elif message.get("text") is not None:
+                    await self._handle_control(message["text"])
+        except WebSocketDisconnect:
+            pass
+        logging.info("[Session] WebSocket disconnected (client closed)")
+
+    async def _handle_control(self, text: str) -> None:
+        try:
+            msg = SessionControlMessage.model_validate(json.loads(text))
+        except (ValueError, ValidationError) as e:
+            await self.send_event(EvaluateErrorEvent(error=f"invalid control message: {e}"))
+            return
+        if msg.previous_state is not None:
+            self.previous_state = msg.previous_state
+        if msg.diagram_base64 is not None:
+            self.diagram_base64 = msg.diagram_base64
+        if msg.audio_format is not None:
+            self.audio_format = msg.audio_format
+        if msg.type == "evaluate":
+            self._request_turn()
+
+    async def _end_of_utterance(self) -> None:
+        await self.send_event(UtteranceEndMessage())
+        self._restart_pause_timer(EOU_GRACE_S)
+
+    async def _transcribe(self) -> None:
+        from transcribe_streaming import transcribe_audio_stream
+
+        try:
+            audio = stt_audio_stream(self._audio_queue, self._coalescer, self._vad, self._end_of_utterance)
+            await transcribe_audio_stream(audio, self._transcript_queue)
+        except Exception as e:
+            logging.exception("[Session] Transcribe failed: %s", e)
+            await self.send_event(EvaluateErrorEvent(error=str(e)))
+        finally:
+            # Blocking put: evicting the oldest item would lose a transcript delta for good.
+            # Skipped on teardown (cancelled), when nobody reads the queue any more.
+            if not asyncio.current_task().cancelling():
+                await self._transcript_queue.put(None)
+
+    async def _collect_transcripts(self) -> None:
+        while (message := await self._transcript_queue.get()) is not None:
+            self._pending.append(message.transcript)
+            await self.send_event(SessionTranscriptEvent(transcript=message.transcript, is_final=message.is_final))
+            # Transcript landing after VAD already closed the utterance: only wait the grace period.
+            utterance_closed = self._vad is not None and not self._vad.in_speech
+            self._restart_pause_timer(EOU_GRACE_S if utterance_closed else PAUSE_S)
+
+    def _restart_pause_timer(self, delay_s: float = PAUSE_S) -> None:
+        if self._pause_timer is not None:
+            self._pause_timer.cancel()
+        self._pause_timer = asyncio.create_task(self._pause_elapsed(delay_s))
+
+    async def _pause_elapsed(self, delay_s: float) -> None:
+        await asyncio.sleep(delay_s)
+        self._request_turn()
+
+    def _request_turn(self) -> None:
+        # A newer turn while the current one is still being evaluated (nothing spoken yet)
+        # supersedes it: its Bedrock calls are cancelled and its speech joins the new turn.
+        if self._current_turn is not None and not self._current_turn.done() and not self._speaking and self._pending:
+            self._current_turn.cancel()
+        self._turn_requests.put_nowait(None)
+
+    async def _run_turns(self) -> None:
+        """Turns run one at a time; speech that arrives during a turn feeds the next one."""
+        while True:
+            await self._turn_requests.get()
+            transcript = " ".join(self._pending).strip()
+            if not transcript:
+                continue
+            self._pending.clear()
+            self.turn += 1
+            self._speaking = False
+            self._current_turn = asyncio.create_task(self._run_turn(self.turn, transcript))
+            try:
+                await self._current_turn
+            except asyncio.CancelledError:
+                if asyncio.current_task().cancelling():
+                    raise
+                logging.info("[Session] turn %d superseded by newer speech", self.turn)
+                self._pending.insert(0, transcript)
+                await self.send_event(SessionTurnEvent(event="turn_cancelled", turn=self.turn))
+            except Exception as e:
+                logging.exception("[Session] turn %d failed: %s", self.turn, e)
+                await self.send_event(EvaluateErrorEvent(error=str(e)))
+
+    async def _run_turn(self, turn: int, transcript: str) -> None:
+        from pipeline import stream_evaluation_pipeline
+
+        await self.send_event(SessionTurnEvent(event="turn_start", turn=turn, transcript=transcript))
+        spoken: list[str] = []
+        speeches: list[asyncio.Task] = []  # chained: each utterance waits for the previous one
+        events = stream_evaluation_pipeline(
+            transcript=transcript,
+            diagram_base64=self.diagram_base64,
+            previous_state=self.previous_state,
+            baseline=self.baseline,
+        )
+        try:
+            # aclosing: a superseded turn cancels the pipeline's Bedrock calls right away.
+            async with aclosing(events):
+                async for event in events:
+                    await self.send_event(event)
+                    if isinstance(event, EvaluateRouterEvent) and event.verbal_feedback.strip():
+                        self._speaking = True
+                        spoken.append(event.verbal_feedback.strip())
+                        after = speeches[-1] if speeches else None
+                        speeches.append(asyncio.create_task(self._speak(turn, spoken[-1], event.minimax_emotion, after=after)))
+                    elif isinstance(event, EvaluateCritiqueEvent) and event.follow_up_question:
+                        self._speaking = True
+                        spoken.append(event.follow_up_question)
+                        after = speeches[-1] if speeches else None
+                        speeches.append(asyncio.create_task(self._speak(turn, spoken[-1], MinimaxEmotion.curious, after=after)))
+            if speeches:
+                await speeches[-1]
+        finally:
+            # Superseded turn or closed socket: stop synthesizing and writing audio.
+            for task in speeches:
+                task.cancel()
+            await asyncio.gather(*speeches, return_exceptions=True)
+        if spoken:
+            self.previous_state = " ".join(spoken)
+        await self.send_event(SessionTurnEvent(event="turn_end", turn=turn))
+
+    async def _speak(
+        self,
+        turn: int,
+        text: str,
+        emotion: MinimaxEmotion,
+        after: asyncio.Task | None = None,
+    ) -> None:
+        """Stream one utterance as binary frames, once the previous utterance (`after`) is done."""
+        from audio_codec import transcode_stream
+        from tts_cache import cached_tts_stream
+
+        if after is not None:
+            await after
+
+        await self.send_event(SessionAudioEvent(event="audio_start", turn=turn, text=text, format=self.audio_format))
+        try:
+            async for frame in transcode_stream(cached_tts_stream(text, emotion), self.audio_format):
+                await self.send_audio(frame)
+        except Exception as e:
+            logging.exception("[Session] TTS failed: %s", e)
+            await self.send_event(EvaluateErrorEvent(error=str(e)))
+        finally:
+            await self.send_event(SessionAudioEvent(event="audio_end", turn=turn, format=self.audio_format))
@@ -1,7 +1,9 @@
 """FastAPI app for the multimodal technical interviewer."""
 
 import asyncio
+import base64
 import logging
+import time
 
 from contextlib import asynccontextmanager
 
@@ -11,26 +13,78 @@ load_dotenv()
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, File, Form, HTTPException, Query, Request, UploadFile, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
 
+from audio_ingest import (
+    AUDIO_QUEUE_MAX,
+    OVERFLOW_POLICY,
+    TRANSCRIPT_QUEUE_MAX,
+    DropOldestQueue,
+    coalescer_for_stt,
+    log_ingest_stats,
+    stt_audio_stream,
+)
+from bedrock_client import executor_stats, init_bedrock, prompt_cache_enabled, shutdown_bedrock, usage_stats
+from metrics import ClientDisconnected, Gauge, TimingMiddleware, render_prometheus
 from schemas import (
+    BackpressureMessage,
+    BedrockAdmissionStats,
+    BedrockExecutorStats,
+    BedrockHedgeStats,
+    BedrockUsageStats,
+    CacheStats,
     ErrorMessage,
+    EvaluateCritiqueEvent,
     EvaluateRequest,
     HealthResponse,
     InterviewEvaluation,
-    TranscriptMessage,
+    ReadinessResponse,
+    RouterSpeakRequest,
+    SessionCreated,
+    SessionCreateRequest,
+    SessionEvaluateRequest,
+    SessionEvaluation,
+    SpeculationStats,
+    SpeculationStatus,
     TTSStreamRequest,
+    UtteranceEndMessage,
+)
+from session_recorder import (
+    RecordKind,
+    close_recorder,
+    init_recorder,
+    new_stream_id,
+    record,
+    recorder_stats,
+    recording,
 )
+from vad import VoiceActivityDetector, vad_enabled
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: optional init (e.g. DSPy compile)
+    # Startup: shared Bedrock client + dedicated executor for LLM calls
+    init_bedrock()
+    init_recorder()
+    from minimax_client import close_minimax_client
+    from tts_cache import prewarm_tts_cache
+    from diagram_image import shutdown_diagram_executor
+    from warmup import run_warmup
+
+    # Warmup (imports, clients, pooled connections) runs in the background; GET /ready
+    # reports 503 until it is done, /health stays a plain liveness check.
+    warmup_task = asyncio.create_task(run_warmup())
+    prewarm_task = asyncio.create_task(prewarm_tts_cache())
     yield
     # Shutdown
-    pass
+    warmup_task.cancel()
+    prewarm_task.cancel()
+    shutdown_diagram_executor()
+    close_recorder()
+    await close_minimax_client()
+    shutdown_bedrock()
 
 
 app = FastAPI(
@@ -54,34 +108,469 @@ app.add_middleware(
 )
 
 
+app.add_middleware(TimingMiddleware)
+
+
+def _cache_gauges() -> dict[tuple[str, ...], float]:
+    from critique_cache import critique_cache
+    from tts_cache import tts_cache
+
+    values: dict[tuple[str, ...], float] = {}
+    for cache, stats in (("critique", critique_cache.stats()), ("tts", tts_cache.stats())):
+        for field, value in stats.items():
+            values[(cache, field)] = value
+    return values
+
+
+def _admission_gauges() -> dict[tuple[str, ...], float]:
+    from admission import admission
+
+    values: dict[tuple[str, ...], float] = {("in_flight",): admission.in_flight}
+    for priority, count in admission.queued().items():
+        values[(f"queued_{priority}",)] = count
+    return values
+
+
+Gauge(
+    "bedrock_executor",
+    "Bedrock executor workers and queued calls",
+    ("stat",),
+    collect=lambda: {(k,): v for k, v in executor_stats().items()},
+)
+Gauge("cache_stats", "Critique/TTS cache entries, hits and misses", ("cache", "stat"), collect=_cache_gauges)
+Gauge(
+    "session_recorder",
+    "Session recorder records written, dropped and queued",
+    ("stat",),
+    collect=lambda: {(k,): v for k, v in (recorder_stats() or {}).items()},
+)
+Gauge("bedrock_admission", "Bedrock calls in flight and queued per priority", ("stat",), collect=_admission_gauges)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """Prometheus text exposition of in-process metrics."""
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/health", response_model=HealthResponse)
 async def health() -> HealthResponse:
     return HealthResponse()
 
 
+@app.get("/ready", response_model=ReadinessResponse)
+async def ready():
+    """Readiness for load balancers / autoscalers: 503 until startup warmup has finished."""
+    from warmup import warmup_state
+
+    body = ReadinessResponse(
+        ready=warmup_state.ready,
+        warmup_ms=warmup_state.duration_ms,
+        steps=warmup_state.steps,
+        failed=warmup_state.failed,
+    )
+    if not warmup_state.ready:
+        return JSONResponse(status_code=503, content=body.model_dump())
+    return body
+
+
+@app.get("/health/bedrock", response_model=BedrockExecutorStats)
+async def health_bedrock() -> BedrockExecutorStats:
+    """Bedrock executor size and queue depth (calls waiting for a worker)."""
+    return BedrockExecutorStats(**executor_stats())
+
+
+@app.get("/health/bedrock-usage", response_model=BedrockUsageStats)
+async def health_bedrock_usage() -> BedrockUsageStats:
+    """Per-model token totals, including prompt-cache read/write tokens."""
+    return BedrockUsageStats(prompt_cache=prompt_cache_enabled(), models=usage_stats())
+
+
+@app.get("/health/bedrock-hedge", response_model=BedrockHedgeStats)
+async def health_bedrock_hedge() -> BedrockHedgeStats:
+    """Per-model hedged-request counts and which attempt won; cancelled calls."""
+    from bedrock_hedge import hedge_stats, hedging_enabled
+
+    return BedrockHedgeStats(enabled=hedging_enabled(), models=hedge_stats())
+
+
+@app.get("/health/bedrock-admission", response_model=BedrockAdmissionStats)
+async def health_bedrock_admission() -> BedrockAdmissionStats:
+    """Bedrock admission control: in-flight calls, queue depth and wait per priority."""
+    from admission import admission
+
+    return BedrockAdmissionStats(**admission.stats())
+
+
+@app.get("/health/speculative", response_model=SpeculationStats)
+async def health_speculative() -> SpeculationStats:
+    from speculative import speculations
+
+    return SpeculationStats(**speculations.stats())
+
+
+@app.get("/health/critique-cache", response_model=CacheStats)
+async def health_critique_cache() -> CacheStats:
+    """Sonnet critique cache size and hit/miss counters."""
+    from critique_cache import critique_cache
+
+    return CacheStats(**critique_cache.stats())
+
+
+@app.get("/health/tts-cache", response_model=CacheStats)
+async def health_tts_cache() -> CacheStats:
+    """Disk TTS cache size and hit/miss counters."""
+    from tts_cache import tts_cache
+
+    return CacheStats(**tts_cache.stats())
+
+
+async def _cancel_on_disconnect(request: Request, task: asyncio.Task) -> None:
+    """Wait for task; if the client disconnects first, cancel it (and its Bedrock calls)."""
+
+    async def disconnected() -> None:
+        while not await request.is_disconnected():
+            await asyncio.sleep(0.25)
+
+    watcher = asyncio.create_task(disconnected())
+    try:
+        done, _ = await asyncio.wait({task, watcher}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        watcher.cancel()
+        if not task.done():
+            task.cancel()
+            await asyncio.wait({task})
+    if task not in done:
+        logging.info("[Evaluate] client disconnected, evaluation cancelled")
+        raise ClientDisconnected()
+
+
 @app.post("/evaluate", response_model=InterviewEvaluation)
-async def evaluate(req: EvaluateRequest) -> InterviewEvaluation:
+async def evaluate(req: EvaluateRequest, request: Request) -> InterviewEvaluation:
     """Run DSPy pipeline and return evaluation; TTS via POST /tts/stream."""
     from pipeline import run_evaluation_pipeline
 
-    return await run_evaluation_pipeline(
-        transcript=req.transcript,
-        diagram_base64=req.diagram_base64,
-        previous_state=req.previous_state,
+    stream_id = new_stream_id()
+    record(RecordKind.EVALUATE, stream_id, req)
+    task = asyncio.create_task(
+        run_evaluation_pipeline(
+            transcript=req.transcript,
+            diagram_base64=req.diagram_base64,
+            previous_state=req.previous_state,
+        )
+    )
+    await _cancel_on_disconnect(request, task)
+    record(RecordKind.EVALUATION, stream_id, task.result())
+    return task.result()
+
+
+async def _read_diagram_upload(diagram: UploadFile | None) -> bytes:
+    from diagram_image import MAX_UPLOAD_BYTES
+
+    if diagram is None:
+        return b""
+    data = await diagram.read()
+    if len(data) > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail="Diagram too large")
+    return data
+
+
+def _record_upload(kind: RecordKind, stream_id: str, data: bytes, **fields: object) -> None:
+    """Record a multipart evaluate form with its diagram as uploaded, so a replay sends the same bytes."""
+    if recording():
+        record(kind, stream_id, {**fields, "diagram_base64": base64.b64encode(data).decode()})
+
+
+async def _prepare_diagram_upload(data: bytes) -> str:
+    from diagram_image import DiagramError, prepare_diagram_async
+
+    if not data:
+        return ""
+    try:
+        diagram_base64, _ = await prepare_diagram_async(data)
+    except DiagramError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return diagram_base64
+
+
+@app.post("/evaluate/upload", response_model=InterviewEvaluation)
+async def evaluate_upload(
+    request: Request,
+    transcript: str = Form(...),
+    previous_state: str = Form(""),
+    diagram: UploadFile | None = File(default=None),
+) -> InterviewEvaluation:
+    """
+    Same as /evaluate with the diagram as a binary multipart file (any Pillow-readable format)
+    instead of base64 JSON. The image is cropped, downscaled and re-encoded before Sonnet.
+    """
+    from pipeline import run_evaluation_pipeline
+
+    diagram_base64 = await _prepare_diagram_upload(await _read_diagram_upload(diagram))
+    req = EvaluateRequest(transcript=transcript, diagram_base64=diagram_base64, previous_state=previous_state)
+    stream_id = new_stream_id()
+    record(RecordKind.EVALUATE, stream_id, req)
+    task = asyncio.create_task(
+        run_evaluation_pipeline(
+            transcript=req.transcript,
+            diagram_base64=req.diagram_base64,
+            previous_state=req.previous_state,
+        )
+    )
+    await _cancel_on_disconnect(request, task)
+    record(RecordKind.EVALUATION, stream_id, task.result())
+    return task.result()
+
+
+@app.post("/evaluate/speculative", response_model=SpeculationStatus, status_code=202)
+async def start_speculative_evaluation(
+    session_id: str = Form(..., max_length=128),
+    turn_id: int = Form(...),
+    transcript: str = Form(...),
+    previous_state: str = Form(""),
+    diagram: UploadFile | None = File(default=None),
+) -> SpeculationStatus:
+    """
+    Start evaluating a turn at an early pause (same form as /evaluate/upload plus session_id and
+    turn_id). Runs in the background; commit it with POST /evaluate/speculative/commit once the
+    pause is confirmed, or cancel it with DELETE /evaluate/speculative/{session_id}.
+    """
+    from pipeline import run_evaluation_pipeline
+    from speculative import fingerprint, speculations
+
+    data = await _read_diagram_upload(diagram)
+    _record_upload(
+        RecordKind.SPECULATE, new_stream_id(), data,
+        session_id=session_id, turn_id=turn_id, transcript=transcript, previous_state=previous_state,
+    )
+
+    async def speculate() -> InterviewEvaluation:
+        return await run_evaluation_pipeline(
+            transcript=transcript,
+            diagram_base64=await _prepare_diagram_upload(data),
+            previous_state=previous_state,
+        )
+
+    started = speculations.start(session_id, turn_id, fingerprint(transcript, data, previous_state), speculate)
+    return SpeculationStatus(session_id=session_id, turn_id=turn_id, status="started" if started else "running")
+
+
+@app.post("/evaluate/speculative/commit", response_model=InterviewEvaluation)
+async def commit_speculative_evaluation(
+    request: Request,
+    response: Response,
+    session_id: str = Form(..., max_length=128),
+    turn_id: int = Form(...),
+    transcript: str = Form(...),
+    previous_state: str = Form(""),
+    diagram: UploadFile | None = File(default=None),
+) -> InterviewEvaluation:
+    """
+    Evaluate a turn whose pause is confirmed: returns the speculative evaluation if it was
+    started on the same transcript, diagram and previous_state (X-Speculation: hit), otherwise
+    discards it and evaluates like /evaluate/upload (X-Speculation: miss). A speculation that
+    fails is replaced by a fresh evaluation too (X-Speculation: failed).
+    """
+    from pipeline import run_evaluation_pipeline
+    from speculative import fingerprint, speculations
+
+    data = await _read_diagram_upload(diagram)
+    stream_id = new_stream_id()
+    _record_upload(
+        RecordKind.SPECULATE_COMMIT, stream_id, data,
+        session_id=session_id, turn_id=turn_id, transcript=transcript, previous_state=previous_state,
+    )
+    task = speculations.take(session_id, turn_id, fingerprint(transcript, data, previous_state))
+    response.headers["X-Speculation"] = "miss" if task is None else "hit"
+    if task is not None:
+        await _cancel_on_disconnect(request, task)
+        if task.cancelled() or task.exception() is not None:
+            # No worse than not speculating: evaluate afresh (a bad diagram raises its 400 here).
+            logging.warning("[Speculative] committed evaluation failed, evaluating afresh")
+            response.headers["X-Speculation"] = "failed"
+            task = None
+    if task is None:
+        task = asyncio.create_task(
+            run_evaluation_pipeline(
+                transcript=transcript,
+                diagram_base64=await _prepare_diagram_upload(data),
+                previous_state=previous_state,
+            )
+        )
+        await _cancel_on_disconnect(request, task)
+    record(RecordKind.EVALUATION, stream_id, task.result())
+    return task.result()
+
+
+@app.delete("/evaluate/speculative/{session_id}", status_code=204)
+async def cancel_speculative_evaluation(session_id: str, turn_id: int | None = Query(default=None)) -> None:
+    """The candidate kept talking: cancel the session's speculation (only turn_id's, if given)."""
+    from speculative import speculations
+
+    record(RecordKind.SPECULATE_CANCEL, new_stream_id(), {"session_id": session_id, "turn_id": turn_id})
+    speculations.cancel(session_id, turn_id)
+
+
+@app.get("/evaluate/critique/{critique_id}", response_model=EvaluateCritiqueEvent)
+async def get_pending_critique(critique_id: str, wait_ms: int = Query(default=0, ge=0, le=30000)):
+    """
+    Follow-up fetch for a critique that missed its turn budget (scores_pending). Waits up to
+    wait_ms for it; 202 while it is still running, 502 if it failed, 404 if unknown to this
+    worker (expired, or started by another one).
+    """
+    from pending_critiques import pending_critiques
+    from pipeline import critique_event
+
+    task = pending_critiques.get(critique_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired critique")
+    if wait_ms and not task.done():
+        await asyncio.wait({asyncio.shield(task)}, timeout=wait_ms / 1000)
+    if not task.done():
+        return JSONResponse(status_code=202, content={"critique_id": critique_id, "status": "pending"})
+    if task.cancelled() or task.exception() is not None:
+        raise HTTPException(status_code=502, detail="Critique failed")
+    return critique_event(task.result())
+
+
+@app.post("/sessions", response_model=SessionCreated)
+async def create_session(req: SessionCreateRequest) -> SessionCreated:
+    """Start a server-side interview session; later turns only send transcript deltas."""
+    from schemas import SessionState
+    from session_store import get_session_store, new_session_id
+
+    state = SessionState(session_id=new_session_id(), previous_state=req.previous_state)
+    await get_session_store().put(state)
+    return SessionCreated(session_id=state.session_id)
+
+
+@app.post("/sessions/{session_id}/evaluate", response_model=SessionEvaluation)
+async def evaluate_session_turn(session_id: str, req: SessionEvaluateRequest, request: Request) -> SessionEvaluation:
+    """
+    Evaluate one turn of a stored session. The turn is evaluated on its transcript delta (as
+    /evaluate is on each turn's transcript) with previous_state taken from the session; the
+    delta is appended to the server-held transcript. Only new fields are returned.
+    A newer turn for the same session cancels this one (409) and takes over its delta.
+    """
+    from critique_cache import diagram_digest
+    from pipeline import run_evaluation_pipeline
+    from schemas import SessionTurn
+    from session_store import get_session_store, session_turns
+
+    if session_turns.supersede(session_id):
+        logging.info("[Sessions] newer turn, cancelling in-flight evaluation session=%s", session_id)
+    store = get_session_store()
+    async with session_turns.lock(session_id):
+        state = await store.get(session_id)
+        if state is None:
+            raise HTTPException(status_code=404, detail="Unknown or expired session")
+
+        delta = f"{session_turns.take_carried(session_id)} {req.transcript_delta.strip()}".strip()
+        task = session_turns.start(
+            session_id,
+            run_evaluation_pipeline(
+                transcript=delta or "(no transcript)",
+                diagram_base64=req.diagram_base64,
+                previous_state=state.previous_state,
+                baseline=state.critique_baseline,
+            ),
+        )
+        try:
+            await _cancel_on_disconnect(request, task)
+        finally:
+            session_turns.finish(session_id, task, delta)
+        if task.cancelled():
+            raise HTTPException(status_code=409, detail="Superseded by a newer turn")
+        result = task.result()
+
+        agent_text = (result.follow_up_question or "").strip() or result.verbal_feedback.strip()
+        turn = len(state.turns) + 1
+        state.transcript = f"{state.transcript} {delta}".strip()
+        state.previous_state = agent_text
+        state.last_diagram_hash = diagram_digest(req.diagram_base64)
+        state.turns.append(SessionTurn(turn=turn, transcript_delta=delta, agent_text=agent_text))
+        await store.put(state)
+    return SessionEvaluation(turn=turn, **result.model_dump(exclude={"transcript"}))
+
+
+@app.delete("/sessions/{session_id}", status_code=204)
+async def delete_session(session_id: str) -> None:
+    from session_store import get_session_store
+
+    await get_session_store().delete(session_id)
+
+
+@app.post("/evaluate/stream")
+async def evaluate_stream(req: EvaluateRequest):
+    """
+    Same as /evaluate but streamed as NDJSON: a "router" line (emotion + spoken feedback)
+    as soon as Haiku answers, then a "critique" line (scores) when Sonnet finishes.
+    """
+    from pipeline import stream_evaluation_pipeline
+
+    async def ndjson():
+        async for event in stream_evaluation_pipeline(
+            transcript=req.transcript,
+            diagram_base64=req.diagram_base64,
+            previous_state=req.previous_state,
+        ):
+            logging.info("[Evaluate] stream event=%s", event.event)
+            yield event.model_dump_json() + "\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
+@app.post("/evaluate/speak")
+async def evaluate_speak(req: RouterSpeakRequest):
+    """
+    Router-only turn spoken directly: Haiku is token-streamed and each finished sentence of
+    its response is sent to Minimax immediately. Returns PCM like /tts/stream.
+    """
+    from pipeline import stream_router_speech
+
+    async def logged_stream():
+        try:
+            chunk_count = 0
+            async for chunk in stream_router_speech(req.transcript, req.previous_state):
+                chunk_count += 1
+                if chunk_count == 1:
+                    logging.info("[Speak] first audio chunk len=%d", len(chunk))
+                yield chunk
+            logging.info("[Speak] stream done chunks=%d", chunk_count)
+        except Exception as e:
+            logging.exception("[Speak] stream failed: %s", e)
+            raise
+
+    return StreamingResponse(
+        logged_stream(),
+        media_type="audio/raw",
+        headers={"Content-Type": "audio/raw; rate=24000"},
     )
 
 
 @app.post("/tts/stream")
 async def tts_stream_endpoint(body: TTSStreamRequest):
-    """Stream PCM audio from Minimax TTS (speech-02-hd)."""
-    logging.info("[TTS] request text_len=%d emotion=%s", len(body.text), body.emotion.value)
+    """
+    Stream audio from Minimax TTS (speech-02-hd), served from the disk cache when possible.
+    `format` selects the output encoding (default raw PCM 24 kHz); `frame_ms` re-frames the
+    output into fixed-size packets; `chunked` synthesizes sentences in parallel.
+    """
+    from audio_codec import content_type, transcode_stream
+
+    logging.info("[TTS] request text_len=%d emotion=%s format=%s", len(body.text), body.emotion.value, body.format.value)
+    record(RecordKind.TTS, new_stream_id(), body)
 
     async def logged_stream():
-        from minimax_client import tts_stream as minimax_stream
+        from minimax_client import tts_stream_chunked
+        from tts_cache import cached_tts_stream as minimax_stream
 
         try:
             chunk_count = 0
-            async for chunk in minimax_stream(body.text, body.emotion):
+            if body.chunked:
+                pcm = tts_stream_chunked(body.text, body.emotion, synth=minimax_stream)
+            else:
+                pcm = minimax_stream(body.text, body.emotion)
+            async for chunk in transcode_stream(pcm, body.format, body.frame_ms):
                 chunk_count += 1
                 if chunk_count == 1:
                     logging.info("[TTS] first chunk received len=%d", len(chunk))
@@ -94,7 +583,7 @@ async def tts_stream_endpoint(body: TTSStreamRequest):
     return StreamingResponse(
         logged_stream(),
         media_type="audio/raw",
-        headers={"Content-Type": "audio/raw; rate=24000"},
+        headers={"Content-Type": content_type(body.format)},
     )
 
 
@@ -102,58 +591,82 @@ async def tts_stream_endpoint(body: TTSStreamRequest):
 async def ws_transcribe(websocket: WebSocket):
     """
     Accept PCM 16kHz 16-bit mono audio as binary frames.
-    Send transcript chunks as JSON: {"transcript": "..."}.
+    Send transcript deltas as JSON: {"transcript": "...", "is_final": bool}; each message
+    carries only words not sent before, so clients can append them directly.
     Uses AWS Transcribe Streaming (same credentials as Bedrock).
+    Silent audio is thinned by server-side VAD (STT_VAD=0 disables it), which also sends
+    {"event": "end_of_utterance"} when the candidate stops speaking.
     """
     await websocket.accept()
     logging.info("[STT] WebSocket connected")
-    audio_queue: asyncio.Queue[bytes | None] = asyncio.Queue()
-    transcript_queue: asyncio.Queue[str] = asyncio.Queue()
+    stream_id = new_stream_id()
+    record(RecordKind.WS_OPEN, stream_id, b"")
+    audio_queue = DropOldestQueue(AUDIO_QUEUE_MAX)
+    transcript_queue = DropOldestQueue(TRANSCRIPT_QUEUE_MAX)
+    coalescer = coalescer_for_stt()
+    vad = VoiceActivityDetector() if vad_enabled() else None
 
-    async def audio_chunks():
-        while True:
-            chunk = await audio_queue.get()
-            if chunk is None:
-                break
-            yield chunk
+    async def end_of_utterance():
+        await websocket.send_text(UtteranceEndMessage().model_dump_json())
 
     async def receive_audio():
         try:
             frame_count = 0
+            last_signal = 0.0
             while True:
                 data = await websocket.receive_bytes()
+                record(RecordKind.AUDIO, stream_id, data)
                 frame_count += 1
                 if frame_count == 1:
                     logging.info("[STT] first audio frame received len=%d", len(data))
-                await audio_queue.put(data)
+                if audio_queue.put_drop_oldest(data):
+                    if audio_queue.dropped == 1 or audio_queue.dropped % 50 == 0:
+                        logging.warning("[STT] audio queue full, dropped=%d", audio_queue.dropped)
+                    now = time.monotonic()
+                    if OVERFLOW_POLICY == "signal" and now - last_signal >= 1.0:
+                        last_signal = now
+                        await websocket.send_text(
+                            BackpressureMessage(dropped_frames=audio_queue.dropped, queue_depth=audio_queue.qsize()).model_dump_json()
+                        )
         except WebSocketDisconnect:
             logging.info("[STT] WebSocket disconnected (client closed)")
         finally:
-            await audio_queue.put(None)
+            audio_queue.put_drop_oldest(None)
 
     async def run_transcribe():
         try:
             from transcribe_streaming import transcribe_audio_stream
-            await transcribe_audio_stream(audio_chunks(), transcript_queue)
+            audio = stt_audio_stream(audio_queue, coalescer, vad, end_of_utterance)
+            await transcribe_audio_stream(audio, transcript_queue)
             logging.info("[STT] Transcribe stream ended normally")
         except Exception as e:
             logging.exception("[STT] Transcribe failed: %s", e)
             await websocket.send_text(ErrorMessage(error=str(e)).model_dump_json())
         finally:
-            await transcript_queue.put(None)
+            # Blocking put: evicting the oldest item would lose a transcript delta for good.
+            # Skipped when cancelled, as nobody reads the queue any more.
+            if not asyncio.current_task().cancelling():
+                await transcript_queue.put(None)
 
     async def send_transcripts():
-        try:
-            count = 0
-            while True:
-                text = await transcript_queue.get()
-                if text is None:
-                    break
-                count += 1
-                logging.info("[STT] sent transcript #%d: %r", count, text[:80] + "..." if len(text) > 80 else text)
-                await websocket.send_text(TranscriptMessage(transcript=text).model_dump_json())
-        except Exception as e:
-            logging.exception("[STT] send_transcripts error: %s", e)
+        count = 0
+        connected = True
+        while (message := await transcript_queue.get()) is not None:
+            # After the client left, keep reading to the sentinel so Transcribe never blocks on a full queue.
+            if not connected:
+                continue
+            count += 1
+            text = message.transcript
+            logging.info("[STT] sent transcript #%d: %r", count, text[:80] + "..." if len(text) > 80 else text)
+            record(RecordKind.TRANSCRIPT, stream_id, message)
+            try:
+                await websocket.send_text(message.model_dump_json())
+            except WebSocketDisconnect:
+                logging.info("[STT] client closed before all transcripts were sent")
+                connected = False
+            except Exception as e:
+                logging.exception("[STT] send_transcripts error: %s", e)
+                connected = False
 
     try:
         await asyncio.gather(
@@ -164,4 +677,20 @@ async def ws_transcribe(websocket: WebSocket):
     except WebSocketDisconnect:
         logging.info("[STT] WebSocket disconnected")
     finally:
-        await audio_queue.put(None)
+        audio_queue.put_drop_oldest(None)
+        record(RecordKind.WS_CLOSE, stream_id, b"")
+        log_ingest_stats("STT", audio_queue, transcript_queue, coalescer)
+        if vad is not None:
+            logging.info("[STT] VAD frames in=%d forwarded=%d", vad.frames_in, vad.frames_out)
+
+
+@app.websocket("/ws/session")
+async def ws_session(websocket: WebSocket):
+    """
+    One full-duplex socket per interview: mic audio and diagram snapshots in; transcripts,
+    evaluation events and TTS audio frames out. Turns are detected server-side.
+    See interview_session.py for the message protocol.
+    """
+    from interview_session import InterviewSession
+
+    await InterviewSession(websocket).run()
@@ -0,0 +1,260 @@
+"""
+In-process metrics (counters, gauges, histograms) rendered in Prometheus text format at
+/metrics, plus a per-request stage timing breakdown sent as a Server-Timing header.
+
+Metrics are plain objects guarded by one lock each, so recording from Bedrock executor threads
+is safe and cheap; there is no external client library. Request timings live in a ContextVar
+set by TimingMiddleware; tasks created while handling the request share it.
+"""
+
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+DEPTH_BUCKETS = (0, 1, 5, 10, 25, 50, 100, 250, 500)
+
+_registry: list["_Metric"] = []
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)) + "}"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = dict(self._values)
+        return super().render() + [f"{self.name}{_labels(self.labelnames, k)} {v:g}" for k, v in values.items()]
+
+
+class Gauge(_Metric):
+    """Set directly, or computed at scrape time from a callback returning {label values: value}."""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        collect: Callable[[], dict[tuple[str, ...], float]] | None = None,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+        self._collect = collect
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = dict(self._values)
+        if self._collect is not None:
+            values.update(self._collect())
+        return super().render() + [f"{self.name}{_labels(self.labelnames, k)} {v:g}" for k, v in values.items()]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = buckets
+        # Per label set: [bucket counts..., +Inf count], sum
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+
+    def render(self) -> list[str]:
+        with self._lock:
+            snapshot = {k: (list(counts), total[0]) for k, (counts, total) in self._series.items()}
+        lines = super().render()
+        names = self.labelnames + ("le",)
+        for key, (counts, total) in snapshot.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_labels(names, key + (f'{bound:g}',))} {cumulative}")
+            cumulative += counts[-1]
+            lines.append(f"{self.name}_bucket{_labels(names, key + ('+Inf',))} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {total:g}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+def render_prometheus() -> str:
+    lines: list[str] = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def model_label(model_id: str) -> str:
+    """Short, stable label for a Bedrock model id (sonnet / haiku)."""
+    for family in ("sonnet", "haiku", "opus"):
+        if family in model_id:
+            return family
+    return model_id
+
+
+# Per-request stage timings (name -> milliseconds), reported as Server-Timing.
+_request_timings: contextvars.ContextVar[dict[str, float] | None] = contextvars.ContextVar("request_timings", default=None)
+
+
+def record_stage(name: str, seconds: float) -> None:
+    """Add a stage duration to the current request's Server-Timing (no-op outside a request)."""
+    timings = _request_timings.get()
+    if timings is not None:
+        timings[name] = timings.get(name, 0.0) + seconds * 1000
+
+
+@contextmanager
+def stage(name: str, histogram: Histogram | None = None, **labels: str) -> Iterator[None]:
+    """Time a block into the request's Server-Timing and, optionally, a histogram."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        record_stage(name, elapsed)
+        if histogram is not None:
+            histogram.observe(elapsed, **labels)
+
+
+class ClientDisconnected(Exception):
+    """Raised by a handler whose client went away; TimingMiddleware ends the request without a response."""
+
+
+class TimingMiddleware:
+    """
+    ASGI middleware: request duration histogram and a Server-Timing response header.
+    Requests abandoned by the client (ClientDisconnected) are counted separately and not timed.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        timings: dict[str, float] = {}
+        token = _request_timings.set(timings)
+        start = time.perf_counter()
+        status = {"code": 500}
+
+        async def send_with_timing(message) -> None:
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                # Streamed responses only report stages finished before the first byte.
+                total = (time.perf_counter() - start) * 1000
+                value = ", ".join([f"{name};dur={ms:.1f}" for name, ms in timings.items()] + [f"total;dur={total:.1f}"])
+                message = {**message, "headers": list(message.get("headers", [])) + [(b"server-timing", value.encode())]}
+            await send(message)
+
+        abandoned = False
+        try:
+            await self.app(scope, receive, send_with_timing)
+        except ClientDisconnected:
+            abandoned = True  # nobody to answer: no response, no status to record
+        finally:
+            _request_timings.reset(token)
+            route = getattr(scope.get("route"), "path", "unmatched")
+            if abandoned:
+                HTTP_CLIENT_DISCONNECTS.inc(method=scope["method"], route=route)
+            else:
+                HTTP_REQUEST_SECONDS.observe(
+                    time.perf_counter() - start, method=scope["method"], route=route, status=str(status["code"])
+                )
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "HTTP request duration (until the response body finished)", ("method", "route", "status")
+)
+HTTP_CLIENT_DISCONNECTS = Counter(
+    "http_client_disconnects_total", "Requests abandoned by the client before a response was sent", ("method", "route")
+)
+BEDROCK_REQUEST_SECONDS = Histogram(
+    "bedrock_request_duration_seconds", "Bedrock call latency as seen by the caller", ("model",)
+)
+BEDROCK_FIRST_TOKEN_SECONDS = Histogram(
+    "bedrock_time_to_first_token_seconds", "Bedrock streaming time to first text delta", ("model",)
+)
+BEDROCK_TOKENS = Counter(
+    "bedrock_tokens_total", "Bedrock tokens by kind (input, output, cache_read, cache_write)", ("model", "kind")
+)
+BEDROCK_ADMISSION_WAIT_SECONDS = Histogram(
+    "bedrock_admission_wait_seconds", "Time a Bedrock call waited for admission", ("model", "priority")
+)
+BEDROCK_ERRORS = Counter("bedrock_errors_total", "Failed Bedrock calls", ("model",))
+BEDROCK_HEDGES = Counter("bedrock_hedged_requests_total", "Duplicate (hedge) Bedrock requests sent", ("model",))
+CRITIQUE_DECISIONS = Counter(
+    "critique_decisions_total", "Per-turn critique outcome (run, skipped, pending, cached, lost)", ("decision",)
+)
+SPECULATIVE_EVALUATIONS = Counter(
+    "speculative_evaluations_total",
+    "Speculative evaluation outcomes (started, hit, unspeculated, mismatched, failed, superseded, cancelled, expired)",
+    ("outcome",),
+)
+TTS_FIRST_CHUNK_SECONDS = Histogram("tts_time_to_first_chunk_seconds", "Minimax time to first audio chunk")
+TTS_REQUESTS = Counter("tts_requests_total", "Minimax synthesis requests", ("outcome",))
+STT_FIRST_TRANSCRIPT_SECONDS = Histogram(
+    "stt_time_to_first_transcript_seconds", "Transcribe time from first audio sent to first transcript"
+)
+STT_TRANSCRIPTS = Counter("stt_transcript_messages_total", "Transcript deltas sent to clients", ("final",))
+STT_DROPPED_FRAMES = Counter("stt_dropped_frames_total", "Frames dropped by bounded STT queues", ("queue",))
+STT_QUEUE_MAX_DEPTH = Histogram(
+    "stt_queue_max_depth", "Deepest fill of an STT queue per connection", ("queue",), buckets=DEPTH_BUCKETS
+)
@@ -1,17 +1,93 @@
 """Minimax TTS client (speech-02-hd). Returns PCM audio stream."""
 
+import asyncio
 import json
 import logging
 import os
-from typing import AsyncIterator
+import time
+from typing import AsyncIterator, Callable
 
 import httpx
 
+from env import env_float, env_int
+from metrics import TTS_FIRST_CHUNK_SECONDS, TTS_REQUESTS, record_stage
 from schemas import MinimaxEmotion
+from sentence_stream import split_sentences
 
-MINIMAX_TTS_URL = "https://api.minimax.io/v1/t2a_v2"
+MINIMAX_TTS_URL = os.getenv("MINIMAX_TTS_URL", "https://api.minimax.io/v1/t2a_v2")
 MODEL_TTS = "speech-02-hd"
 
+# Shared keep-alive client, owned by main.lifespan (created lazily if used outside the app).
+_client: httpx.AsyncClient | None = None
+_ping_task: asyncio.Task | None = None
+
+
+def _build_client() -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=env_int("MINIMAX_MAX_CONNECTIONS", 20),
+        max_keepalive_connections=env_int("MINIMAX_MAX_KEEPALIVE", 10),
+        keepalive_expiry=env_float("MINIMAX_KEEPALIVE_EXPIRY_S", 120),
+    )
+    http2 = os.getenv("MINIMAX_HTTP2", "").lower() in ("1", "true", "yes")
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            logging.warning("[TTS] MINIMAX_HTTP2 set but h2 is not installed; using HTTP/1.1")
+            http2 = False
+    return httpx.AsyncClient(timeout=30.0, limits=limits, http2=http2)
+
+
+def get_minimax_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+    return _client
+
+
+async def warm_minimax_connections(count: int) -> None:
+    """Open `count` pooled connections (DNS + TCP + TLS) with lightweight HEAD pings."""
+    if count <= 0:
+        return
+    client = get_minimax_client()
+
+    async def ping() -> None:
+        try:
+            await client.head(MINIMAX_TTS_URL, timeout=5.0)
+        except httpx.HTTPError as e:
+            logging.warning("[TTS] warmup ping failed: %s", e)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(ping() for _ in range(count)))
+    logging.info("[TTS] warmed %d Minimax connections in %.0f ms", count, (time.perf_counter() - start) * 1000)
+
+
+async def _keepalive_pings(interval_s: float, count: int) -> None:
+    while True:
+        await asyncio.sleep(interval_s)
+        await warm_minimax_connections(count)
+
+
+async def init_minimax_client() -> None:
+    """Create the shared client; optionally pre-open connections and keep them warm."""
+    get_minimax_client()
+    global _ping_task
+    warm = env_int("MINIMAX_WARMUP_CONNECTIONS", 0)
+    await warm_minimax_connections(warm)
+    interval = env_float("MINIMAX_PING_INTERVAL_S", 0)
+    if warm > 0 and interval > 0:
+        _ping_task = asyncio.create_task(_keepalive_pings(interval, warm))
+
+
+async def close_minimax_client() -> None:
+    global _client, _ping_task
+    if _ping_task is not None:
+        _ping_task.cancel()
+        _ping_task = None
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
 
 def get_minimax_api_key() -> str:
     key = os.getenv("MINIMAX_API_KEY")
@@ -69,39 +145,103 @@ async def tts_stream(
         },
     }
     headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+    client = get_minimax_client()
+    start = time.perf_counter()
+    first_chunk = True
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            async with client.stream("POST", MINIMAX_TTS_URL, json=payload, headers=headers) as resp:
-                logging.info("[TTS] Minimax response status=%d content_type=%s", resp.status_code, resp.headers.get("content-type"))
-                resp.raise_for_status()
-                async for line in resp.aiter_lines():
-                    line = line.strip()
-                    if not line:
+        async with client.stream("POST", MINIMAX_TTS_URL, json=payload, headers=headers) as resp:
+            logging.info("[TTS] Minimax response status=%d content_type=%s http=%s", resp.status_code, resp.headers.get("content-type"), resp.http_version)
+            resp.raise_for_status()
+            async for line in resp.aiter_lines():
+                line = line.strip()
+                if not line:
+                    continue
+                raw = line
+                if raw.startswith("data:"):
+                    raw = raw[5:].strip()
+                try:
+                    obj = json.loads(raw)
+                except json.JSONDecodeError:
+                    continue
+                items = obj if isinstance(obj, list) else [obj]
+                for item in items:
+                    data = item.get("data") if isinstance(item.get("data"), dict) else None
+                    if not data:
+                        continue
+                    status = data.get("status")
+                    if status == 2:
+                        continue
+                    audio_hex = data.get("audio")
+                    if not audio_hex or not isinstance(audio_hex, str):
                         continue
-                    raw = line
-                    if raw.startswith("data:"):
-                        raw = raw[5:].strip()
                     try:
-                        obj = json.loads(raw)
-                    except json.JSONDecodeError:
+                        decoded = bytes.fromhex(audio_hex)
+                    except ValueError:
                         continue
-                    items = obj if isinstance(obj, list) else [obj]
-                    for item in items:
-                        data = item.get("data") if isinstance(item.get("data"), dict) else None
-                        if not data:
-                            continue
-                        status = data.get("status")
-                        if status == 2:
-                            continue
-                        audio_hex = data.get("audio")
-                        if not audio_hex or not isinstance(audio_hex, str):
-                            continue
-                        try:
-                            decoded = bytes.fromhex(audio_hex)
-                        except ValueError:
-                            continue
-                        if decoded:
-                            yield decoded
+                    if decoded:
+                        if first_chunk:
+                            first_chunk = False
+                            elapsed = time.perf_counter() - start
+                            TTS_FIRST_CHUNK_SECONDS.observe(elapsed)
+                            record_stage("tts-first-chunk", elapsed)
+                            logging.info("[TTS] Minimax time_to_first_chunk_ms=%.0f text_len=%d", elapsed * 1000, len(text))
+                        yield decoded
     except Exception as e:
+        TTS_REQUESTS.inc(outcome="error")
         logging.exception("[TTS] Minimax request failed: %s", e)
         raise
+    TTS_REQUESTS.inc(outcome="ok")
+
+
+async def tts_stream_chunked(
+    text: str,
+    emotion: MinimaxEmotion,
+    *,
+    max_parallel: int | None = None,
+    silence_ms: int | None = None,
+    synth: Callable[..., AsyncIterator[bytes]] | None = None,
+    **voice,
+) -> AsyncIterator[bytes]:
+    """
+    Split text into sentences and synthesize up to max_parallel of them at once, yielding
+    PCM in the original order: sentence 1 streams through as it arrives while later ones
+    are prefetched. silence_ms of silence is inserted at each boundary.
+    synth defaults to tts_stream (pass the cached variant to reuse per-sentence cache hits).
+    """
+    synth = synth or tts_stream
+    if max_parallel is None:
+        max_parallel = env_int("TTS_CHUNK_PARALLELISM", 3)
+    if silence_ms is None:
+        silence_ms = env_int("TTS_CHUNK_SILENCE_MS", 120)
+    parts = split_sentences(text)
+    if len(parts) <= 1:
+        async for chunk in synth(text, emotion, **voice):
+            yield chunk
+        return
+
+    logging.info("[TTS] chunked synthesis parts=%d parallel=%d", len(parts), max_parallel)
+    gap = bytes(24000 * 2 * silence_ms // 1000)
+    semaphore = asyncio.Semaphore(max(1, max_parallel))
+    queues: list[asyncio.Queue[bytes | BaseException | None]] = [asyncio.Queue() for _ in parts]
+
+    async def worker(index: int, part: str) -> None:
+        async with semaphore:
+            try:
+                async for chunk in synth(part, emotion, **voice):
+                    queues[index].put_nowait(chunk)
+                queues[index].put_nowait(None)
+            except Exception as e:
+                queues[index].put_nowait(e)
+
+    tasks = [asyncio.create_task(worker(i, part)) for i, part in enumerate(parts)]
+    try:
+        for index, queue in enumerate(queues):
+            if index and gap:
+                yield gap
+            while (item := await queue.get()) is not None:
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+    finally:
+        for task in tasks:
+            task.cancel()
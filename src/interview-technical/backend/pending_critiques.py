@@ -0,0 +1,63 @@
+"""
+Critiques that missed their turn's latency budget and are finishing in the background.
+
+The pipeline hands the still-running (or retried) Sonnet task over under a critique_id; the
+result is picked up by the session's next turn or fetched via GET /evaluate/critique/{id}.
+Entries live in this process for PENDING_CRITIQUE_TTL_S.
+
+Like speculative.py, this is per process: with several workers sharing sessions through the
+SQLite session store, a session's requests must reach the same worker. A critique started
+elsewhere is unknown here; the next turn logs the drop and critiques afresh, and
+GET /evaluate/critique/{id} answers 404.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+
+from env import env_float
+from schemas import CritiqueResponse
+
+PENDING_CRITIQUE_TTL_S = env_float("PENDING_CRITIQUE_TTL_S", 600)
+
+
+def _log_outcome(task: asyncio.Task) -> None:
+    if task.cancelled():
+        return
+    if task.exception() is not None:
+        logging.warning("[Evaluate] background critique failed: %s", task.exception())
+    else:
+        logging.info("[Evaluate] background critique ready")
+
+
+class PendingCritiques:
+    def __init__(self, ttl_s: float) -> None:
+        self.ttl_s = ttl_s
+        self._jobs: dict[str, tuple[float, asyncio.Task[CritiqueResponse]]] = {}
+
+    def add(self, task: "asyncio.Task[CritiqueResponse]") -> str:
+        self._prune()
+        critique_id = uuid.uuid4().hex
+        self._jobs[critique_id] = (time.monotonic(), task)
+        task.add_done_callback(_log_outcome)
+        return critique_id
+
+    def get(self, critique_id: str) -> "asyncio.Task[CritiqueResponse] | None":
+        entry = self._jobs.get(critique_id)
+        return entry[1] if entry is not None else None
+
+    def discard(self, critique_id: str) -> None:
+        """Drop a critique nobody will need (superseded by a newer one) and cancel it."""
+        entry = self._jobs.pop(critique_id, None)
+        if entry is not None:
+            entry[1].cancel()
+
+    def _prune(self) -> None:
+        cutoff = time.monotonic() - self.ttl_s
+        for critique_id in [k for k, (added, _) in self._jobs.items() if added < cutoff]:
+            _, task = self._jobs.pop(critique_id)
+            task.cancel()
+
+
+pending_critiques = PendingCritiques(PENDING_CRITIQUE_TTL_S)
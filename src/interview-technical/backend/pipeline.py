@@ -1,26 +1,45 @@
 """DSPy-style evaluation pipeline: parallel Sonnet (diagram critique) + Haiku (routing)."""
 
+import asyncio
 import json
+import logging
 import re
+from typing import AsyncIterator
 
+from env import env_int
 from schemas import (
+    CritiqueBaseline,
     CritiqueResponse,
     DesignAspect,
+    EvaluateCritiqueEvent,
+    EvaluateErrorEvent,
+    EvaluateRouterEvent,
+    EvaluateStreamEvent,
     InterviewEvaluation,
     MinimaxEmotion,
     RouterResponse,
 )
 from bedrock_client import (
-    get_bedrock_runtime,
-    invoke_claude_with_image,
+    astream_claude,
+    get_shared_runtime,
     HAIKU_ID,
     SONNET_ID,
 )
+from bedrock_hedge import call_claude
+from critique_cache import critique_cache, critique_key
+from critique_policy import critique_reason, diagram_phash, policy_enabled, router_wants_critique
+from metrics import CRITIQUE_DECISIONS
+from pending_critiques import pending_critiques
+from sentence_stream import ResponseFieldExtractor, SentenceSplitter, find_string_field
 
-CRITIQUE_PROMPT = """You are a senior system design interviewer. Analyze the candidate's diagram and verbal explanation.
+# End-to-end budget for one evaluation turn; a critique that misses it finishes in the background.
+TURN_BUDGET_S = env_int("EVALUATE_TURN_BUDGET_MS", 6000) / 1000
 
-Transcript:
-{transcript}
+# Shown when a turn's critique is pending and there are no earlier scores to fall back on.
+NO_SCORES = CritiqueResponse(design_aspects=[], diagram_score=0.0, verbal_score=0.0, overall_score=0.0)
+
+# Static instructions go in the system prefix (prompt-cached with the diagram); only the per-turn text varies.
+CRITIQUE_SYSTEM = """You are a senior system design interviewer. Analyze the candidate's diagram and verbal explanation.
 
 Respond with a single JSON object (no markdown, no code block) with exactly these keys:
 - "design_aspects": list of objects with "component", "score" (0-1), "feedback", "issues" (list of strings)
@@ -30,12 +49,17 @@ Respond with a single JSON object (no markdown, no code block) with exactly thes
 - "follow_up": one short probing question string, or null
 """
 
-ROUTER_PROMPT = """You are routing the interview conversation. Based on transcript and previous state, output JSON only (no markdown) with:
+CRITIQUE_PROMPT = """Transcript:
+{transcript}
+"""
+
+ROUTER_SYSTEM = """You are routing the interview conversation. Based on transcript and previous state, output JSON only (no markdown) with:
 - "emotion": one of skeptical, encouraging, concerned, approving, curious, neutral
 - "should_interrupt": boolean
 - "response": short feedback text to speak to the candidate
+"""
 
-Previous state: {previous_state}
+ROUTER_PROMPT = """Previous state: {previous_state}
 
 Transcript: {transcript}
 """
@@ -80,45 +104,330 @@ def _design_aspects_from_critique(c: CritiqueResponse) -> list[DesignAspect]:
     ]
 
 
-async def run_evaluation_pipeline(
-    transcript: str,
-    diagram_base64: str,
-    previous_state: str = "",
-) -> InterviewEvaluation:
-    """Run Sonnet (critique) and Haiku (router) in parallel, merge and validate."""
-    import asyncio
+async def _run_critique(transcript: str, diagram_base64: str) -> CritiqueResponse:
+    """Sonnet: diagram + transcript critique (memoized on diagram bytes + normalized transcript)."""
+    key = critique_key(transcript, diagram_base64)
+    cached = critique_cache.get(key)
+    if cached is not None:
+        logging.info("[Evaluate] critique cache hit")
+        CRITIQUE_DECISIONS.inc(decision="cached")
+        return cached
 
-    client = get_bedrock_runtime()
+    raw = await call_claude(
+        get_shared_runtime(),
+        SONNET_ID,
+        CRITIQUE_PROMPT.format(transcript=transcript),
+        image_base64=diagram_base64 or None,
+        max_tokens=2048,
+        system=CRITIQUE_SYSTEM,
+    )
+    critique = _parse_critique(raw)
+    CRITIQUE_DECISIONS.inc(decision="run")
+    critique_cache.put(key, critique)
+    return critique
 
-    def run_sonnet() -> str:
-        prompt = CRITIQUE_PROMPT.format(transcript=transcript)
-        return invoke_claude_with_image(
-            client, SONNET_ID, prompt, image_base64=diagram_base64 or None, max_tokens=2048
-        )
 
-    def run_haiku() -> str:
-        prompt = ROUTER_PROMPT.format(previous_state=previous_state or "none", transcript=transcript)
-        return invoke_claude_with_image(client, HAIKU_ID, prompt, max_tokens=1024)
+async def _run_router(transcript: str, previous_state: str) -> RouterResponse:
+    """Haiku: emotion, spoken response and interrupt decision."""
+    prompt = ROUTER_PROMPT.format(previous_state=previous_state or "none", transcript=transcript)
+    raw = await call_claude(get_shared_runtime(), HAIKU_ID, prompt, max_tokens=1024, system=ROUTER_SYSTEM)
+    return _parse_router(raw)
 
-    critique_raw, router_raw = await asyncio.gather(
-        asyncio.get_event_loop().run_in_executor(None, run_sonnet),
-        asyncio.get_event_loop().run_in_executor(None, run_haiku),
+
+def _follow_up(c: CritiqueResponse) -> str | None:
+    return c.follow_up.strip() or None if c.follow_up else None
+
+
+def _router_event(r: RouterResponse) -> EvaluateRouterEvent:
+    return EvaluateRouterEvent(
+        minimax_emotion=_safe_emotion(r.emotion),
+        verbal_feedback=r.response,
+        should_interrupt=r.should_interrupt,
+    )
+
+
+def critique_event(c: CritiqueResponse, stale: bool = False, critique_id: str | None = None) -> EvaluateCritiqueEvent:
+    return EvaluateCritiqueEvent(
+        diagram_score=c.diagram_score,
+        verbal_score=c.verbal_score,
+        overall_score=c.overall_score,
+        design_aspects=_design_aspects_from_critique(c),
+        follow_up_question=_follow_up(c),
+        scores_stale=stale,
+        scores_pending=critique_id is not None,
+        critique_id=critique_id,
     )
 
-    c = _parse_critique(critique_raw)
-    r = _parse_router(router_raw)
 
-    design_aspects = _design_aspects_from_critique(c)
-    follow_up = c.follow_up.strip() or None if c.follow_up else None
+async def _plan_critique(
+    transcript: str, diagram_base64: str, baseline: CritiqueBaseline | None, pending_lost: bool = False
+) -> tuple[bool, str]:
+    """(critique must run regardless of the router, diagram perceptual hash)."""
+    if baseline is None or not policy_enabled():
+        return True, ""
+    phash = await asyncio.to_thread(diagram_phash, diagram_base64)
+    # The lost background critique also took the speech it covered with it.
+    reason = "background critique lost" if pending_lost else critique_reason(baseline, transcript, phash)
+    if reason is not None:
+        logging.info("[Evaluate] critique needed: %s", reason)
+    return reason is not None, phash
+
+
+def _critique_transcript(transcript: str, baseline: CritiqueBaseline | None) -> str:
+    if baseline is None or not baseline.pending_transcript:
+        return transcript
+    return f"{baseline.pending_transcript} {transcript}"
+
+
+def _update_baseline(baseline: CritiqueBaseline | None, transcript: str, phash: str, c: CritiqueResponse | None) -> None:
+    """Record a fresh critique (c) or fold a skipped turn's speech into the next critique."""
+    if baseline is None:
+        return
+    if c is not None:
+        baseline.critique = c
+        baseline.diagram_phash = phash
+        baseline.pending_transcript = ""
+        baseline.undelivered = False
+        # An older background critique must not overwrite this one on the next turn.
+        _drop_pending(baseline)
+    else:
+        baseline.pending_transcript = _critique_transcript(transcript, baseline)
+
+
+def _drop_pending(baseline: CritiqueBaseline) -> None:
+    if baseline.pending_critique_id:
+        pending_critiques.discard(baseline.pending_critique_id)
+    baseline.pending_critique_id = ""
+    baseline.pending_phash = ""
+
+
+def _absorb_background_critique(baseline: CritiqueBaseline | None) -> bool:
+    """
+    Adopt a critique that finished in the background since the last turn. True if it is lost
+    (failed, expired, or started by another worker): this turn must critique afresh.
+    """
+    if baseline is None or not baseline.pending_critique_id:
+        return False
+    task = pending_critiques.get(baseline.pending_critique_id)
+    if task is not None and not task.done():
+        return False
+    lost = task is None or task.cancelled() or task.exception() is not None
+    if task is None:
+        # Pending critiques live in the worker that started them (see pending_critiques.py).
+        logging.warning("[Evaluate] background critique %s not in this worker, dropped", baseline.pending_critique_id)
+        CRITIQUE_DECISIONS.inc(decision="lost")
+    elif not lost:
+        logging.info("[Evaluate] delivering background critique on this turn")
+        baseline.critique = task.result()
+        baseline.diagram_phash = baseline.pending_phash
+        baseline.undelivered = True
+    baseline.pending_critique_id = ""
+    baseline.pending_phash = ""
+    return lost
+
+
+def _previous_scores(baseline: CritiqueBaseline) -> CritiqueResponse:
+    """Baseline scores; the follow-up only if it came from the background and was not asked yet."""
+    c = baseline.critique if baseline.undelivered else baseline.critique.model_copy(update={"follow_up": None})
+    baseline.undelivered = False
+    return c
+
+
+def _turn_deadline() -> float | None:
+    return asyncio.get_running_loop().time() + TURN_BUDGET_S if TURN_BUDGET_S > 0 else None
+
+
+async def _critique_by_deadline(
+    task: "asyncio.Task[CritiqueResponse]",
+    transcript: str,
+    diagram_base64: str,
+    deadline: float | None,
+) -> tuple[CritiqueResponse | None, str | None]:
+    """
+    (critique, None) if it finishes and parses by the turn deadline. Otherwise (None, critique_id):
+    a late critique keeps running in the background, a failed one is retried there once.
+    """
+    timeout = None if deadline is None else max(0.0, deadline - asyncio.get_running_loop().time())
+    done, _ = await asyncio.wait({task}, timeout=timeout)
+    if task in done:
+        try:
+            return task.result(), None
+        except Exception as e:
+            logging.warning("[Evaluate] critique failed (%s), retrying in background", e)
+            task = asyncio.create_task(_run_critique(transcript, diagram_base64))
+    else:
+        logging.warning("[Evaluate] critique missed the %.0f ms turn budget, finishing in background", TURN_BUDGET_S * 1000)
+    CRITIQUE_DECISIONS.inc(decision="pending")
+    return None, pending_critiques.add(task)
+
+
+def _mark_pending(baseline: CritiqueBaseline | None, critique_id: str, phash: str) -> CritiqueResponse:
+    """Hand the turn's critique to the background; return the scores to show meanwhile."""
+    if baseline is None:
+        return NO_SCORES
+    if baseline.pending_critique_id != critique_id:
+        _drop_pending(baseline)
+    baseline.pending_critique_id = critique_id
+    baseline.pending_phash = phash
+    # The background critique covers the speech accumulated so far.
+    baseline.pending_transcript = ""
+    return _previous_scores(baseline) if baseline.critique is not None else NO_SCORES
+
+
+async def run_evaluation_pipeline(
+    transcript: str,
+    diagram_base64: str,
+    previous_state: str = "",
+    baseline: CritiqueBaseline | None = None,
+) -> InterviewEvaluation:
+    """
+    Run Sonnet (critique) and Haiku (router) in parallel, merge and validate.
+    With a baseline (session turns), short turns on an unchanged diagram wait for the router
+    instead and skip the critique unless the router flags the turn; the previous scores are
+    then returned with scores_stale=True. The baseline is updated in place for the next turn.
+    If the critique misses EVALUATE_TURN_BUDGET_MS or fails, the router response is returned
+    with scores_pending=True and a critique_id; the critique finishes in the background.
+    """
+    deadline = _turn_deadline()
+    pending_lost = _absorb_background_critique(baseline)
+    must_critique, phash = await _plan_critique(transcript, diagram_base64, baseline, pending_lost)
+    critique_transcript = _critique_transcript(transcript, baseline)
+    router_task = asyncio.create_task(_run_router(transcript, previous_state))
+    critique_task = asyncio.create_task(_run_critique(critique_transcript, diagram_base64)) if must_critique else None
+    critique_id: str | None = None
+    stale = False
+    try:
+        r = await router_task
+        if critique_task is None and router_wants_critique(r):
+            logging.info("[Evaluate] critique needed: router")
+            critique_task = asyncio.create_task(_run_critique(critique_transcript, diagram_base64))
+        if critique_task is None:
+            logging.info("[Evaluate] critique skipped, reusing previous scores")
+            CRITIQUE_DECISIONS.inc(decision="skipped")
+            _update_baseline(baseline, transcript, phash, None)
+            c, stale = _previous_scores(baseline), True
+        else:
+            c, critique_id = await _critique_by_deadline(critique_task, critique_transcript, diagram_base64, deadline)
+            if c is not None:
+                _update_baseline(baseline, transcript, phash, c)
+            else:
+                c = _mark_pending(baseline, critique_id, phash)
+                stale = c is not NO_SCORES
+    finally:
+        router_task.cancel()
+        if critique_task is not None and critique_id is None:
+            critique_task.cancel()
 
     return InterviewEvaluation(
         transcript=transcript,
         diagram_score=c.diagram_score,
         verbal_score=c.verbal_score,
         overall_score=c.overall_score,
-        design_aspects=design_aspects,
+        design_aspects=_design_aspects_from_critique(c),
         minimax_emotion=_safe_emotion(r.emotion),
         verbal_feedback=r.response,
-        follow_up_question=follow_up,
+        follow_up_question=_follow_up(c),
         should_interrupt=r.should_interrupt,
+        scores_stale=stale,
+        scores_pending=critique_id is not None,
+        critique_id=critique_id,
     )
+
+
+async def stream_evaluation_pipeline(
+    transcript: str,
+    diagram_base64: str,
+    previous_state: str = "",
+    baseline: CritiqueBaseline | None = None,
+) -> AsyncIterator[EvaluateStreamEvent]:
+    """
+    Same model calls as run_evaluation_pipeline, but yield each part as soon as it is ready:
+    the Haiku router event first, then the Sonnet critique event.
+    A failing router yields an error event; the critique is still delivered.
+    When the critique is skipped, the critique event carries the previous scores (scores_stale);
+    when it misses the turn budget or fails, it carries scores_pending and a critique_id.
+    """
+    deadline = _turn_deadline()
+    pending_lost = _absorb_background_critique(baseline)
+    must_critique, phash = await _plan_critique(transcript, diagram_base64, baseline, pending_lost)
+    critique_transcript = _critique_transcript(transcript, baseline)
+    router_task = asyncio.create_task(_run_router(transcript, previous_state))
+    critique_task = asyncio.create_task(_run_critique(critique_transcript, diagram_base64)) if must_critique else None
+    critique_id: str | None = None
+    try:
+        try:
+            r = await router_task
+        except Exception as e:
+            logging.exception("[Evaluate] stream part failed: %s", e)
+            yield EvaluateErrorEvent(error=str(e))
+            # Without the router's verdict, fall back to a fresh critique.
+            r = None
+        else:
+            yield _router_event(r)
+        if critique_task is None:
+            if r is not None and not router_wants_critique(r):
+                logging.info("[Evaluate] critique skipped, reusing previous scores")
+                CRITIQUE_DECISIONS.inc(decision="skipped")
+                _update_baseline(baseline, transcript, phash, None)
+                yield critique_event(_previous_scores(baseline), stale=True)
+                return
+            critique_task = asyncio.create_task(_run_critique(critique_transcript, diagram_base64))
+        c, critique_id = await _critique_by_deadline(critique_task, critique_transcript, diagram_base64, deadline)
+        if c is not None:
+            _update_baseline(baseline, transcript, phash, c)
+            yield critique_event(c)
+        else:
+            c = _mark_pending(baseline, critique_id, phash)
+            yield critique_event(c, stale=c is not NO_SCORES, critique_id=critique_id)
+    finally:
+        router_task.cancel()
+        if critique_task is not None and critique_id is None:
+            critique_task.cancel()
+
+
+async def stream_router_speech(
+    transcript: str,
+    previous_state: str = "",
+) -> AsyncIterator[bytes]:
+    """
+    Token-stream the Haiku router and speak its "response" field sentence by sentence:
+    each sentence goes to Minimax as soon as it closes, while Haiku keeps generating.
+    Yields PCM chunks (24 kHz) in sentence order.
+    """
+    from minimax_client import tts_stream
+
+    client = get_shared_runtime()
+    prompt = ROUTER_PROMPT.format(previous_state=previous_state or "none", transcript=transcript)
+    sentences: asyncio.Queue[tuple[str, MinimaxEmotion] | None] = asyncio.Queue()
+
+    async def produce() -> None:
+        extractor = ResponseFieldExtractor("response")
+        splitter = SentenceSplitter()
+        emotion: MinimaxEmotion | None = None
+        try:
+            async for delta in astream_claude(client, HAIKU_ID, prompt, max_tokens=1024, system=ROUTER_SYSTEM):
+                text = extractor.feed(delta)
+                if not text:
+                    continue
+                for sentence in splitter.feed(text):
+                    if emotion is None:
+                        emotion = _safe_emotion(find_string_field(extractor.raw, "emotion") or "")
+                    logging.info("[Router] sentence ready len=%d", len(sentence))
+                    await sentences.put((sentence, emotion))
+            rest = splitter.flush()
+            if rest:
+                if emotion is None:
+                    emotion = _safe_emotion(find_string_field(extractor.raw, "emotion") or "")
+                await sentences.put((rest, emotion))
+        finally:
+            await sentences.put(None)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while (item := await sentences.get()) is not None:
+            sentence, emotion = item
+            async for chunk in tts_stream(sentence, emotion):
+                yield chunk
+        await producer
+    finally:
+        producer.cancel()
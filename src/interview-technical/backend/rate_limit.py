@@ -0,0 +1,45 @@
+"""
+Token bucket for request-rate limits (e.g. Bedrock requests per minute per model).
+
+Non-blocking: callers take a token with try_acquire() and, when none is left, ask wait_time()
+how long until the next one. Queueing and wake-ups are left to the caller (admission.py).
+"""
+
+import time
+
+
+class TokenBucket:
+    """`rate` tokens per second refilled up to `burst`; rate <= 0 means unlimited."""
+
+    def __init__(self, rate: float, burst: float | None = None) -> None:
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+
+    @classmethod
+    def per_minute(cls, requests_per_minute: float, burst: float | None = None) -> "TokenBucket":
+        return cls(requests_per_minute / 60, burst if burst is not None else max(1.0, requests_per_minute / 60))
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def available(self) -> float:
+        if self.rate <= 0:
+            return float("inf")
+        self._refill()
+        return self._tokens
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take `tokens` if available now, without waiting."""
+        if self.available() < tokens:
+            return False
+        if self.rate > 0:
+            self._tokens -= tokens
+        return True
+
+    def wait_time(self, tokens: float = 1.0) -> float:
+        """Seconds until `tokens` will be available."""
+        return max(0.0, (tokens - self.available()) / self.rate) if self.rate > 0 else 0.0
@@ -15,6 +15,15 @@ class MinimaxEmotion(str, Enum):
     neutral = "neutral"
 
 
+class AudioFormat(str, Enum):
+    """/tts/stream output encodings (Minimax always produces pcm16_24k)."""
+
+    pcm16_24k = "pcm16_24k"
+    pcm16_16k = "pcm16_16k"
+    mulaw_16k = "mulaw_16k"
+    mulaw_8k = "mulaw_8k"
+
+
 class DesignAspect(BaseModel):
     model_config = ConfigDict(strict=True)
 
@@ -36,6 +45,74 @@ class InterviewEvaluation(BaseModel):
     verbal_feedback: str
     follow_up_question: str | None = None
     should_interrupt: bool = False
+    # True when the critique was skipped this turn and the scores are the previous turn's.
+    scores_stale: bool = False
+    # True when the critique missed the turn budget; fetch it via GET /evaluate/critique/{critique_id}.
+    scores_pending: bool = False
+    critique_id: str | None = None
+
+
+class BatchEvaluateItem(BaseModel):
+    """One input line of batch_eval.py; the diagram is inline base64 or a file path."""
+
+    model_config = ConfigDict(strict=True)
+
+    id: str | None = None
+    transcript: str
+    diagram_base64: str = ""
+    diagram_path: str | None = None
+    previous_state: str = ""
+
+
+class BatchEvaluateResult(BaseModel):
+    """One output line of batch_eval.py."""
+
+    model_config = ConfigDict(strict=True)
+
+    id: str
+    status: Literal["ok", "error"]
+    key: str | None = None
+    evaluation: InterviewEvaluation | None = None
+    error: str | None = None
+    duplicate_of: str | None = None
+    elapsed_ms: float | None = None
+
+
+class EvaluateRouterEvent(BaseModel):
+    """Streamed /evaluate/stream part: Haiku router verdict (speak this first)."""
+
+    model_config = ConfigDict(strict=True)
+
+    event: Literal["router"] = "router"
+    minimax_emotion: MinimaxEmotion
+    verbal_feedback: str
+    should_interrupt: bool = False
+
+
+class EvaluateCritiqueEvent(BaseModel):
+    """Streamed /evaluate/stream part: Sonnet diagram critique and scores."""
+
+    model_config = ConfigDict(strict=True)
+
+    event: Literal["critique"] = "critique"
+    diagram_score: float = Field(ge=0, le=1)
+    verbal_score: float = Field(ge=0, le=1)
+    overall_score: float = Field(ge=0, le=1)
+    design_aspects: list[DesignAspect]
+    follow_up_question: str | None = None
+    scores_stale: bool = False
+    scores_pending: bool = False
+    critique_id: str | None = None
+
+
+class EvaluateErrorEvent(BaseModel):
+    model_config = ConfigDict(strict=True)
+
+    event: Literal["error"] = "error"
+    error: str
+
+
+EvaluateStreamEvent = EvaluateRouterEvent | EvaluateCritiqueEvent | EvaluateErrorEvent
 
 
 class EvaluateRequest(BaseModel):
@@ -46,6 +123,63 @@ class EvaluateRequest(BaseModel):
     previous_state: str = ""
 
 
+class SpeculationStatus(BaseModel):
+    """POST /evaluate/speculative: whether a speculation was started or is already running."""
+
+    model_config = ConfigDict(strict=True)
+
+    session_id: str
+    turn_id: int
+    status: Literal["started", "running"]
+
+
+class SessionCreateRequest(BaseModel):
+    model_config = ConfigDict(strict=True)
+
+    previous_state: str = ""
+
+
+class SessionCreated(BaseModel):
+    model_config = ConfigDict(strict=True)
+
+    session_id: str
+
+
+class SessionEvaluateRequest(BaseModel):
+    """One turn against a server-side session: only the words spoken since the last turn."""
+
+    model_config = ConfigDict(strict=True)
+
+    transcript_delta: str
+    diagram_base64: str = ""
+
+
+class SessionEvaluation(BaseModel):
+    """InterviewEvaluation minus the echoed transcript (the server already holds it)."""
+
+    model_config = ConfigDict(strict=True)
+
+    turn: int
+    diagram_score: float = Field(ge=0, le=1)
+    verbal_score: float = Field(ge=0, le=1)
+    overall_score: float = Field(ge=0, le=1)
+    design_aspects: list[DesignAspect]
+    minimax_emotion: MinimaxEmotion
+    verbal_feedback: str
+    follow_up_question: str | None = None
+    should_interrupt: bool = False
+    scores_stale: bool = False
+    scores_pending: bool = False
+    critique_id: str | None = None
+
+
+class RouterSpeakRequest(BaseModel):
+    model_config = ConfigDict(strict=True)
+
+    transcript: str
+    previous_state: str = ""
+
+
 def _coerce_emotion(v: str | MinimaxEmotion) -> MinimaxEmotion:
     if isinstance(v, MinimaxEmotion):
         return v
@@ -61,6 +195,9 @@ class TTSStreamRequest(BaseModel):
 
     text: str
     emotion: Annotated[MinimaxEmotion, BeforeValidator(_coerce_emotion)] = MinimaxEmotion.neutral
+    format: Annotated[AudioFormat, BeforeValidator(AudioFormat)] = AudioFormat.pcm16_24k
+    frame_ms: int | None = Field(default=None, ge=10, le=1000)
+    chunked: bool = False
 
 
 # API response and WebSocket message models
@@ -70,10 +207,130 @@ class HealthResponse(BaseModel):
     status: Literal["ok"] = "ok"
 
 
+class ReadinessResponse(BaseModel):
+    """GET /ready: startup warmup finished; step durations in ms, names of failed steps."""
+
+    model_config = ConfigDict(strict=True)
+
+    ready: bool
+    warmup_ms: float | None = None
+    steps: dict[str, float] = Field(default_factory=dict)
+    failed: list[str] = Field(default_factory=list)
+
+
+class BedrockExecutorStats(BaseModel):
+    model_config = ConfigDict(strict=True)
+
+    workers: int
+    queue_depth: int
+
+
+class ModelUsage(BaseModel):
+    """Summed Bedrock token usage for one model; cache_* count prompt-cache reads/writes."""
+
+    model_config = ConfigDict(strict=True)
+
+    calls: int
+    input_tokens: int
+    output_tokens: int
+    cache_read_input_tokens: int
+    cache_creation_input_tokens: int
+
+
+class BedrockUsageStats(BaseModel):
+    model_config = ConfigDict(strict=True)
+
+    prompt_cache: bool
+    models: dict[str, ModelUsage]
+
+
+class ModelHedgeStats(BaseModel):
+    """hedged: calls that got a duplicate request; *_wins: which attempt answered first."""
+
+    model_config = ConfigDict(strict=True)
+
+    calls: int
+    hedged: int
+    hedge_wins: int
+    primary_wins: int
+    cancelled: int
+
+
+class BedrockHedgeStats(BaseModel):
+    model_config = ConfigDict(strict=True)
+
+    enabled: bool
+    models: dict[str, ModelHedgeStats]
+
+
+class BedrockAdmissionStats(BaseModel):
+    """GET /health/bedrock-admission: in-flight cap, queue per priority and admission waits."""
+
+    model_config = ConfigDict(strict=True)
+
+    max_in_flight: int
+    in_flight: int
+    queued: dict[str, int]
+    admitted: dict[str, int]
+    mean_wait_ms: dict[str, float]
+    max_wait_ms: dict[str, float]
+    rpm: dict[str, float]
+
+
+class SpeculationStats(BaseModel):
+    """GET /health/speculative: speculation outcomes, hit rate over commits and wasted evaluations."""
+
+    model_config = ConfigDict(strict=True)
+
+    started: int
+    reused: int
+    hits: int
+    unspeculated: int
+    mismatched: int
+    failed: int
+    superseded: int
+    cancelled: int
+    expired: int
+    wasted: int
+    wasted_completed: int
+    in_flight: int
+    hit_rate: float
+    mean_hidden_ms: float
+
+
+class CacheStats(BaseModel):
+    model_config = ConfigDict(strict=True)
+
+    entries: int
+    hits: int
+    misses: int
+
+
 class TranscriptMessage(BaseModel):
+    """A transcript delta (new words only); is_final closes the current Transcribe segment."""
+
     model_config = ConfigDict(strict=True)
 
     transcript: str
+    is_final: bool = False
+
+
+class UtteranceEndMessage(BaseModel):
+    """Server-side VAD detected the end of an utterance (replaces the client pause timer)."""
+
+    model_config = ConfigDict(strict=True)
+
+    event: Literal["end_of_utterance"] = "end_of_utterance"
+
+
+class BackpressureMessage(BaseModel):
+    """Mic audio was dropped because the STT pipeline is behind (STT_OVERFLOW_POLICY=signal)."""
+
+    model_config = ConfigDict(strict=True)
+
+    event: Literal["backpressure"] = "backpressure"
+    dropped_frames: int
+    queue_depth: int
 
 
 class ErrorMessage(BaseModel):
@@ -82,6 +339,45 @@ class ErrorMessage(BaseModel):
     error: str
 
 
+# /ws/session protocol: JSON text frames in both directions, binary frames carry audio
+class SessionControlMessage(BaseModel):
+    """Client -> server control message on /ws/session (mic audio is sent as binary frames)."""
+
+    model_config = ConfigDict(strict=True)
+
+    type: Literal["start", "diagram", "evaluate"]
+    previous_state: str | None = None
+    diagram_base64: str | None = None
+    audio_format: Annotated[AudioFormat, BeforeValidator(AudioFormat)] | None = None
+
+
+class SessionTranscriptEvent(BaseModel):
+    model_config = ConfigDict(strict=True)
+
+    event: Literal["transcript"] = "transcript"
+    transcript: str
+    is_final: bool = False
+
+
+class SessionTurnEvent(BaseModel):
+    model_config = ConfigDict(strict=True)
+
+    event: Literal["turn_start", "turn_end", "turn_cancelled"]
+    turn: int
+    transcript: str = ""
+
+
+class SessionAudioEvent(BaseModel):
+    """Brackets the binary TTS frames of one utterance."""
+
+    model_config = ConfigDict(strict=True)
+
+    event: Literal["audio_start", "audio_end"]
+    turn: int
+    text: str = ""
+    format: AudioFormat = AudioFormat.pcm16_24k
+
+
 # Internal: LLM JSON shapes (pipeline parsing, strict validation)
 class CritiqueDesignAspect(BaseModel):
     model_config = ConfigDict(strict=True)
@@ -108,3 +404,39 @@ class RouterResponse(BaseModel):
     emotion: str
     should_interrupt: bool
     response: str
+
+
+# Internal: server-side interview session state (session_store)
+class CritiqueBaseline(BaseModel):
+    """Last full critique and what changed since; input to the critique fast-path policy."""
+
+    model_config = ConfigDict(strict=True)
+
+    critique: CritiqueResponse | None = None
+    diagram_phash: str = ""
+    # Speech from turns that skipped the critique, folded into the next one.
+    pending_transcript: str = ""
+    # Critique finishing in the background (missed its turn budget), and its diagram hash.
+    pending_critique_id: str = ""
+    pending_phash: str = ""
+    # The critique arrived from the background and its follow-up has not been asked yet.
+    undelivered: bool = False
+
+
+class SessionTurn(BaseModel):
+    model_config = ConfigDict(strict=True)
+
+    turn: int
+    transcript_delta: str
+    agent_text: str
+
+
+class SessionState(BaseModel):
+    model_config = ConfigDict(strict=True)
+
+    session_id: str
+    transcript: str = ""
+    previous_state: str = ""
+    last_diagram_hash: str = ""
+    turns: list[SessionTurn] = Field(default_factory=list)
+    critique_baseline: CritiqueBaseline = Field(default_factory=CritiqueBaseline)
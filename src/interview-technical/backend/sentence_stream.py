@@ -0,0 +1,129 @@
+"""
+Incremental parsing helpers for token-streamed LLM output.
+
+ResponseFieldExtractor pulls one JSON string field (e.g. the router's "response") out of a
+partial JSON document as tokens arrive; SentenceSplitter turns that text into complete
+sentences so each one can be handed to TTS as soon as it closes.
+"""
+
+import re
+
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+_SENTENCE_END = re.compile(r"[.!?]+[\"')\]]*\s+|\n+")
+_ABBREVIATIONS = ("e.g.", "i.e.", "vs.", "mr.", "dr.", "approx.")
+
+
+def _is_hex(s: str) -> bool:
+    return len(s) == 4 and all(c in "0123456789abcdefABCDEF" for c in s)
+
+
+class ResponseFieldExtractor:
+    """Decode the value of a top-level JSON string field from a growing JSON prefix."""
+
+    def __init__(self, field: str = "response") -> None:
+        self._key = re.compile(r'"%s"\s*:\s*"' % re.escape(field))
+        self._buf = ""
+        self._pos: int | None = None  # index in _buf of the next undecoded value char
+        self.done = False
+
+    @property
+    def raw(self) -> str:
+        """Everything fed so far (for a final full parse)."""
+        return self._buf
+
+    def feed(self, chunk: str) -> str:
+        """Append model text; return newly decoded characters of the field value."""
+        self._buf += chunk
+        if self.done:
+            return ""
+        if self._pos is None:
+            m = self._key.search(self._buf)
+            if not m:
+                return ""
+            self._pos = m.end()
+        out: list[str] = []
+        i = self._pos
+        buf = self._buf
+        while i < len(buf):
+            ch = buf[i]
+            if ch == '"':
+                self.done = True
+                i += 1
+                break
+            if ch != "\\":
+                out.append(ch)
+                i += 1
+                continue
+            if i + 1 >= len(buf):
+                break  # escape split across chunks; wait for more
+            esc = buf[i + 1]
+            if esc == "u":
+                if i + 6 > len(buf):
+                    break
+                try:
+                    code = int(buf[i + 2 : i + 6], 16)
+                except ValueError:
+                    i += 6
+                    continue
+                if 0xD800 <= code < 0xDC00:
+                    # Surrogate pair (e.g. an emoji): combine with the following \uDCxx.
+                    if i + 12 > len(buf):
+                        break
+                    low = int(buf[i + 8 : i + 12], 16) if buf[i + 6 : i + 8] == "\\u" and _is_hex(buf[i + 8 : i + 12]) else 0
+                    if 0xDC00 <= low < 0xE000:
+                        out.append(chr(0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)))
+                        i += 12
+                        continue
+                    code = 0xFFFD  # unpaired high surrogate
+                out.append(chr(0xFFFD if 0xDC00 <= code < 0xE000 else code))
+                i += 6
+            else:
+                out.append(_ESCAPES.get(esc, esc))
+                i += 2
+        self._pos = i
+        return "".join(out)
+
+
+def find_string_field(raw: str, field: str) -> str | None:
+    """Return a complete top-level string field from partial JSON, or None if not closed yet."""
+    m = re.search(r'"%s"\s*:\s*"((?:[^"\\]|\\.)*)"' % re.escape(field), raw)
+    return m.group(1) if m else None
+
+
+class SentenceSplitter:
+    """Accumulate text and release it sentence by sentence."""
+
+    def __init__(self, min_chars: int = 12) -> None:
+        self._buf = ""
+        self._min_chars = min_chars
+
+    def feed(self, text: str) -> list[str]:
+        """Add text; return sentences that are now complete (stripped, non-empty)."""
+        self._buf += text
+        sentences: list[str] = []
+        start = 0
+        for m in _SENTENCE_END.finditer(self._buf):
+            candidate = self._buf[start : m.end()].strip()
+            # Avoid handing TTS tiny fragments like "Hm." or "e.g."; merge with the next one.
+            if len(candidate) < self._min_chars or candidate.lower().endswith(_ABBREVIATIONS):
+                continue
+            sentences.append(candidate)
+            start = m.end()
+        self._buf = self._buf[start:]
+        return sentences
+
+    def flush(self) -> str | None:
+        """Return any trailing text that never got a sentence terminator."""
+        rest = self._buf.strip()
+        self._buf = ""
+        return rest or None
+
+
+def split_sentences(text: str, min_chars: int = 12) -> list[str]:
+    """Split a complete text into sentences using the same rules as SentenceSplitter."""
+    splitter = SentenceSplitter(min_chars=min_chars)
+    sentences = splitter.feed(text)
+    rest = splitter.flush()
+    if rest:
+        sentences.append(rest)
+    return sentences
@@ -0,0 +1,216 @@
+"""
+Optional append-only recording of live traffic (mic audio, transcripts, evaluate requests and
+results incl. speculative start/commit/cancel, diagrams, TTS requests) for debugging and load
+replay (bench/replay.py).
+
+Enabled by SESSION_RECORD_DIR. Handlers call record(), which only timestamps the item and puts
+it on a bounded queue (dropped and counted when full, never blocking the event loop); a writer
+thread serializes and appends it to segment files of about SESSION_RECORD_SEGMENT_BYTES.
+
+Segment layout: MAGIC, then records of
+    <u32 body length> <f64 unix time> <u8 kind> <u8 stream id length> <stream id> <body>
+Bodies are raw PCM for AUDIO, `<sha256 hex of the base64>` + image bytes for DIAGRAM, JSON
+otherwise. Evaluate requests store the diagram's digest instead of its base64 (for multipart
+uploads, the bytes as uploaded); each diagram is
+written once per segment, so every segment replays on its own.
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import os
+import queue
+import struct
+import threading
+import time
+import uuid
+from enum import IntEnum
+from mmap import ACCESS_READ, mmap
+from pathlib import Path
+from typing import Any, Iterator, NamedTuple
+
+from pydantic import BaseModel
+
+from env import env_int
+
+MAGIC = b"SESSREC1"
+HEADER = struct.Struct("<IdBB")
+
+
+class RecordKind(IntEnum):
+    WS_OPEN = 1
+    AUDIO = 2
+    TRANSCRIPT = 3
+    WS_CLOSE = 4
+    DIAGRAM = 5
+    EVALUATE = 6
+    EVALUATION = 7
+    TTS = 8
+    SPECULATE = 9
+    SPECULATE_COMMIT = 10
+    SPECULATE_CANCEL = 11
+
+
+class Record(NamedTuple):
+    timestamp: float
+    kind: RecordKind
+    stream_id: str
+    body: bytes
+
+
+def new_stream_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+class SessionRecorder:
+    def __init__(self, directory: str, segment_bytes: int, queue_max: int) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self.records = 0
+        self.dropped = 0
+        self.segments = 0
+        self._queue: queue.Queue[tuple[float, RecordKind, str, Any] | None] = queue.Queue(maxsize=queue_max)
+        self._file = None
+        self._size = 0
+        self._diagrams: set[str] = set()  # written to the current segment
+        self._thread = threading.Thread(target=self._run, name="session-recorder", daemon=True)
+        self._thread.start()
+
+    def record(self, kind: RecordKind, stream_id: str, payload: bytes | dict | BaseModel) -> None:
+        """Queue one record (serialized on the writer thread); drops it if the writer is behind."""
+        try:
+            self._queue.put_nowait((time.time(), kind, stream_id, payload))
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                logging.warning("[Record] writer behind, dropped=%d", self.dropped)
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join(timeout=10)
+
+    def _open_segment(self) -> None:
+        if self._file is not None:
+            self._file.close()
+        name = f"session-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{self.segments:04d}.rec"
+        self._file = open(self.directory / name, "ab")
+        self._file.write(MAGIC)
+        self._size = len(MAGIC)
+        self._diagrams.clear()
+        self.segments += 1
+
+    def _write(self, timestamp: float, kind: RecordKind, stream_id: str, body: bytes) -> None:
+        sid = stream_id.encode()[:255]
+        self._file.write(HEADER.pack(len(body), timestamp, kind, len(sid)))
+        self._file.write(sid)
+        self._file.write(body)
+        self._size += HEADER.size + len(sid) + len(body)
+        self.records += 1
+
+    def _serialize(self, timestamp: float, kind: RecordKind, stream_id: str, payload: Any) -> None:
+        if self._file is None or self._size >= self.segment_bytes:
+            self._open_segment()
+        if isinstance(payload, BaseModel):
+            payload = payload.model_dump(mode="json")
+        if isinstance(payload, dict):
+            diagram = payload.get("diagram_base64")
+            if diagram:
+                digest = hashlib.sha256(diagram.encode()).hexdigest()
+                if digest not in self._diagrams:
+                    self._diagrams.add(digest)
+                    self._write(timestamp, RecordKind.DIAGRAM, stream_id, digest.encode() + base64.b64decode(diagram))
+                payload = {**payload, "diagram_base64": "", "diagram_digest": digest}
+            payload = json.dumps(payload, separators=(",", ":")).encode()
+        self._write(timestamp, kind, stream_id, payload)
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                while item is not None:
+                    try:
+                        self._serialize(*item)
+                    except Exception as e:
+                        logging.warning("[Record] failed to write %s record: %s", item[1].name, e)
+                    # Drain what is queued, then flush once.
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+            finally:
+                if self._file is not None:
+                    self._file.flush()
+            if item is None:
+                if self._file is not None:
+                    self._file.close()
+                return
+
+    def stats(self) -> dict[str, int]:
+        return {"records": self.records, "dropped": self.dropped, "segments": self.segments, "queued": self._queue.qsize()}
+
+
+_recorder: SessionRecorder | None = None
+
+
+def init_recorder() -> None:
+    """Start the recorder if SESSION_RECORD_DIR is set (called from main.lifespan)."""
+    global _recorder
+    directory = os.getenv("SESSION_RECORD_DIR")
+    if directory and _recorder is None:
+        _recorder = SessionRecorder(
+            directory,
+            segment_bytes=env_int("SESSION_RECORD_SEGMENT_BYTES", 64 * 1024 * 1024),
+            queue_max=env_int("SESSION_RECORD_QUEUE_MAX", 10000),
+        )
+        logging.info("[Record] recording sessions to %s", directory)
+
+
+def close_recorder() -> None:
+    global _recorder
+    if _recorder is not None:
+        _recorder.close()
+        logging.info("[Record] closed %s", _recorder.stats())
+        _recorder = None
+
+
+def recording() -> bool:
+    return _recorder is not None
+
+
+def record(kind: RecordKind, stream_id: str, payload: bytes | dict | BaseModel) -> None:
+    """Record one item if recording is enabled (no-op otherwise)."""
+    if _recorder is not None:
+        _recorder.record(kind, stream_id, payload)
+
+
+def recorder_stats() -> dict[str, int] | None:
+    return _recorder.stats() if _recorder is not None else None
+
+
+def read_segment(path: str | Path) -> Iterator[Record]:
+    """Records of one segment, read through an mmap; stops at a torn (partially written) tail."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size <= len(MAGIC):
+            return
+        with mmap(f.fileno(), 0, access=ACCESS_READ) as m:
+            if m[: len(MAGIC)] != MAGIC:
+                raise ValueError(f"{path}: not a session recording")
+            offset = len(MAGIC)
+            end = len(m)
+            while offset + HEADER.size <= end:
+                length, timestamp, kind, sid_len = HEADER.unpack_from(m, offset)
+                start = offset + HEADER.size
+                if start + sid_len + length > end:
+                    break
+                stream_id = m[start : start + sid_len].decode()
+                body = m[start + sid_len : start + sid_len + length]
+                offset = start + sid_len + length
+                yield Record(timestamp, RecordKind(kind), stream_id, body)
+
+
+def read_recordings(directory: str | Path) -> Iterator[Record]:
+    """All records under a directory, segment by segment in name (= time) order."""
+    for path in sorted(Path(directory).glob("*.rec")):
+        yield from read_segment(path)
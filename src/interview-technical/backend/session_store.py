@@ -0,0 +1,170 @@
+"""
+Server-side interview session state, keyed by session ID.
+
+Holds the accumulated transcript, turn history, last tutor message (previous_state), the
+last diagram hash and the critique baseline (last scores, for the critique fast path) so
+/sessions/{id}/evaluate only needs the new transcript delta. The store is pluggable via
+SESSION_STORE: "memory" (default, per process) or "sqlite", a local key-value table at
+SESSION_STORE_PATH that several uvicorn workers on one host can share.
+"""
+
+import asyncio
+import os
+import sqlite3
+import time
+import uuid
+import weakref
+from collections import OrderedDict
+from contextlib import closing, contextmanager
+from typing import Awaitable, Iterator, Protocol, TypeVar
+
+from env import env_float
+from schemas import SessionState
+
+SESSION_TTL_S = env_float("SESSION_TTL_S", 7200)
+
+T = TypeVar("T")
+
+
+def new_session_id() -> str:
+    return uuid.uuid4().hex
+
+
+class SessionStore(Protocol):
+    async def get(self, session_id: str) -> SessionState | None: ...
+
+    async def put(self, state: SessionState) -> None: ...
+
+    async def delete(self, session_id: str) -> None: ...
+
+
+class InMemorySessionStore:
+    """Per-process dict with idle expiry and a size cap (oldest sessions dropped first)."""
+
+    def __init__(self, max_sessions: int = 10000, ttl_s: float = SESSION_TTL_S) -> None:
+        self.max_sessions = max_sessions
+        self.ttl_s = ttl_s
+        self._sessions: OrderedDict[str, tuple[float, SessionState]] = OrderedDict()
+
+    async def get(self, session_id: str) -> SessionState | None:
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            return None
+        if entry[0] + self.ttl_s < time.monotonic():
+            del self._sessions[session_id]
+            return None
+        return entry[1].model_copy(deep=True)
+
+    async def put(self, state: SessionState) -> None:
+        self._sessions[state.session_id] = (time.monotonic(), state.model_copy(deep=True))
+        self._sessions.move_to_end(state.session_id)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+
+    async def delete(self, session_id: str) -> None:
+        self._sessions.pop(session_id, None)
+
+
+class SqliteSessionStore:
+    """JSON blobs in a single SQLite key-value table (WAL mode, safe across worker processes)."""
+
+    def __init__(self, path: str, ttl_s: float = SESSION_TTL_S) -> None:
+        self.path = path
+        self.ttl_s = ttl_s
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions (id TEXT PRIMARY KEY, state TEXT NOT NULL, updated REAL NOT NULL)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """One transaction on a fresh connection, closed afterwards (sqlite3's own context manager only commits)."""
+        with closing(sqlite3.connect(self.path, timeout=5.0)) as conn, conn:
+            yield conn
+
+    def _get(self, session_id: str) -> SessionState | None:
+        with self._connect() as conn:
+            row = conn.execute("SELECT state, updated FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        if row is None or row[1] + self.ttl_s < time.time():
+            return None
+        return SessionState.model_validate_json(row[0])
+
+    def _put(self, state: SessionState) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO sessions (id, state, updated) VALUES (?, ?, ?)",
+                (state.session_id, state.model_dump_json(), time.time()),
+            )
+            conn.execute("DELETE FROM sessions WHERE updated < ?", (time.time() - self.ttl_s,))
+
+    def _delete(self, session_id: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+    async def get(self, session_id: str) -> SessionState | None:
+        return await asyncio.to_thread(self._get, session_id)
+
+    async def put(self, state: SessionState) -> None:
+        await asyncio.to_thread(self._put, state)
+
+    async def delete(self, session_id: str) -> None:
+        await asyncio.to_thread(self._delete, session_id)
+
+
+class TurnSupersession:
+    """
+    In-process bookkeeping so a newer turn for a session cancels the one still being evaluated
+    (its Bedrock calls are cancelled with it). The cancelled turn's transcript delta is
+    carried into the next turn. Turns of one session run under a per-session lock.
+    """
+
+    def __init__(self) -> None:
+        self._locks: weakref.WeakValueDictionary[str, asyncio.Lock] = weakref.WeakValueDictionary()
+        self._running: dict[str, asyncio.Task] = {}
+        self._carried: dict[str, str] = {}
+
+    def lock(self, session_id: str) -> asyncio.Lock:
+        lock = self._locks.get(session_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[session_id] = lock
+        return lock
+
+    def supersede(self, session_id: str) -> bool:
+        """Cancel the session's in-flight evaluation, if any."""
+        task = self._running.get(session_id)
+        if task is None or task.done():
+            return False
+        task.cancel()
+        return True
+
+    def start(self, session_id: str, evaluation: Awaitable[T]) -> "asyncio.Task[T]":
+        task = asyncio.ensure_future(evaluation)
+        self._running[session_id] = task
+        return task
+
+    def finish(self, session_id: str, task: asyncio.Task, delta: str) -> None:
+        if self._running.get(session_id) is task:
+            del self._running[session_id]
+        if task.cancelled() and delta:
+            self._carried[session_id] = delta
+
+    def take_carried(self, session_id: str) -> str:
+        return self._carried.pop(session_id, "")
+
+
+session_turns = TurnSupersession()
+
+_store: SessionStore | None = None
+
+
+def get_session_store() -> SessionStore:
+    global _store
+    if _store is None:
+        kind = os.getenv("SESSION_STORE", "memory")
+        if kind == "sqlite":
+            _store = SqliteSessionStore(os.getenv("SESSION_STORE_PATH", "sessions.sqlite3"))
+        else:
+            _store = InMemorySessionStore()
+    return _store
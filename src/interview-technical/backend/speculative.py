@@ -0,0 +1,150 @@
+"""
+Speculative evaluations: start evaluating a turn at an early pause, commit it when the pause is
+confirmed.
+
+The client starts a speculation for (session_id, turn_id) after a short pause, cancels it when
+the candidate keeps talking, and commits at the real pause threshold. A commit whose transcript,
+diagram and previous_state match the speculation (its fingerprint) takes the speculative task,
+which has been running for the length of the pause already; anything else discards it and
+evaluates afresh. A newer speculation for the session supersedes the previous one, and
+uncommitted speculations are cancelled after SPECULATIVE_TTL_S. A taken speculation that fails
+counts as "failed" rather than a hit; the caller then evaluates afresh.
+
+Bookkeeping is per process, like TurnSupersession: with several workers, a session's requests
+must reach the same one (otherwise every commit is a plain evaluation).
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+from env import env_float
+from metrics import SPECULATIVE_EVALUATIONS
+from schemas import InterviewEvaluation
+
+SPECULATIVE_TTL_S = env_float("SPECULATIVE_TTL_S", 30)
+
+# Speculations thrown away; each cost (part of) an evaluation's Bedrock calls.
+WASTED = ("mismatched", "failed", "superseded", "cancelled", "expired")
+
+
+def fingerprint(transcript: str, diagram: bytes, previous_state: str) -> str:
+    """What a commit must match: whitespace-normalized transcript, diagram bytes and previous_state."""
+    h = hashlib.sha256()
+    for part in (" ".join(transcript.split()).encode(), hashlib.sha256(diagram).digest(), previous_state.encode()):
+        h.update(part)
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _retrieve(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logging.warning("[Speculative] evaluation failed: %s", task.exception())
+
+
+@dataclass
+class _Speculation:
+    turn_id: int
+    fingerprint: str
+    task: "asyncio.Task[InterviewEvaluation]"
+    started: float = field(default_factory=time.monotonic)
+    finished: float | None = None
+
+    def usable(self) -> bool:
+        return not self.task.done() or (not self.task.cancelled() and self.task.exception() is None)
+
+
+class SpeculativeEvaluations:
+    def __init__(self, ttl_s: float) -> None:
+        self.ttl_s = ttl_s
+        self._running: dict[str, _Speculation] = {}
+        self.counts = dict.fromkeys(("started", "reused", "hits", "unspeculated", "wasted_completed", *WASTED), 0)
+        self._hidden_s = 0.0
+
+    def start(
+        self, session_id: str, turn_id: int, fp: str, evaluate: Callable[[], Awaitable[InterviewEvaluation]]
+    ) -> bool:
+        """Start a speculation (superseding the session's previous one); False if it is already running."""
+        self._prune()
+        current = self._running.get(session_id)
+        if current is not None and current.turn_id == turn_id and current.fingerprint == fp and current.usable():
+            self.counts["reused"] += 1
+            return False
+        if current is not None:
+            self._discard(session_id, "superseded")
+        spec = _Speculation(turn_id, fp, asyncio.ensure_future(evaluate()))
+        spec.task.add_done_callback(_retrieve)
+        spec.task.add_done_callback(lambda _: setattr(spec, "finished", time.monotonic()))
+        self._running[session_id] = spec
+        self.counts["started"] += 1
+        SPECULATIVE_EVALUATIONS.inc(outcome="started")
+        return True
+
+    def cancel(self, session_id: str, turn_id: int | None = None) -> bool:
+        """The candidate kept talking: drop the session's speculation (only turn_id's, if given)."""
+        current = self._running.get(session_id)
+        if current is None or (turn_id is not None and current.turn_id != turn_id):
+            return False
+        self._discard(session_id, "cancelled")
+        return True
+
+    def take(self, session_id: str, turn_id: int, fp: str) -> "asyncio.Task[InterviewEvaluation] | None":
+        """The pause is confirmed: the matching speculative task, or None to evaluate afresh."""
+        self._prune()
+        current = self._running.get(session_id)
+        if current is None:
+            self.counts["unspeculated"] += 1
+            SPECULATIVE_EVALUATIONS.inc(outcome="unspeculated")
+            return None
+        if current.turn_id != turn_id or current.fingerprint != fp:
+            self._discard(session_id, "mismatched")
+            return None
+        if not current.usable():
+            self._discard(session_id, "failed")
+            return None
+        del self._running[session_id]
+        # Counted as a hit once it succeeds, as failed if it raises after the commit.
+        current.task.add_done_callback(lambda task: self._settle(current, task))
+        return current.task
+
+    def _settle(self, spec: _Speculation, task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            self.counts["failed"] += 1
+            SPECULATIVE_EVALUATIONS.inc(outcome="failed")
+            logging.info("[Speculative] failed after commit turn=%d", spec.turn_id)
+            return
+        self.counts["hits"] += 1
+        self._hidden_s += (spec.finished or time.monotonic()) - spec.started
+        SPECULATIVE_EVALUATIONS.inc(outcome="hit")
+
+    def _discard(self, session_id: str, reason: str) -> None:
+        spec = self._running.pop(session_id)
+        if spec.task.done():
+            if not spec.task.cancelled() and spec.task.exception() is None:
+                self.counts["wasted_completed"] += 1
+        else:
+            spec.task.cancel()
+        self.counts[reason] += 1
+        SPECULATIVE_EVALUATIONS.inc(outcome=reason)
+        logging.info("[Speculative] %s session=%s turn=%d", reason, session_id, spec.turn_id)
+
+    def _prune(self) -> None:
+        cutoff = time.monotonic() - self.ttl_s
+        for session_id in [k for k, spec in self._running.items() if spec.started < cutoff]:
+            self._discard(session_id, "expired")
+
+    def stats(self) -> dict:
+        commits = self.counts["hits"] + self.counts["mismatched"] + self.counts["failed"] + self.counts["unspeculated"]
+        return {
+            **self.counts,
+            "in_flight": len(self._running),
+            "wasted": sum(self.counts[reason] for reason in WASTED),
+            "hit_rate": round(self.counts["hits"] / commits, 3) if commits else 0.0,
+            "mean_hidden_ms": round(self._hidden_s / self.counts["hits"] * 1000, 1) if self.counts["hits"] else 0.0,
+        }
+
+
+speculations = SpeculativeEvaluations(SPECULATIVE_TTL_S)
@@ -0,0 +1,77 @@
+import asyncio
+
+from admission import AdmissionController, Priority
+
+
+async def _queued(controller: AdmissionController, model: str, priority: Priority) -> asyncio.Task:
+    task = asyncio.create_task(controller.acquire(model, priority))
+    await asyncio.sleep(0)
+    return task
+
+
+async def test_in_flight_cap():
+    controller = AdmissionController(max_in_flight=2, rpm={})
+    await controller.acquire("sonnet", Priority.LIVE_CRITIQUE)
+    await controller.acquire("sonnet", Priority.LIVE_CRITIQUE)
+    third = await _queued(controller, "sonnet", Priority.LIVE_CRITIQUE)
+    assert not third.done()
+    assert controller.in_flight == 2
+    controller.release()
+    await third
+    assert controller.in_flight == 2
+
+
+async def test_priority_order():
+    controller = AdmissionController(max_in_flight=1, rpm={})
+    await controller.acquire("sonnet", Priority.LIVE_CRITIQUE)
+    order: list[str] = []
+
+    async def call(name: str, priority: Priority) -> None:
+        await controller.acquire("haiku", priority)
+        order.append(name)
+
+    tasks = [
+        asyncio.create_task(call("batch", Priority.BATCH)),
+        asyncio.create_task(call("critique", Priority.LIVE_CRITIQUE)),
+        asyncio.create_task(call("router", Priority.LIVE_ROUTER)),
+    ]
+    await asyncio.sleep(0)
+    assert controller.queued() == {"live_router": 1, "live_critique": 1, "batch": 1}
+    for _ in tasks:
+        controller.release()
+        await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+    assert order == ["router", "critique", "batch"]
+
+
+async def test_rate_limited_model_does_not_block_others():
+    controller = AdmissionController(max_in_flight=0, rpm={"sonnet": 1})
+    await controller.acquire("sonnet", Priority.LIVE_CRITIQUE)  # takes the only token
+    sonnet = await _queued(controller, "sonnet", Priority.LIVE_ROUTER)
+    await asyncio.wait_for(controller.acquire("haiku", Priority.BATCH), timeout=1)
+    assert not sonnet.done()
+    sonnet.cancel()
+
+
+async def test_cancelled_waiter_leaves_queue():
+    controller = AdmissionController(max_in_flight=1, rpm={})
+    await controller.acquire("sonnet", Priority.LIVE_CRITIQUE)
+    waiter = await _queued(controller, "sonnet", Priority.LIVE_CRITIQUE)
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+    assert controller.queued()["live_critique"] == 0
+    controller.release()
+    assert controller.in_flight == 0
+
+
+async def test_cancel_then_release_in_same_tick():
+    controller = AdmissionController(max_in_flight=1, rpm={})
+    await controller.acquire("sonnet", Priority.LIVE_CRITIQUE)
+    cancelled = await _queued(controller, "sonnet", Priority.LIVE_CRITIQUE)
+    later = await _queued(controller, "sonnet", Priority.LIVE_CRITIQUE)
+    cancelled.cancel()  # cancels the waiter's future now; its task resumes on a later tick
+    controller.release()  # must skip the cancelled waiter, not raise InvalidStateError
+    await asyncio.wait_for(later, timeout=1)
+    await asyncio.gather(cancelled, return_exceptions=True)
+    assert controller.in_flight == 1
+    assert controller.queued()["live_critique"] == 0
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from audio_codec import Reframer, Transcoder, mulaw_encode
+from schemas import AudioFormat
+
+
+def _reference_mulaw(sample: int) -> int:
+    """Scalar G.711 mu-law encoder (segment search as in the ITU/Sun reference code)."""
+    sign = 0x80 if sample < 0 else 0
+    magnitude = min(-sample if sample < 0 else sample, 32635) + 0x84
+    exponent, mask = 7, 0x4000
+    while exponent > 0 and not magnitude & mask:
+        exponent -= 1
+        mask >>= 1
+    mantissa = (magnitude >> (exponent + 3)) & 0x0F
+    return ~(sign | (exponent << 4) | mantissa) & 0xFF
+
+
+def test_mulaw_matches_reference_for_all_samples():
+    samples = np.arange(-32768, 32768, dtype=np.int16)
+    expected = np.array([_reference_mulaw(int(s)) for s in samples], dtype=np.uint8)
+    np.testing.assert_array_equal(mulaw_encode(samples), expected)
+
+
+def test_mulaw_known_values():
+    assert mulaw_encode(np.array([0, -1, 32767, -32768], dtype=np.int16)).tolist() == [0xFF, 0x7F, 0x80, 0x00]
+
+
+def _tone(hz: float, seconds: float = 0.5, amplitude: float = 10000) -> np.ndarray:
+    t = np.arange(int(24000 * seconds)) / 24000
+    return (amplitude * np.sin(2 * np.pi * hz * t)).astype(np.int16)
+
+
+def _gain_db(fmt: AudioFormat, hz: float) -> float:
+    """Output/input level of a resampled tone, after the filter has warmed up."""
+    out = Transcoder(fmt)._resampler.process(_tone(hz)).astype(np.float64)
+    rms = np.sqrt(np.mean(out[len(out) // 4 :] ** 2))
+    return 20 * np.log10(max(rms, 1e-9) / (10000 / np.sqrt(2)))
+
+
+@pytest.mark.parametrize(
+    ("fmt", "passband_hz", "alias_hz"),
+    [
+        (AudioFormat.pcm16_16k, 1000, 10000),
+        (AudioFormat.pcm16_16k, 6000, 9000),
+        (AudioFormat.mulaw_8k, 1000, 5000),
+        (AudioFormat.mulaw_8k, 3000, 6000),
+    ],
+)
+def test_downsampling_passes_band_and_rejects_aliases(fmt, passband_hz, alias_hz):
+    assert abs(_gain_db(fmt, passband_hz)) < 0.5
+    assert _gain_db(fmt, alias_hz) < -40
+
+
+@pytest.mark.parametrize("fmt", [AudioFormat.pcm16_16k, AudioFormat.mulaw_16k, AudioFormat.mulaw_8k])
+def test_chunking_does_not_change_output(fmt):
+    data = (np.random.default_rng(0).normal(0, 3000, 24000)).astype("<i2").tobytes()
+    whole = Transcoder(fmt).feed(data)
+    transcoder = Transcoder(fmt)
+    chunked = b""
+    pos = 0
+    for size in [1, 7, 333, 4096, 2, 9999] * 10:
+        chunked += transcoder.feed(data[pos : pos + size])
+        pos += size
+    chunked += transcoder.feed(data[pos:])
+    assert chunked == whole
+
+
+def test_passthrough_format():
+    data = b"\x01\x02\x03"
+    assert Transcoder(AudioFormat.pcm16_24k).feed(data) == data
+
+
+def test_reframer():
+    reframer = Reframer(4)
+    assert reframer.feed(b"abc") == []
+    assert reframer.feed(b"defghij") == [b"abcd", b"efgh"]
+    assert reframer.flush() == b"ij"
+    assert reframer.flush() == b""
@@ -0,0 +1,40 @@
+import asyncio
+
+from audio_ingest import DropOldestQueue, FrameCoalescer, stt_audio_stream
+
+
+def test_put_drop_oldest_evicts_and_counts():
+    q = DropOldestQueue(3)
+    assert [q.put_drop_oldest(i) for i in range(5)] == [False, False, False, True, True]
+    assert [q.get_nowait() for _ in range(3)] == [2, 3, 4]
+    assert (q.dropped, q.max_depth) == (2, 3)
+
+
+async def test_blocking_put_waits_instead_of_evicting():
+    q = DropOldestQueue(1)
+    q.put_drop_oldest("delta")
+    put = asyncio.create_task(q.put(None))
+    await asyncio.sleep(0)
+    assert not put.done() and q.dropped == 0
+    assert await q.get() == "delta"
+    await put
+    assert await q.get() is None
+
+
+def test_coalescer_repacks_into_fixed_frames():
+    c = FrameCoalescer(4)
+    assert c.push(b"ab") == []
+    assert c.push(b"cdefghij") == [b"abcd", b"efgh"]
+    assert c.push(b"") == []
+    assert c.flush() == b"ij"
+    assert c.flush() == b""
+    assert c.push(b"klmn") == [b"klmn"]
+    assert c.frames_out == 4
+
+
+async def test_stt_audio_stream_coalesces_until_sentinel():
+    q = DropOldestQueue(10)
+    for chunk in (b"aaa", b"bbbbb", b"c", None):
+        q.put_drop_oldest(chunk)
+    frames = [frame async for frame in stt_audio_stream(q, FrameCoalescer(4))]
+    assert frames == [b"aaab", b"bbbb", b"c"]
@@ -0,0 +1,62 @@
+import argparse
+import io
+import json
+from pathlib import Path
+
+import batch_eval
+from schemas import InterviewEvaluation, MinimaxEmotion
+
+INPUT = "\n".join(
+    [
+        json.dumps({"transcript": "use a queue"}),
+        json.dumps({"transcript": "use a queue"}),
+        "not json",
+        json.dumps({"id": "named", "transcript": "shard by user"}),
+    ]
+)
+
+
+def _batch(out: io.StringIO, monkeypatch) -> batch_eval._Batch:
+    batch = batch_eval._Batch(argparse.Namespace(retries=0, concurrency=2), out)
+
+    async def evaluate(item, digest):
+        return InterviewEvaluation(
+            transcript=item.transcript, diagram_score=0.5, verbal_score=0.5, overall_score=0.5,
+            design_aspects=[], minimax_emotion=MinimaxEmotion.neutral, verbal_feedback="ok",
+        )
+
+    monkeypatch.setattr(batch, "evaluate", evaluate)
+    return batch
+
+
+def _rows(out: io.StringIO) -> dict[str, dict]:
+    return {row["id"]: row for row in map(json.loads, out.getvalue().splitlines())}
+
+
+async def test_default_ids_and_duplicates_counted_once(monkeypatch):
+    out = io.StringIO()
+    batch = _batch(out, monkeypatch)
+    items = batch_eval._read_items(batch, io.StringIO(INPUT), Path.cwd(), set())
+    assert [item_id for item_id, _, _ in items] == ["line-1", "line-2", "named"]
+    await batch.run(items, skip=set())
+
+    rows = _rows(out)
+    assert rows["line-2"]["duplicate_of"] == "line-1"
+    assert rows["line-3"]["status"] == "error"
+    assert batch.counts == {"ok": 2, "error": 1, "duplicate": 1, "skipped": 0}
+
+
+async def test_resume_skips_done_ids_and_known_parse_errors(monkeypatch, tmp_path):
+    output = tmp_path / "graded.jsonl"
+    first = io.StringIO()
+    batch = _batch(first, monkeypatch)
+    await batch.run(batch_eval._read_items(batch, io.StringIO(INPUT), Path.cwd(), set()), skip=set())
+    output.write_text(first.getvalue())
+
+    done, written = batch_eval._written_ids(str(output))
+    assert done == {"line-1", "line-2", "named"}
+    again = io.StringIO()
+    batch = _batch(again, monkeypatch)
+    await batch.run(batch_eval._read_items(batch, io.StringIO(INPUT), Path.cwd(), written), skip=done)
+    assert again.getvalue() == ""
+    assert batch.counts == {"ok": 0, "error": 0, "duplicate": 0, "skipped": 4}
@@ -0,0 +1,29 @@
+import json
+
+from bedrock_client import _content_with_image, _request_body
+
+PNG_BASE64 = "iVBORw0KGgoAAAANSUhEUg=="
+
+
+def _body(image_base64: str | None) -> dict:
+    messages = [{"role": "user", "content": _content_with_image("Transcript: hi", image_base64)}]
+    return json.loads(_request_body(messages, 64, "You are an interviewer."))
+
+
+def _breakpoints(body: dict) -> list[str]:
+    blocks = body["system"] + body["messages"][0]["content"]
+    return [block["type"] for block in blocks if "cache_control" in block]
+
+
+def test_only_the_image_carries_a_cache_breakpoint(monkeypatch):
+    monkeypatch.delenv("BEDROCK_PROMPT_CACHE", raising=False)
+    body = _body(PNG_BASE64)
+    assert _breakpoints(body) == ["image"]
+    assert body["messages"][0]["content"][0]["source"]["media_type"] == "image/png"
+    # Text-only prompts (router, critique without a diagram) are below the cacheable minimum.
+    assert _breakpoints(_body(None)) == []
+
+
+def test_prompt_cache_can_be_disabled(monkeypatch):
+    monkeypatch.setenv("BEDROCK_PROMPT_CACHE", "0")
+    assert _breakpoints(_body(PNG_BASE64)) == []
@@ -0,0 +1,63 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+import bedrock_hedge
+
+MODEL = "test-model"
+
+
+@pytest.fixture(autouse=True)
+def hedged(monkeypatch):
+    monkeypatch.setenv("BEDROCK_HEDGE", "1")
+    monkeypatch.setattr(bedrock_hedge, "DEFAULT_DEADLINE_S", 0.02)
+    monkeypatch.setattr(bedrock_hedge, "_latencies", {})
+    monkeypatch.setattr(bedrock_hedge, "_stats", {})
+
+
+def _fake_bedrock(monkeypatch, delays: list[float]) -> None:
+    """Attempt n answers after delays[n]."""
+    calls = iter(delays)
+
+    async def run_in_bedrock_executor(fn, client, model_id, *args):
+        delay = next(calls)
+        await asyncio.sleep(delay)
+        return f"answer after {delay}"
+
+    monkeypatch.setattr(bedrock_hedge, "run_in_bedrock_executor", run_in_bedrock_executor)
+
+
+async def test_hedge_win_records_primary_elapsed_as_lower_bound(monkeypatch):
+    _fake_bedrock(monkeypatch, [1.0, 0.01])
+    assert await bedrock_hedge.call_claude(None, MODEL, "hi") == "answer after 0.01"
+    assert bedrock_hedge.hedge_stats()[MODEL]["hedge_wins"] == 1
+    (sample,) = bedrock_hedge._latencies[MODEL]
+    # Deadline (20 ms) plus the hedge's 10 ms, not the hedge's own 10 ms.
+    assert sample >= 0.03
+
+
+async def test_primary_win_records_its_own_latency(monkeypatch):
+    _fake_bedrock(monkeypatch, [0.005])
+    await bedrock_hedge.call_claude(None, MODEL, "hi")
+    (sample,) = bedrock_hedge._latencies[MODEL]
+    assert 0.005 <= sample < 0.02
+    assert bedrock_hedge.hedge_stats()[MODEL]["hedged"] == 0
+
+
+async def test_cancel_while_queued_for_admission_leaves_no_tasks(monkeypatch):
+    @asynccontextmanager
+    async def never_admitted(model_id):
+        await asyncio.Event().wait()
+        yield
+
+    monkeypatch.setattr(bedrock_hedge, "admitted", never_admitted)
+    before = asyncio.all_tasks()
+    call = asyncio.create_task(bedrock_hedge.call_claude(None, MODEL, "hi"))
+    await asyncio.sleep(0.01)
+    call.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await call
+    await asyncio.sleep(0)
+    assert asyncio.all_tasks() - before == set()
+    assert bedrock_hedge.hedge_stats()[MODEL]["cancelled"] == 1
@@ -0,0 +1,23 @@
+import logging
+
+from env import env_float, env_int
+
+
+def test_values_and_defaults(monkeypatch):
+    monkeypatch.setenv("TEST_ENV_INT", "42")
+    monkeypatch.setenv("TEST_ENV_FLOAT", "2.5")
+    monkeypatch.delenv("TEST_ENV_MISSING", raising=False)
+    assert env_int("TEST_ENV_INT", 1) == 42
+    assert env_float("TEST_ENV_FLOAT", 1.0) == 2.5
+    assert env_float("TEST_ENV_INT", 1.0) == 42.0
+    assert env_int("TEST_ENV_MISSING", 7) == 7
+
+
+def test_malformed_value_falls_back_with_warning(monkeypatch, caplog):
+    monkeypatch.setenv("TEST_ENV_INT", "100ms")
+    monkeypatch.setenv("TEST_ENV_FLOAT", "")
+    with caplog.at_level(logging.WARNING):
+        assert env_int("TEST_ENV_INT", 100) == 100
+        assert env_float("TEST_ENV_FLOAT", 0.5) == 0.5
+    assert "TEST_ENV_INT='100ms'" in caplog.text
+    assert "TEST_ENV_FLOAT=''" in caplog.text
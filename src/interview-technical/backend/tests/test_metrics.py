@@ -0,0 +1,47 @@
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from metrics import HTTP_CLIENT_DISCONNECTS, HTTP_REQUEST_SECONDS, ClientDisconnected, TimingMiddleware
+
+
+async def ok(request):
+    return PlainTextResponse("ok")
+
+
+async def abandoned(request):
+    raise ClientDisconnected()
+
+
+async def broken(request):
+    raise RuntimeError("boom")
+
+
+app = Starlette(routes=[Route("/ok", ok), Route("/abandoned", abandoned), Route("/broken", broken)])
+app.add_middleware(TimingMiddleware)
+client = TestClient(app, raise_server_exceptions=False)
+
+
+def _series(metric, suffix: str, route: str) -> dict[str, float]:
+    """Rendered samples `name{labels} value` for one route, keyed by their labels."""
+    lines = [line for line in metric.render() if line.startswith(metric.name + suffix + "{")]
+    return {line.split("{", 1)[1].split("}")[0]: float(line.rsplit(" ", 1)[1]) for line in lines if f'route="{route}"' in line}
+
+
+def test_response_is_timed_with_server_timing_header():
+    response = client.get("/ok")
+    assert response.status_code == 200
+    assert "total;dur=" in response.headers["server-timing"]
+    assert _series(HTTP_REQUEST_SECONDS, "_count", "/ok") == {'method="GET",route="/ok",status="200"': 1}
+
+
+def test_client_disconnect_is_counted_not_timed():
+    client.get("/abandoned")
+    assert _series(HTTP_CLIENT_DISCONNECTS, "", "/abandoned") == {'method="GET",route="/abandoned"': 1}
+    assert _series(HTTP_REQUEST_SECONDS, "_count", "/abandoned") == {}
+
+
+def test_unhandled_error_is_timed_as_500():
+    assert client.get("/broken").status_code == 500
+    assert _series(HTTP_REQUEST_SECONDS, "_count", "/broken") == {'method="GET",route="/broken",status="500"': 1}
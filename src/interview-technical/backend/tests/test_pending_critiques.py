@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+
+import pipeline
+from pending_critiques import PendingCritiques
+from schemas import CritiqueBaseline, CritiqueResponse
+
+
+def _critique(score: float, follow_up: str | None = None) -> CritiqueResponse:
+    return CritiqueResponse(design_aspects=[], diagram_score=score, verbal_score=score, overall_score=score, follow_up=follow_up)
+
+
+async def _result(value):
+    return value
+
+
+@pytest.fixture
+def pending(monkeypatch) -> PendingCritiques:
+    store = PendingCritiques(ttl_s=600)
+    monkeypatch.setattr(pipeline, "pending_critiques", store)
+    return store
+
+
+async def test_add_get_and_discard():
+    store = PendingCritiques(ttl_s=600)
+    task = asyncio.create_task(asyncio.sleep(10))
+    critique_id = store.add(task)
+    assert store.get(critique_id) is task
+    store.discard(critique_id)
+    assert store.get(critique_id) is None
+    await asyncio.gather(task, return_exceptions=True)
+    assert task.cancelled()
+
+
+async def test_expired_entries_are_cancelled(monkeypatch):
+    store = PendingCritiques(ttl_s=0)
+    old = asyncio.create_task(asyncio.sleep(10))
+    old_id = store.add(old)
+    store.add(asyncio.create_task(_result(None)))  # prunes the expired one
+    assert store.get(old_id) is None
+    await asyncio.gather(old, return_exceptions=True)
+    assert old.cancelled()
+
+
+async def test_background_critique_is_delivered_once(pending):
+    baseline = CritiqueBaseline(critique=_critique(0.2))
+    task = asyncio.create_task(_result(_critique(0.8, "Why a queue?")))
+    pipeline._mark_pending(baseline, pending.add(task), "phash-new")
+    await task
+
+    assert not pipeline._absorb_background_critique(baseline)
+    assert baseline.critique.overall_score == 0.8
+    assert baseline.diagram_phash == "phash-new"
+    assert baseline.pending_critique_id == ""
+    assert pipeline._previous_scores(baseline).follow_up == "Why a queue?"
+    assert pipeline._previous_scores(baseline).follow_up is None
+
+
+async def test_unfinished_background_critique_stays_pending(pending):
+    baseline = CritiqueBaseline()
+    task = asyncio.create_task(asyncio.sleep(10))
+    critique_id = pending.add(task)
+    pipeline._mark_pending(baseline, critique_id, "p")
+    pipeline._absorb_background_critique(baseline)
+    assert baseline.pending_critique_id == critique_id
+    task.cancel()
+
+
+async def test_critique_pending_in_another_worker_forces_a_fresh_one(pending, monkeypatch):
+    monkeypatch.setattr(pipeline, "policy_enabled", lambda: True)
+    monkeypatch.setattr(pipeline, "diagram_phash", lambda _: "p")
+    baseline = CritiqueBaseline(critique=_critique(0.2), diagram_phash="p", pending_critique_id="started-elsewhere")
+    assert await pipeline._plan_critique("ok", "", baseline) == (False, "p")  # short turn, same diagram
+
+    lost = pipeline._absorb_background_critique(baseline)
+    assert lost
+    assert baseline.pending_critique_id == ""
+    assert baseline.critique.overall_score == 0.2
+    assert await pipeline._plan_critique("ok", "", baseline, lost) == (True, "p")
+
+
+async def test_fresh_critique_supersedes_pending_one(pending):
+    baseline = CritiqueBaseline(critique=_critique(0.2))
+    old = asyncio.create_task(asyncio.sleep(10))
+    pipeline._mark_pending(baseline, pending.add(old), "phash-old")
+
+    pipeline._update_baseline(baseline, "new turn", "phash-fresh", _critique(0.9, "Fresh question"))
+    assert baseline.pending_critique_id == ""
+    assert baseline.pending_phash == ""
+    await asyncio.gather(old, return_exceptions=True)
+    assert old.cancelled()
+
+    # The next turn keeps the fresh critique instead of reviving the old one.
+    pipeline._absorb_background_critique(baseline)
+    assert baseline.critique.overall_score == 0.9
+    assert baseline.diagram_phash == "phash-fresh"
+    assert not baseline.undelivered
+
+
+async def test_skipped_turn_folds_speech_into_next_critique(pending):
+    baseline = CritiqueBaseline(critique=_critique(0.5))
+    pipeline._update_baseline(baseline, "first part", "p", None)
+    pipeline._update_baseline(baseline, "second part", "p", None)
+    assert pipeline._critique_transcript("third", baseline) == "first part second part third"
+    pipeline._update_baseline(baseline, "third", "p", _critique(0.6))
+    assert baseline.pending_transcript == ""
@@ -0,0 +1,27 @@
+from rate_limit import TokenBucket
+
+
+def test_burst_then_empty():
+    bucket = TokenBucket(rate=1.0, burst=2)
+    assert bucket.try_acquire()
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+    assert 0 < bucket.wait_time() <= 1.0
+
+
+def test_refill(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("rate_limit.time.monotonic", lambda: now[0])
+    bucket = TokenBucket.per_minute(60)
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+    now[0] += 0.5
+    assert bucket.wait_time() == 0.5
+    now[0] += 0.5
+    assert bucket.try_acquire()
+
+
+def test_unlimited():
+    bucket = TokenBucket(rate=0)
+    assert all(bucket.try_acquire() for _ in range(1000))
+    assert bucket.wait_time() == 0.0
@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from sentence_stream import ResponseFieldExtractor, SentenceSplitter, find_string_field, split_sentences
+
+ROUTER_JSON = json.dumps(
+    {"interrupt": False, "response": 'Nice. Say "cache" \\ then\nwait é \U0001f600', "emotion": "happy"}, ensure_ascii=True
+)
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 7, len(ROUTER_JSON)])
+def test_extractor_decodes_field_across_any_chunking(size):
+    extractor = ResponseFieldExtractor()
+    decoded = "".join(extractor.feed(ROUTER_JSON[i : i + size]) for i in range(0, len(ROUTER_JSON), size))
+    assert decoded == json.loads(ROUTER_JSON)["response"]
+    assert extractor.done
+    assert extractor.raw == ROUTER_JSON
+
+
+def test_extractor_waits_for_key_and_ignores_text_after_value():
+    extractor = ResponseFieldExtractor("response")
+    assert extractor.feed('{"reasoning": "the response is') == ""
+    assert extractor.feed(' fine", "response"') == ""
+    assert extractor.feed(' : "Go') == "Go"
+    assert extractor.feed('od."') == "od."
+    assert extractor.feed(', "other": "x"}') == ""
+
+
+def test_find_string_field_only_returns_closed_values():
+    assert find_string_field('{"emotion": "calm', "emotion") is None
+    assert find_string_field('{"emotion": "calm", "x', "emotion") == "calm"
+
+
+def test_splitter_releases_sentences_as_they_close():
+    splitter = SentenceSplitter()
+    assert splitter.feed("That works well. Now consider") == ["That works well."]
+    assert splitter.feed(" the write path! What") == ["Now consider the write path!"]
+    assert splitter.feed(" happens") == []
+    assert splitter.flush() == "What happens"
+    assert splitter.flush() is None
+
+
+def test_splitter_merges_short_fragments_and_abbreviations():
+    splitter = SentenceSplitter(min_chars=12)
+    assert splitter.feed("Hm. Use a queue, e.g. Kafka, here. ") == ["Hm. Use a queue, e.g. Kafka, here."]
+
+
+def test_splitter_breaks_on_newlines_and_closing_quotes():
+    assert split_sentences('He said "use sharding." Then list them\nall of the trade-offs') == [
+        'He said "use sharding."',
+        "Then list them",
+        "all of the trade-offs",
+    ]
+
+
+def test_extractor_replaces_unpaired_surrogates():
+    extractor = ResponseFieldExtractor()
+    assert extractor.feed('{"response": "a\\ud83d b \\ude00 c"}') == "a\ufffd b \ufffd c"
@@ -0,0 +1,45 @@
+import sqlite3
+
+from schemas import SessionState
+from session_store import InMemorySessionStore, SqliteSessionStore
+
+
+async def test_memory_store_roundtrip_is_a_copy():
+    store = InMemorySessionStore()
+    await store.put(SessionState(session_id="a", previous_state="hi"))
+    state = await store.get("a")
+    state.previous_state = "changed"
+    assert (await store.get("a")).previous_state == "hi"
+    await store.delete("a")
+    assert await store.get("a") is None
+
+
+async def test_sqlite_store_roundtrip_and_expiry(tmp_path):
+    store = SqliteSessionStore(str(tmp_path / "sessions.sqlite3"))
+    await store.put(SessionState(session_id="a", previous_state="hi"))
+    assert (await store.get("a")).previous_state == "hi"
+    store.ttl_s = -1
+    assert await store.get("a") is None
+
+
+def test_sqlite_store_closes_connections(tmp_path, monkeypatch):
+    opened: list[sqlite3.Connection] = []
+    connect = sqlite3.connect
+
+    def tracking_connect(*args, **kwargs):
+        conn = connect(*args, **kwargs)
+        opened.append(conn)
+        return conn
+
+    monkeypatch.setattr(sqlite3, "connect", tracking_connect)
+    store = SqliteSessionStore(str(tmp_path / "sessions.sqlite3"))
+    store._put(SessionState(session_id="a"))
+    store._get("a")
+    store._delete("a")
+    assert len(opened) == 4
+    for conn in opened:
+        try:
+            conn.execute("SELECT 1")
+        except sqlite3.ProgrammingError:
+            continue  # closed
+        raise AssertionError("connection left open")
@@ -0,0 +1,119 @@
+import asyncio
+
+from speculative import SpeculativeEvaluations, fingerprint
+
+
+def _evaluation(result: str = "done", delay_s: float = 0.0):
+    async def evaluate():
+        await asyncio.sleep(delay_s)
+        return result
+
+    return evaluate
+
+
+def test_fingerprint_normalizes_whitespace_only():
+    assert fingerprint("use  a\ncache ", b"png", "q1") == fingerprint("use a cache", b"png", "q1")
+    assert fingerprint("use a cache", b"png", "q1") != fingerprint("use a cache", b"png2", "q1")
+    assert fingerprint("use a cache", b"png", "q1") != fingerprint("use a cache", b"png", "q2")
+
+
+async def test_hit_hands_over_the_running_task():
+    specs = SpeculativeEvaluations(ttl_s=30)
+    assert specs.start("s", 1, "fp", _evaluation("graded", delay_s=0.01))
+    assert not specs.start("s", 1, "fp", _evaluation("again"))  # same speculation: reused
+    await asyncio.sleep(0.005)  # the rest of the pause
+    task = specs.take("s", 1, "fp")
+    assert await task == "graded"
+    stats = specs.stats()
+    assert (stats["started"], stats["reused"], stats["hits"], stats["in_flight"]) == (1, 1, 1, 0)
+    assert stats["hit_rate"] == 1.0 and stats["mean_hidden_ms"] > 0
+
+
+async def test_mismatch_cancels_speculation():
+    specs = SpeculativeEvaluations(ttl_s=30)
+    specs.start("s", 1, "fp", _evaluation(delay_s=10))
+    running = specs._running["s"].task
+    assert specs.take("s", 1, "other-fp") is None
+    await asyncio.sleep(0)
+    assert running.cancelled()
+    assert specs.take("s", 2, "fp") is None  # nothing left: plain evaluation
+    stats = specs.stats()
+    assert (stats["mismatched"], stats["unspeculated"], stats["wasted"], stats["hit_rate"]) == (1, 1, 1, 0.0)
+
+
+async def test_newer_turn_supersedes_and_cancel_is_turn_scoped():
+    specs = SpeculativeEvaluations(ttl_s=30)
+    specs.start("s", 1, "fp1", _evaluation(delay_s=10))
+    specs.start("s", 2, "fp2", _evaluation(delay_s=10))
+    assert not specs.cancel("s", turn_id=1)
+    assert specs.cancel("s", turn_id=2)
+    assert not specs.cancel("s")
+    stats = specs.stats()
+    assert (stats["superseded"], stats["cancelled"], stats["in_flight"]) == (1, 1, 0)
+
+
+async def test_failed_speculation_is_not_taken():
+    async def failing():
+        raise RuntimeError("throttled")
+
+    specs = SpeculativeEvaluations(ttl_s=30)
+    specs.start("s", 1, "fp", failing)
+    await asyncio.sleep(0)
+    assert specs.take("s", 1, "fp") is None
+    assert (specs.stats()["failed"], specs.stats()["mismatched"]) == (1, 0)
+
+
+async def test_failure_after_take_is_not_a_hit():
+    async def failing_later():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("throttled")
+
+    specs = SpeculativeEvaluations(ttl_s=30)
+    specs.start("s", 1, "fp", failing_later)
+    task = specs.take("s", 1, "fp")
+    await asyncio.gather(task, return_exceptions=True)
+    stats = specs.stats()
+    assert (stats["hits"], stats["failed"], stats["hit_rate"], stats["mean_hidden_ms"]) == (0, 1, 0.0, 0.0)
+
+
+async def test_uncommitted_speculation_expires():
+    specs = SpeculativeEvaluations(ttl_s=0.02)
+    specs.start("s", 1, "fp", _evaluation())
+    await asyncio.sleep(0.03)
+    assert specs.take("s", 1, "fp") is None
+    stats = specs.stats()
+    # A completed result thrown away still cost its Bedrock calls.
+    assert (stats["expired"], stats["wasted_completed"], stats["unspeculated"]) == (1, 1, 1)
+
+
+async def test_commit_falls_back_to_fresh_evaluation_when_speculation_fails(monkeypatch):
+    import httpx
+
+    import main
+    import pipeline
+    import speculative
+    from schemas import InterviewEvaluation, MinimaxEmotion
+
+    calls: list[str] = []
+
+    async def run_evaluation_pipeline(transcript, diagram_base64, previous_state=""):
+        calls.append(transcript)
+        if len(calls) == 1:
+            await asyncio.sleep(0.01)
+            raise RuntimeError("Bedrock throttled")
+        return InterviewEvaluation(
+            transcript=transcript, diagram_score=0.5, verbal_score=0.5, overall_score=0.5,
+            design_aspects=[], minimax_emotion=MinimaxEmotion.neutral, verbal_feedback="fresh",
+        )
+
+    monkeypatch.setattr(pipeline, "run_evaluation_pipeline", run_evaluation_pipeline)
+    monkeypatch.setattr(speculative, "speculations", SpeculativeEvaluations(ttl_s=30))
+    form = {"session_id": "s", "turn_id": "1", "transcript": "use a queue"}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://test") as client:
+        assert (await client.post("/evaluate/speculative", data=form)).status_code == 202
+        response = await client.post("/evaluate/speculative/commit", data=form)
+    assert response.status_code == 200
+    assert response.headers["X-Speculation"] == "failed"
+    assert response.json()["verbal_feedback"] == "fresh"
+    assert calls == ["use a queue", "use a queue"]
+    assert speculative.speculations.stats()["failed"] == 1
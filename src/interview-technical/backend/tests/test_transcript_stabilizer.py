@@ -0,0 +1,50 @@
+from amazon_transcribe.model import Alternative, Item, Result
+
+from transcribe_streaming import TranscriptStabilizer
+
+
+def _result(words: list[tuple[str, bool]], partial: bool = True, result_id: str = "r1", transcript: str = "") -> Result:
+    items = [Item(item_type="punctuation" if w in ",.?" else "pronunciation", content=w, stable=s) for w, s in words]
+    text = transcript or " ".join(w for w, _ in words)
+    return Result(result_id=result_id, is_partial=partial, alternatives=[Alternative(text, items, None)])
+
+
+def test_partials_emit_only_newly_stable_items():
+    s = TranscriptStabilizer()
+    assert s.update(_result([("we", True), ("shard", False)])).transcript == "we"
+    # Same stable prefix, unstable tail changed: nothing new.
+    assert s.update(_result([("we", True), ("shared", False)])) is None
+    message = s.update(_result([("we", True), ("shard", True), ("by", True), ("user", False)]))
+    assert (message.transcript, message.is_final) == ("shard by", False)
+
+
+def test_final_closes_segment_with_remaining_items():
+    s = TranscriptStabilizer()
+    s.update(_result([("use", True), ("a", True), ("cache", False)]))
+    message = s.update(_result([("use", True), ("a", True), ("cache", True), (".", True)], partial=False))
+    assert (message.transcript, message.is_final) == ("cache.", True)
+    # The result id starts over after its final result.
+    assert s.update(_result([("next", True)])).transcript == "next"
+
+
+def test_final_without_items_falls_back_to_transcript_once():
+    s = TranscriptStabilizer()
+    assert s.update(_result([], partial=False, transcript="hello there")).transcript == "hello there"
+    s.update(_result([("hi", True)], result_id="r2"))
+    # Items already sent for this result: an item-less final adds nothing.
+    assert s.update(_result([], partial=False, result_id="r2", transcript="hi")) is None
+
+
+def test_result_ids_are_tracked_independently():
+    s = TranscriptStabilizer()
+    assert s.update(_result([("one", True)], result_id="a")).transcript == "one"
+    assert s.update(_result([("two", True)], result_id="b")).transcript == "two"
+    assert s.update(_result([("one", True), ("more", True)], result_id="a")).transcript == "more"
+
+
+def test_punctuation_attaches_and_counters_track_results():
+    s = TranscriptStabilizer()
+    message = s.update(_result([("yes", True), (",", True), ("exactly", True)]))
+    assert message.transcript == "yes, exactly"
+    assert s.update(Result(result_id="x", is_partial=True, alternatives=[])) is None
+    assert (s.results_seen, s.messages_out) == (2, 1)
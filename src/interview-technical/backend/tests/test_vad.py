@@ -0,0 +1,95 @@
+import numpy as np
+
+from vad import SAMPLE_RATE, VoiceActivityDetector
+
+FRAME = SAMPLE_RATE * 20 // 1000  # samples per 20 ms frame
+FRAME_BYTES = FRAME * 2
+rng = np.random.default_rng(0)
+
+
+def _quiet(frames: int) -> bytes:
+    return rng.normal(0, 30, frames * FRAME).astype("<i2").tobytes()
+
+
+def _voice(frames: int) -> bytes:
+    t = np.arange(frames * FRAME) / SAMPLE_RATE
+    return (8000 * np.sin(2 * np.pi * 200 * t)).astype("<i2").tobytes()
+
+
+def _vad() -> VoiceActivityDetector:
+    # 20 ms frames: onset after 3 loud frames, 10-frame hangover, 5-frame pre-roll,
+    # end of utterance after 15 quiet frames, keepalive every 25 frames.
+    return VoiceActivityDetector(
+        frame_ms=20,
+        onset_margin_db=12,
+        release_margin_db=6,
+        hangover_ms=200,
+        preroll_ms=100,
+        end_of_utterance_ms=300,
+        keepalive_ms=500,
+    )
+
+
+def _frames(data: bytes) -> list[bytes]:
+    return [data[i : i + FRAME_BYTES] for i in range(0, len(data), FRAME_BYTES)]
+
+
+def test_silence_is_thinned_to_keepalive_frames():
+    vad = _vad()
+    out, eou = vad.process(_quiet(10 + 100))  # calibration, then 100 quiet frames
+    assert not eou and not vad.in_speech
+    assert _frames(out) == [bytes(FRAME_BYTES)] * 4
+    assert (vad.frames_in, vad.frames_out) == (110, 4)
+
+
+def test_onset_needs_consecutive_loud_frames():
+    vad = _vad()
+    vad.process(_quiet(10 + 5))
+    out, _ = vad.process(_voice(2) + _quiet(1) + _voice(2))
+    assert out == b"" and not vad.in_speech
+    lead_in = _quiet(3)
+    vad.process(lead_in)
+    voice = _voice(3)
+    out, _ = vad.process(voice)
+    assert vad.in_speech
+    # Pre-roll (5 frames) is released on onset: the last quiet lead-in frames, then the voice.
+    assert out == lead_in[-2 * FRAME_BYTES :] + voice
+
+
+def test_hangover_forwards_trailing_quiet_frames():
+    vad = _vad()
+    vad.process(_quiet(10 + 5) + _voice(3))
+    gap = _quiet(9)
+    out, _ = vad.process(gap)
+    assert out == gap and vad.in_speech  # short pause inside speech is kept
+    vad.process(_voice(1))
+    tail = _quiet(10)
+    out, _ = vad.process(tail)
+    assert out == tail and not vad.in_speech
+
+
+def test_end_of_utterance_raised_once_after_silence():
+    vad = _vad()
+    vad.process(_quiet(10 + 5) + _voice(5))
+    _, eou = vad.process(_quiet(10))  # hangover: speech ends, silence run = 10
+    assert not eou and not vad.in_speech
+    _, eou = vad.process(_quiet(4))
+    assert not eou
+    _, eou = vad.process(_quiet(1))  # 15th quiet frame
+    assert eou
+    _, eou = vad.process(_quiet(50))
+    assert not eou
+    # The next utterance can raise it again.
+    vad.process(_voice(5) + _quiet(10))
+    _, eou = vad.process(_quiet(5))
+    assert eou
+
+
+def test_chunk_boundaries_do_not_change_output():
+    audio = _quiet(10 + 20) + _voice(8) + _quiet(40) + _voice(4) + _quiet(30)
+    whole, eou_whole = _vad().process(audio)
+    vad = _vad()
+    pieces = [vad.process(audio[i : i + 333]) for i in range(0, len(audio), 333)]
+    assert b"".join(p for p, _ in pieces) == whole
+    assert eou_whole
+    assert sum(e for _, e in pieces) == 2  # one per utterance
@@ -1,47 +1,133 @@
 """
 AWS Transcribe Streaming via WebSocket. Uses same AWS credentials as Bedrock.
-Audio: PCM 16-bit 16kHz mono. Sends transcript chunks back as they arrive.
+Audio: PCM 16-bit 16kHz mono. Sends transcript deltas back as they stabilize.
 """
 
 import asyncio
 import logging
 import os
+import time
 from typing import AsyncIterator
 
 from amazon_transcribe.client import TranscribeStreamingClient
 from amazon_transcribe.handlers import TranscriptResultStreamHandler
-from amazon_transcribe.model import TranscriptEvent
+from amazon_transcribe.model import Result, TranscriptEvent
+
+from metrics import STT_FIRST_TRANSCRIPT_SECONDS, STT_TRANSCRIPTS
+from schemas import TranscriptMessage
 
 
 def get_region() -> str:
     return os.getenv("AWS_REGION", "us-west-2")
 
 
+# Shared client: its CRT event loop and credential chain are set up once, not per stream.
+_client: TranscribeStreamingClient | None = None
+
+
+def get_transcribe_client() -> TranscribeStreamingClient:
+    global _client
+    if _client is None:
+        _client = TranscribeStreamingClient(region=get_region())
+    return _client
+
+
+async def warm_transcribe_client() -> None:
+    """Create the shared client and resolve AWS credentials ahead of the first stream."""
+    client = get_transcribe_client()
+    resolver = getattr(client, "_credential_resolver", None)
+    if resolver is not None:
+        await resolver.get_credentials()
+
+
+def _join_items(items: list) -> str:
+    """Words separated by spaces, punctuation attached to the preceding word."""
+    text = ""
+    for item in items:
+        content = item.content or ""
+        if item.item_type == "punctuation" or not text:
+            text += content
+        else:
+            text += " " + content
+    return text
+
+
+class TranscriptStabilizer:
+    """
+    Turn Transcribe's stream of growing partial results into deltas: for each result_id only
+    items not sent before are emitted, partial results only up to their stable prefix, and the
+    final result closes the segment with is_final=True. Unchanged repeats produce nothing.
+    """
+
+    def __init__(self) -> None:
+        self._sent: dict[str, int] = {}  # result_id -> number of items already emitted
+        self.results_seen = 0
+        self.messages_out = 0
+
+    def update(self, result: Result) -> TranscriptMessage | None:
+        self.results_seen += 1
+        if not result.alternatives:
+            return None
+        alt = result.alternatives[0]
+        result_id = result.result_id or ""
+        sent = self._sent.get(result_id, 0)
+        items = alt.items or []
+        if result.is_partial:
+            stable = 0
+            while stable < len(items) and items[stable].stable:
+                stable += 1
+            if stable <= sent:
+                return None
+            self._sent[result_id] = stable
+            delta = _join_items(items[sent:stable])
+            is_final = False
+        else:
+            self._sent.pop(result_id, None)
+            if items:
+                delta = _join_items(items[sent:])
+            else:
+                delta = "" if sent else (alt.transcript or "")
+            is_final = True
+        delta = delta.strip()
+        if not delta:
+            return None
+        self.messages_out += 1
+        return TranscriptMessage(transcript=delta, is_final=is_final)
+
+
 async def transcribe_audio_stream(
     audio_chunks: AsyncIterator[bytes],
-    transcript_queue: asyncio.Queue[str],
+    transcript_queue: asyncio.Queue[TranscriptMessage],
 ) -> None:
-    """Consume audio chunks, send to Transcribe, push transcript text to queue."""
-    region = get_region()
-    logging.info("[STT] Transcribe stream starting region=%s", region)
-    client = TranscribeStreamingClient(region=region)
+    """Consume audio chunks, send to Transcribe, push stabilized transcript deltas to queue."""
+    logging.info("[STT] Transcribe stream starting region=%s", get_region())
+    client = get_transcribe_client()
 
     stream = await client.start_stream_transcription(
         language_code="en-US",
         media_sample_rate_hz=16000,
         media_encoding="pcm",
+        enable_partial_results_stabilization=True,
+        partial_results_stability=os.getenv("STT_PARTIAL_STABILITY", "high"),
     )
     logging.info("[STT] Transcribe stream connected")
 
+    stabilizer = TranscriptStabilizer()
+    # Time the first audio chunk went out (for time-to-first-transcript).
+    first_audio_at: list[float] = []
+
     class QueueHandler(TranscriptResultStreamHandler):
         async def handle_transcript_event(self, transcript_event: TranscriptEvent):
             for result in transcript_event.transcript.results:
-                if not result.alternatives:
+                message = stabilizer.update(result)
+                if message is None:
                     continue
-                text = result.alternatives[0].transcript
-                if text and text.strip():
-                    logging.info("[STT] Transcribe result: %r", text[:60] + "..." if len(text) > 60 else text)
-                    await transcript_queue.put(text.strip())
+                if first_audio_at and stabilizer.messages_out == 1:
+                    STT_FIRST_TRANSCRIPT_SECONDS.observe(time.perf_counter() - first_audio_at[0])
+                STT_TRANSCRIPTS.inc(final=str(message.is_final).lower())
+                text = message.transcript
+                logging.info("[STT] Transcribe delta final=%s: %r", message.is_final, text[:60] + "..." if len(text) > 60 else text)
+                await transcript_queue.put(message)
 
     handler = QueueHandler(stream.output_stream)
 
@@ -51,9 +137,14 @@ async def transcribe_audio_stream(
             async for chunk in audio_chunks:
                 if chunk:
                     chunk_count += 1
+                    if chunk_count == 1:
+                        first_audio_at.append(time.perf_counter())
                     await stream.input_stream.send_audio_event(audio_chunk=chunk)
             logging.info("[STT] sent %d audio chunks to Transcribe", chunk_count)
         finally:
             await stream.input_stream.end_stream()
 
-    await asyncio.gather(write_audio(), handler.handle_events())
+    try:
+        await asyncio.gather(write_audio(), handler.handle_events())
+    finally:
+        logging.info("[STT] Transcribe results=%d deltas_sent=%d", stabilizer.results_seen, stabilizer.messages_out)
@@ -0,0 +1,180 @@
+"""
+Disk-backed PCM cache for Minimax TTS output.
+
+Entries are keyed on (text, emotion, voice_id, speed, pitch, vol) and stored as raw PCM files
+under TTS_CACHE_DIR. Hits are served straight from an mmap of the file; the directory is
+bounded by TTS_CACHE_MAX_BYTES with least-recently-used eviction (file mtime persists the
+LRU order across restarts). Phrases listed in TTS_PREWARM_FILE are synthesized at startup.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from typing import AsyncIterator
+
+from env import env_int
+from minimax_client import DEFAULT_VOICE_ID, tts_stream
+from schemas import MinimaxEmotion
+
+SERVE_CHUNK_BYTES = 16 * 1024
+
+
+def cache_key(
+    text: str,
+    emotion: MinimaxEmotion,
+    voice_id: str,
+    speed: float,
+    pitch: int,
+    vol: float,
+) -> str:
+    ident = json.dumps([text, emotion.value, voice_id, speed, pitch, vol], ensure_ascii=False)
+    return hashlib.sha256(ident.encode()).hexdigest()
+
+
+class TTSCache:
+    """LRU set of PCM files in one directory. Index access is guarded by a lock (writes run in threads)."""
+
+    def __init__(self, directory: str, max_bytes: int) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._index: OrderedDict[str, int] = OrderedDict()
+        self._total = 0
+        os.makedirs(directory, exist_ok=True)
+        entries = []
+        for name in os.listdir(directory):
+            if not name.endswith(".pcm"):
+                continue
+            st = os.stat(os.path.join(directory, name))
+            entries.append((st.st_mtime, name[:-4], st.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._total += size
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".pcm")
+
+    def open(self, key: str) -> mmap.mmap | None:
+        """Map a cached entry read-only and mark it most recently used; None on miss."""
+        with self._lock:
+            if key not in self._index:
+                self.misses += 1
+                return None
+            self._index.move_to_end(key)
+            self.hits += 1
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            os.utime(path)
+        except (OSError, ValueError):
+            with self._lock:
+                self._total -= self._index.pop(key, 0)
+            return None
+        return mapped
+
+    def store(self, key: str, pcm: bytes) -> None:
+        """Write an entry atomically, then evict least-recently-used files over max_bytes."""
+        if not pcm or len(pcm) > self.max_bytes:
+            return
+        path = self._path(key)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(pcm)
+        os.replace(tmp, path)
+        evicted: list[str] = []
+        with self._lock:
+            self._total += len(pcm) - self._index.pop(key, 0)
+            self._index[key] = len(pcm)
+            while self._total > self.max_bytes and self._index:
+                old_key, size = self._index.popitem(last=False)
+                self._total -= size
+                evicted.append(old_key)
+        for old_key in evicted:
+            try:
+                os.remove(self._path(old_key))
+            except OSError:
+                pass
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._index), "hits": self.hits, "misses": self.misses}
+
+
+tts_cache = TTSCache(
+    directory=os.getenv("TTS_CACHE_DIR", ".tts_cache"),
+    max_bytes=env_int("TTS_CACHE_MAX_BYTES", 512 * 1024 * 1024),
+)
+
+
+async def cached_tts_stream(
+    text: str,
+    emotion: MinimaxEmotion,
+    *,
+    voice_id: str = DEFAULT_VOICE_ID,
+    speed: float = 1.15,
+    pitch: int = 0,
+    vol: float = 2.99,
+) -> AsyncIterator[bytes]:
+    """tts_stream with the disk cache in front: hits come from the mapped file, misses are teed into it."""
+    key = cache_key(text, emotion, voice_id, speed, pitch, vol)
+    mapped = tts_cache.open(key)
+    if mapped is not None:
+        logging.info("[TTS] cache hit bytes=%d", len(mapped))
+        try:
+            for offset in range(0, len(mapped), SERVE_CHUNK_BYTES):
+                yield mapped[offset : offset + SERVE_CHUNK_BYTES]
+        finally:
+            mapped.close()
+        return
+
+    collected = bytearray()
+    async for chunk in tts_stream(text, emotion, voice_id=voice_id, speed=speed, pitch=pitch, vol=vol):
+        collected += chunk
+        yield chunk
+    # Only reached when Minimax finished the utterance; partial streams are never cached.
+    await asyncio.to_thread(tts_cache.store, key, bytes(collected))
+
+
+def _load_prewarm_phrases(path: str) -> list[tuple[str, MinimaxEmotion]]:
+    """One phrase per line, optionally prefixed with "emotion|". Blank lines and # comments are skipped."""
+    phrases: list[tuple[str, MinimaxEmotion]] = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            emotion = MinimaxEmotion.neutral
+            head, sep, rest = line.partition("|")
+            if sep and head.strip() in MinimaxEmotion.__members__:
+                emotion, line = MinimaxEmotion(head.strip()), rest.strip()
+            phrases.append((line, emotion))
+    return phrases
+
+
+async def prewarm_tts_cache() -> None:
+    """Synthesize every phrase in TTS_PREWARM_FILE that is not cached yet."""
+    path = os.getenv("TTS_PREWARM_FILE")
+    if not path:
+        return
+    try:
+        phrases = _load_prewarm_phrases(path)
+    except OSError as e:
+        logging.warning("[TTS] prewarm file unreadable %s: %s", path, e)
+        return
+    warmed = 0
+    for text, emotion in phrases:
+        try:
+            async for _ in cached_tts_stream(text, emotion):
+                pass
+            warmed += 1
+        except Exception as e:
+            logging.warning("[TTS] prewarm failed for %r: %s", text[:40], e)
+    logging.info("[TTS] prewarm done phrases=%d ok=%d", len(phrases), warmed)
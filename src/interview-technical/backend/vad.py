@@ -0,0 +1,127 @@
+"""
+Energy / zero-crossing voice activity detection for the STT path (PCM 16 kHz 16-bit mono).
+
+Frame features are computed with NumPy for a whole chunk at once; the speech/silence state
+machine uses hysteresis (onset needs several loud frames, release needs a hangover of quiet
+frames) and a pre-roll buffer so word onsets are never clipped. Silent audio is thinned to
+one keepalive frame per interval so Transcribe's idle timeout never fires, and an
+end-of-utterance flag is raised once per utterance after a configurable stretch of silence.
+"""
+
+import os
+from collections import deque
+
+import numpy as np
+
+from env import env_float
+
+SAMPLE_RATE = 16000
+
+
+
+def vad_enabled() -> bool:
+    return os.getenv("STT_VAD", "1").lower() not in ("0", "false", "no")
+
+
+def frame_features(samples: np.ndarray, frame_len: int) -> tuple[np.ndarray, np.ndarray]:
+    """Per-frame energy (dBFS) and zero-crossing rate for a (k * frame_len,) int16 array."""
+    frames = samples.reshape(-1, frame_len).astype(np.float32)
+    rms = np.sqrt(np.mean(frames * frames, axis=1)) + 1e-9
+    energy_db = 20.0 * np.log10(rms / 32768.0)
+    signs = np.signbit(frames)
+    zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (frame_len - 1)
+    return energy_db, zcr
+
+
+class VoiceActivityDetector:
+    """Stateful VAD over a stream of arbitrary-size PCM chunks."""
+
+    def __init__(
+        self,
+        frame_ms: int = 20,
+        onset_margin_db: float | None = None,
+        release_margin_db: float | None = None,
+        onset_frames: int = 3,
+        hangover_ms: float | None = None,
+        preroll_ms: float | None = None,
+        end_of_utterance_ms: float | None = None,
+        keepalive_ms: float | None = None,
+    ) -> None:
+        self.frame_len = SAMPLE_RATE * frame_ms // 1000
+        self.frame_bytes = self.frame_len * 2
+        # Thresholds are relative to an adaptive noise floor (calibrated on the first frames).
+        self.onset_margin_db = onset_margin_db if onset_margin_db is not None else env_float("VAD_ONSET_MARGIN_DB", 12.0)
+        self.release_margin_db = release_margin_db if release_margin_db is not None else env_float("VAD_RELEASE_MARGIN_DB", 6.0)
+        self.onset_frames = onset_frames
+        self.hangover_frames = int((hangover_ms if hangover_ms is not None else env_float("VAD_HANGOVER_MS", 400)) // frame_ms)
+        preroll = int((preroll_ms if preroll_ms is not None else env_float("VAD_PREROLL_MS", 300)) // frame_ms)
+        self.eou_frames = int((end_of_utterance_ms if end_of_utterance_ms is not None else env_float("VAD_EOU_MS", 700)) // frame_ms)
+        self.keepalive_frames = max(1, int((keepalive_ms if keepalive_ms is not None else env_float("VAD_KEEPALIVE_MS", 1000)) // frame_ms))
+        self.noise_floor_db = 0.0
+        self.calibration_frames = 10
+        self.in_speech = False
+        self.frames_in = 0
+        self.frames_out = 0
+        self._pending = b""
+        self._preroll: deque[bytes] = deque(maxlen=max(preroll, onset_frames))
+        self._loud_run = 0
+        self._quiet_run = 0
+        self._silence_run = 0
+        self._utterance_open = False
+
+    def _is_loud(self, energy_db: float, zcr: float) -> bool:
+        threshold = self.noise_floor_db + (self.release_margin_db if self.in_speech else self.onset_margin_db)
+        # Very high ZCR at low energy is hiss, not voice; fricatives still pass on energy.
+        return energy_db > threshold and (zcr < 0.5 or energy_db > threshold + 6.0)
+
+    def process(self, chunk: bytes) -> tuple[bytes, bool]:
+        """Feed PCM; return (audio to forward to STT, end_of_utterance reached in this chunk)."""
+        data = self._pending + chunk
+        usable = len(data) - len(data) % self.frame_bytes
+        self._pending = data[usable:]
+        if not usable:
+            return b"", False
+        energy_db, zcr = frame_features(np.frombuffer(data[:usable], dtype="<i2"), self.frame_len)
+        out: list[bytes] = []
+        end_of_utterance = False
+        for i in range(len(energy_db)):
+            frame = data[i * self.frame_bytes : (i + 1) * self.frame_bytes]
+            self.frames_in += 1
+            e = float(energy_db[i])
+            if self.frames_in <= self.calibration_frames:
+                # Mic start: take the quietest of the first frames as the noise floor.
+                self.noise_floor_db = e if self.frames_in == 1 else min(self.noise_floor_db, e)
+                self._preroll.append(frame)
+                continue
+            # Floor follows quiet frames quickly and creeps up slowly (tracks rising room noise).
+            self.noise_floor_db += (0.2 if e < self.noise_floor_db else 0.005) * (e - self.noise_floor_db)
+            loud = self._is_loud(e, float(zcr[i]))
+            if self.in_speech:
+                out.append(frame)
+                self._quiet_run = 0 if loud else self._quiet_run + 1
+                if self._quiet_run >= self.hangover_frames:
+                    self.in_speech = False
+                    self._silence_run = self._quiet_run
+                    self._loud_run = 0
+                continue
+            if loud:
+                self._loud_run += 1
+                self._preroll.append(frame)
+                if self._loud_run >= self.onset_frames:
+                    # Onset confirmed: release the buffered lead-in, then stream live.
+                    self.in_speech = True
+                    self._utterance_open = True
+                    self._quiet_run = 0
+                    out.extend(self._preroll)
+                    self._preroll.clear()
+                continue
+            self._loud_run = 0
+            self._preroll.append(frame)
+            self._silence_run += 1
+            if self._utterance_open and self._silence_run >= self.eou_frames:
+                self._utterance_open = False
+                end_of_utterance = True
+            if self._silence_run % self.keepalive_frames == 0:
+                out.append(bytes(self.frame_bytes))
+        self.frames_out += len(out)
+        return b"".join(out), end_of_utterance
@@ -0,0 +1,139 @@
+"""
+Startup warmup, run by main.lifespan as a background task so /health answers immediately
+while GET /ready stays 503 until warmup has finished.
+
+Steps (each timed; a failing step is logged and reported but does not block readiness):
+imports of the modules handlers load lazily, the Bedrock client (plus WARMUP_BEDROCK_CONNECTIONS
+one-token Haiku calls to open pooled connections), the Minimax client and MINIMAX_WARMUP_CONNECTIONS
+pings, the shared Transcribe client with credentials resolved, and with WARMUP_EVALUATION=1 one
+synthetic evaluation through the full pipeline. WARMUP=0 marks the worker ready at once;
+WARMUP_TIMEOUT_S bounds the whole phase.
+"""
+
+import asyncio
+import base64
+import importlib
+import io
+import logging
+import os
+import time
+from typing import Awaitable, Callable
+
+from env import env_float, env_int
+
+# Modules the request handlers import on first use.
+LAZY_MODULES = (
+    "pipeline",
+    "bedrock_hedge",
+    "critique_cache",
+    "critique_policy",
+    "pending_critiques",
+    "session_store",
+    "minimax_client",
+    "tts_cache",
+    "audio_codec",
+    "transcribe_streaming",
+    "interview_session",
+)
+
+WARMUP_TRANSCRIPT = "We put a load balancer in front of stateless API servers backed by a cache and a database."
+
+
+def warmup_enabled() -> bool:
+    return os.getenv("WARMUP", "1").lower() not in ("0", "false", "no")
+
+
+class WarmupState:
+    def __init__(self) -> None:
+        self.ready = False
+        self.started_at: float | None = None
+        self.duration_ms: float | None = None
+        self.steps: dict[str, float] = {}
+        self.failed: list[str] = []
+
+
+warmup_state = WarmupState()
+
+
+def _import_modules() -> None:
+    for name in LAZY_MODULES:
+        importlib.import_module(name)
+
+
+async def _warm_bedrock() -> None:
+    from bedrock_client import HAIKU_ID, get_shared_runtime, invoke_claude, run_in_bedrock_executor
+
+    runtime = await run_in_bedrock_executor(get_shared_runtime)
+    count = env_int("WARMUP_BEDROCK_CONNECTIONS", 0)
+    messages = [{"role": "user", "content": [{"type": "text", "text": "ping"}]}]
+    await asyncio.gather(
+        *(run_in_bedrock_executor(invoke_claude, runtime, HAIKU_ID, messages, 1) for _ in range(count))
+    )
+
+
+async def _warm_minimax() -> None:
+    from minimax_client import init_minimax_client
+
+    await init_minimax_client()
+
+
+async def _warm_transcribe() -> None:
+    from transcribe_streaming import warm_transcribe_client
+
+    await warm_transcribe_client()
+
+
+def _blank_diagram() -> str:
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 64), "white").save(buffer, format="PNG")
+    return base64.b64encode(buffer.getvalue()).decode()
+
+
+async def _synthetic_evaluation() -> None:
+    from pipeline import run_evaluation_pipeline
+
+    diagram = await asyncio.to_thread(_blank_diagram)
+    await run_evaluation_pipeline(transcript=WARMUP_TRANSCRIPT, diagram_base64=diagram)
+
+
+async def _step(name: str, fn: Callable[[], Awaitable[None]]) -> None:
+    start = time.perf_counter()
+    try:
+        await fn()
+    except Exception as e:
+        warmup_state.failed.append(name)
+        logging.warning("[Warmup] %s failed: %s", name, e)
+    warmup_state.steps[name] = round((time.perf_counter() - start) * 1000, 1)
+
+
+async def _run_steps() -> None:
+    await _step("imports", lambda: asyncio.to_thread(_import_modules))
+    await asyncio.gather(
+        _step("bedrock", _warm_bedrock),
+        _step("minimax", _warm_minimax),
+        _step("transcribe", _warm_transcribe),
+    )
+    if os.getenv("WARMUP_EVALUATION", "0").lower() in ("1", "true", "yes"):
+        await _step("evaluation", _synthetic_evaluation)
+
+
+async def run_warmup() -> None:
+    """Run the warmup steps, then mark the worker ready (also on timeout or failures)."""
+    warmup_state.started_at = time.perf_counter()
+    try:
+        if warmup_enabled():
+            timeout = env_float("WARMUP_TIMEOUT_S", 30)
+            try:
+                await asyncio.wait_for(_run_steps(), timeout=timeout or None)
+            except asyncio.TimeoutError:
+                warmup_state.failed.append("timeout")
+                logging.warning("[Warmup] timed out after %.0f s", timeout)
+        else:
+            # Minimax client is still created at startup, as before warmup existed.
+            await _warm_minimax()
+    finally:
+        warmup_state.duration_ms = round((time.perf_counter() - warmup_state.started_at) * 1000, 1)
+        warmup_state.ready = True
+        logging.info("[Warmup] ready in %.0f ms steps=%s failed=%s", warmup_state.duration_ms, warmup_state.steps, warmup_state.failed)
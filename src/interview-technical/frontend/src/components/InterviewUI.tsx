@@ -2,7 +2,12 @@
 
 import { useRef, useEffect, useCallback, useState } from "react";
 import { createPayloadDispatcher } from "@/lib/payload-dispatcher";
-import { evaluate } from "@/lib/api";
+import {
+  cancelSpeculativeEvaluation,
+  commitSpeculativeEvaluation,
+  fetchPendingCritique,
+  startSpeculativeEvaluation,
+} from "@/lib/api";
 import { useInterviewStore } from "@/lib/state-manager";
 import Whiteboard, { type WhiteboardRef } from "@/components/Whiteboard";
 import SpeechListener from "@/components/SpeechListener";
@@ -24,11 +29,14 @@ function pickStarterProblem(): string {
 
 export default function InterviewUI() {
   const whiteboardRef = useRef<WhiteboardRef | null>(null);
+  // Speculative evaluations are keyed by session and turn; the turn advances once one is committed.
+  const speculationRef = useRef({ sessionId: "", turnId: 1 });
   const [error, setError] = useState<string | null>(null);
   const [initialProblem, setInitialProblem] = useState<string | null>(null);
 
   useEffect(() => {
     setInitialProblem(pickStarterProblem());
+    speculationRef.current.sessionId = crypto.randomUUID();
   }, []);
 
   const {
@@ -65,12 +73,16 @@ export default function InterviewUI() {
       setEvaluating(true);
       const text = transcriptText.trim() || "(no transcript)";
       try {
-        const diagramBase64 = await whiteboardRef.current?.getDiagramBase64?.() ?? "";
-        const result = await evaluate({
+        const diagram = await whiteboardRef.current?.getDiagramBlob?.() ?? null;
+        const { sessionId, turnId } = speculationRef.current;
+        const result = await commitSpeculativeEvaluation({
+          session_id: sessionId,
+          turn_id: turnId,
           transcript: text,
-          diagram_base64: diagramBase64,
+          diagram,
           previous_state: previousState,
         });
+        speculationRef.current.turnId = turnId + 1;
         const agentText =
           result.follow_up_question?.trim() || result.verbal_feedback?.trim() || "";
         addMessage("user", text);
@@ -79,6 +91,17 @@ export default function InterviewUI() {
         setPreviousState(agentText);
         setTranscript("");
         if (agentText) setAutoPlayEvaluation(true);
+        if (result.scores_pending && result.critique_id) {
+          // The critique missed the turn budget: fill the scores in once it lands.
+          fetchPendingCritique(result.critique_id)
+            .then((critique) => {
+              // Skip if a newer turn has already replaced this evaluation.
+              if (critique && useInterviewStore.getState().evaluation === result) {
+                setEvaluation({ ...result, ...critique, scores_pending: false });
+              }
+            })
+            .catch(() => {});
+        }
       } catch (e) {
         setError(e instanceof Error ? e.message : "Evaluate failed");
       } finally {
@@ -98,9 +121,33 @@ export default function InterviewUI() {
 
   useEffect(() => {
     const getTranscript = () => useInterviewStore.getState().transcript;
-    const dispatcher = createPayloadDispatcher((t) => {
-      runEvaluate(t);
-    }, getTranscript);
+    const dispatcher = createPayloadDispatcher(
+      (t) => {
+        runEvaluate(t);
+      },
+      getTranscript,
+      {
+        onSpeculate: async (t) => {
+          const { sessionId, turnId } = speculationRef.current;
+          try {
+            const diagram = await whiteboardRef.current?.getDiagramBlob?.() ?? null;
+            await startSpeculativeEvaluation({
+              session_id: sessionId,
+              turn_id: turnId,
+              transcript: t,
+              diagram,
+              previous_state: useInterviewStore.getState().previousState,
+            });
+          } catch {
+            // Best effort: the confirmed pause evaluates without it.
+          }
+        },
+        onResume: () => {
+          const { sessionId, turnId } = speculationRef.current;
+          cancelSpeculativeEvaluation(sessionId, turnId).catch(() => {});
+        },
+      }
+    );
 
     let prevTranscript = getTranscript();
     const unsub = useInterviewStore.subscribe(() => {
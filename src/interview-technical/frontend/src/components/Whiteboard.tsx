@@ -6,43 +6,45 @@ import "@tldraw/tldraw/tldraw.css";
 
 const JPEG_QUALITY = 0.7;
 
+function blobToBase64(blob: Blob): Promise<string> {
+  return new Promise((resolve, reject) => {
+    const reader = new FileReader();
+    reader.onload = () => {
+      const dataUrl = reader.result as string;
+      resolve(dataUrl.split(",")[1] ?? "");
+    };
+    reader.onerror = reject;
+    reader.readAsDataURL(blob);
+  });
+}
+
 function EditorCapture({
   onReady,
 }: {
-  onReady: (getDiagramBase64: () => Promise<string>) => void;
+  onReady: (getDiagramBlob: () => Promise<Blob | null>) => void;
 }) {
   const editor = useEditor();
 
   useEffect(() => {
     if (!editor) return;
 
-    const getDiagramBase64 = async (): Promise<string> => {
+    const getDiagramBlob = async (): Promise<Blob | null> => {
       try {
         const shapeIds = Array.from(editor.getCurrentPageShapeIds());
-        if (shapeIds.length === 0) return "";
+        if (shapeIds.length === 0) return null;
 
         const { blob } = await editor.toImage(shapeIds, {
           format: "jpeg",
           quality: JPEG_QUALITY,
           background: true,
         });
-
-        return new Promise((resolve, reject) => {
-          const reader = new FileReader();
-          reader.onload = () => {
-            const dataUrl = reader.result as string;
-            const base64 = dataUrl.split(",")[1] ?? "";
-            resolve(base64);
-          };
-          reader.onerror = reject;
-          reader.readAsDataURL(blob);
-        });
+        return blob;
       } catch {
-        return "";
+        return null;
       }
     };
 
-    onReady(getDiagramBase64);
+    onReady(getDiagramBlob);
   }, [editor, onReady]);
 
   return null;
@@ -50,6 +52,8 @@ function EditorCapture({
 
 export interface WhiteboardRef {
   getDiagramBase64: () => Promise<string>;
+  /** Binary export for multipart upload (POST /evaluate/upload); null when the board is empty. */
+  getDiagramBlob: () => Promise<Blob | null>;
 }
 
 export default function Whiteboard({
@@ -57,16 +61,20 @@ export default function Whiteboard({
 }: {
   whiteboardRef: React.RefObject<WhiteboardRef | null>;
 }) {
-  const getDiagramRef = useRef<(() => Promise<string>) | null>(null);
+  const getDiagramRef = useRef<(() => Promise<Blob | null>) | null>(null);
 
-  const handleReady = useCallback((getDiagramBase64: () => Promise<string>) => {
-    getDiagramRef.current = getDiagramBase64;
+  const handleReady = useCallback((getDiagramBlob: () => Promise<Blob | null>) => {
+    getDiagramRef.current = getDiagramBlob;
   }, []);
 
   useEffect(() => {
     if (!whiteboardRef) return;
     (whiteboardRef as React.MutableRefObject<WhiteboardRef | null>).current = {
-      getDiagramBase64: async () => getDiagramRef.current?.() ?? "",
+      getDiagramBase64: async () => {
+        const blob = await getDiagramRef.current?.();
+        return blob ? blobToBase64(blob).catch(() => "") : "";
+      },
+      getDiagramBlob: async () => getDiagramRef.current?.() ?? null,
     };
     return () => {
       (whiteboardRef as React.MutableRefObject<WhiteboardRef | null>).current = null;
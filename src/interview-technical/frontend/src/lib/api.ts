@@ -25,6 +25,9 @@ export interface InterviewEvaluation {
   verbal_feedback: string;
   follow_up_question: string | null;
   should_interrupt: boolean;
+  scores_stale?: boolean;
+  scores_pending?: boolean;
+  critique_id?: string | null;
 }
 
 export interface EvaluatePayload {
@@ -43,6 +46,123 @@ export async function evaluate(payload: EvaluatePayload): Promise<InterviewEvalu
   return res.json();
 }
 
+export interface EvaluateUploadPayload {
+  transcript: string;
+  diagram: Blob | null;
+  previous_state: string;
+}
+
+/** POST /evaluate/upload: same as evaluate, with the diagram sent as a binary multipart file. */
+export async function evaluateUpload(payload: EvaluateUploadPayload): Promise<InterviewEvaluation> {
+  const form = new FormData();
+  form.append("transcript", payload.transcript);
+  form.append("previous_state", payload.previous_state);
+  if (payload.diagram) form.append("diagram", payload.diagram, "diagram");
+  const res = await fetch(`${API_URL}/evaluate/upload`, { method: "POST", body: form });
+  if (!res.ok) throw new Error(await res.text());
+  return res.json();
+}
+
+export interface SpeculativeEvaluatePayload extends EvaluateUploadPayload {
+  session_id: string;
+  turn_id: number;
+}
+
+function speculativeForm(payload: SpeculativeEvaluatePayload): FormData {
+  const form = new FormData();
+  form.append("session_id", payload.session_id);
+  form.append("turn_id", String(payload.turn_id));
+  form.append("transcript", payload.transcript);
+  form.append("previous_state", payload.previous_state);
+  if (payload.diagram) form.append("diagram", payload.diagram, "diagram");
+  return form;
+}
+
+/** POST /evaluate/speculative: start evaluating a turn early (at a short pause) in the background. */
+export async function startSpeculativeEvaluation(payload: SpeculativeEvaluatePayload): Promise<void> {
+  const res = await fetch(`${API_URL}/evaluate/speculative`, { method: "POST", body: speculativeForm(payload) });
+  if (!res.ok) throw new Error(await res.text());
+}
+
+/** DELETE /evaluate/speculative/{session_id}: the candidate kept talking. */
+export async function cancelSpeculativeEvaluation(sessionId: string, turnId: number): Promise<void> {
+  await fetch(`${API_URL}/evaluate/speculative/${sessionId}?turn_id=${turnId}`, { method: "DELETE" });
+}
+
+/**
+ * POST /evaluate/speculative/commit: the pause is confirmed. Returns the speculative result when
+ * nothing changed since it started, otherwise evaluates afresh (same result as evaluateUpload).
+ */
+export async function commitSpeculativeEvaluation(payload: SpeculativeEvaluatePayload): Promise<InterviewEvaluation> {
+  const res = await fetch(`${API_URL}/evaluate/speculative/commit`, { method: "POST", body: speculativeForm(payload) });
+  if (!res.ok) throw new Error(await res.text());
+  return res.json();
+}
+
+export interface CritiqueScores {
+  diagram_score: number;
+  verbal_score: number;
+  overall_score: number;
+  design_aspects: DesignAspect[];
+  follow_up_question: string | null;
+}
+
+/** GET /evaluate/critique/{id}: a critique that missed its turn budget; null while still pending. */
+export async function fetchPendingCritique(critiqueId: string, waitMs = 10000): Promise<CritiqueScores | null> {
+  const res = await fetch(`${API_URL}/evaluate/critique/${critiqueId}?wait_ms=${waitMs}`);
+  if (res.status === 202) return null;
+  if (!res.ok) throw new Error(await res.text());
+  return res.json();
+}
+
+export type EvaluateStreamEvent =
+  | {
+      event: "router";
+      minimax_emotion: MinimaxEmotion;
+      verbal_feedback: string;
+      should_interrupt: boolean;
+    }
+  | {
+      event: "critique";
+      diagram_score: number;
+      verbal_score: number;
+      overall_score: number;
+      design_aspects: DesignAspect[];
+      follow_up_question: string | null;
+      scores_stale?: boolean;
+      scores_pending?: boolean;
+      critique_id?: string | null;
+    }
+  | { event: "error"; error: string };
+
+/** POST /evaluate/stream: calls onEvent for each NDJSON line (router first, then critique). */
+export async function evaluateStream(
+  payload: EvaluatePayload,
+  onEvent: (e: EvaluateStreamEvent) => void
+): Promise<void> {
+  const res = await fetch(`${API_URL}/evaluate/stream`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify(payload),
+  });
+  if (!res.ok || !res.body) throw new Error(await res.text());
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffered = "";
+  for (;;) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffered += decoder.decode(value, { stream: true });
+    let nl: number;
+    while ((nl = buffered.indexOf("\n")) >= 0) {
+      const line = buffered.slice(0, nl).trim();
+      buffered = buffered.slice(nl + 1);
+      if (line) onEvent(JSON.parse(line) as EvaluateStreamEvent);
+    }
+  }
+  if (buffered.trim()) onEvent(JSON.parse(buffered) as EvaluateStreamEvent);
+}
+
 export async function fetchTTSStream(
   text: string,
   emotion: MinimaxEmotion = "neutral"
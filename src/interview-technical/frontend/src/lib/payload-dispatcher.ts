@@ -1,30 +1,66 @@
 /**
  * Dispatches evaluate payload when 1.5s vocal pause is detected or on explicit trigger.
  * Call start() to begin listening for pauses; onPause() is invoked with current transcript.
+ * With speculation callbacks, onSpeculate() fires after a shorter pause so the backend can start
+ * evaluating early; onResume() fires if the transcript changes (or the dispatcher is cancelled)
+ * before the full pause confirms it.
  */
 
 const PAUSE_MS = 1500;
+const SPECULATIVE_PAUSE_MS = 600;
+
+export interface SpeculationCallbacks {
+  onSpeculate: (transcript: string) => void;
+  onResume: () => void;
+}
 
 export function createPayloadDispatcher(
   onPause: (transcript: string) => void,
-  getTranscript: () => string
+  getTranscript: () => string,
+  speculation?: SpeculationCallbacks
 ) {
   let timeoutId: ReturnType<typeof setTimeout> | null = null;
+  let speculativeId: ReturnType<typeof setTimeout> | null = null;
+  let speculating = false;
 
-  function schedule() {
+  function clearTimers() {
     if (timeoutId) clearTimeout(timeoutId);
+    if (speculativeId) clearTimeout(speculativeId);
+    timeoutId = null;
+    speculativeId = null;
+  }
+
+  function resume() {
+    if (speculating) {
+      speculating = false;
+      speculation?.onResume();
+    }
+  }
+
+  function schedule() {
+    clearTimers();
+    resume();
+    if (speculation) {
+      speculativeId = setTimeout(() => {
+        const t = getTranscript().trim();
+        if (t) {
+          speculating = true;
+          speculation.onSpeculate(t);
+        }
+        speculativeId = null;
+      }, SPECULATIVE_PAUSE_MS);
+    }
     timeoutId = setTimeout(() => {
       const t = getTranscript().trim();
+      speculating = false;
       if (t) onPause(t);
       timeoutId = null;
     }, PAUSE_MS);
   }
 
   function cancel() {
-    if (timeoutId) {
-      clearTimeout(timeoutId);
-      timeoutId = null;
-    }
+    clearTimers();
+    resume();
   }
 
   function onTranscriptUpdate() {
@@ -32,7 +68,8 @@ export function createPayloadDispatcher(
   }
 
   function trigger() {
-    cancel();
+    clearTimers();
+    speculating = false;
     const t = getTranscript().trim();
     if (t) onPause(t);
   }